@@ -1,26 +1,84 @@
-from ProbDistro.discrete_distributions.bernoulli import Bernoulli
-from ProbDistro.discrete_distributions.binomial import Binomial
-from ProbDistro.discrete_distributions.geometric import Geometric
-from ProbDistro.discrete_distributions.poisson import Poisson
-from ProbDistro.discrete_distributions.hypergeometric import Hypergeometric
-from ProbDistro.discrete_distributions.discrete_random_variable import DiscreteRandomVariable
+import importlib
 
-from ProbDistro.continuous_distributions.uniform import Uniform
-from ProbDistro.continuous_distributions.normal import Normal
-from ProbDistro.continuous_distributions.exponential import Exponential
+# the distributions (and their aliases) are only imported when first accessed, so "import ProbDistro" stays cheap
+# for short-lived processes, and does not load NumPy until a distribution is actually used
+_LAZY_ATTRIBUTES = {
+    "Bernoulli": ("ProbDistro.discrete_distributions.bernoulli", "Bernoulli"),
+    "Binomial": ("ProbDistro.discrete_distributions.binomial", "Binomial"),
+    "Geometric": ("ProbDistro.discrete_distributions.geometric", "Geometric"),
+    "Poisson": ("ProbDistro.discrete_distributions.poisson", "Poisson"),
+    "Hypergeometric": ("ProbDistro.discrete_distributions.hypergeometric", "Hypergeometric"),
+    "DiscreteRandomVariable": (
+        "ProbDistro.discrete_distributions.discrete_random_variable", "DiscreteRandomVariable"
+    ),
+    "JointDistribution": ("ProbDistro.discrete_distributions.joint_distribution", "JointDistribution"),
+    "LazyRandomVariable": ("ProbDistro.discrete_distributions.lazy_random_variable", "LazyRandomVariable"),
 
-import ProbDistro.conversion as conversions
+    "Uniform": ("ProbDistro.continuous_distributions.uniform", "Uniform"),
+    "Normal": ("ProbDistro.continuous_distributions.normal", "Normal"),
+    "Exponential": ("ProbDistro.continuous_distributions.exponential", "Exponential"),
+
+    "BernoulliBatch": ("ProbDistro.discrete_distributions.bernoulli", "BernoulliBatch"),
+    "BinomialBatch": ("ProbDistro.discrete_distributions.binomial", "BinomialBatch"),
+    "GeometricBatch": ("ProbDistro.discrete_distributions.geometric", "GeometricBatch"),
+    "PoissonBatch": ("ProbDistro.discrete_distributions.poisson", "PoissonBatch"),
+    "HypergeometricBatch": ("ProbDistro.discrete_distributions.hypergeometric", "HypergeometricBatch"),
+
+    "UniformBatch": ("ProbDistro.continuous_distributions.uniform", "UniformBatch"),
+    "NormalBatch": ("ProbDistro.continuous_distributions.normal", "NormalBatch"),
+    "ExponentialBatch": ("ProbDistro.continuous_distributions.exponential", "ExponentialBatch"),
+
+    "conversions": ("ProbDistro.conversion", None),
+}
 
 # aliases for distributions
-Pois = Poisson
-Bin = Binomial
-Geo = Geometric
-Ber = Bernoulli
-Hyp = Hypergeometric
-
-Uni = Uniform
-Norm = Normal
-Gaussian = Normal
-Gauss = Normal
-Laplace_Gauss = Normal
-Exp = Exponential
+_ALIASES = {
+    "Pois": "Poisson",
+    "Bin": "Binomial",
+    "Geo": "Geometric",
+    "Ber": "Bernoulli",
+    "Hyp": "Hypergeometric",
+
+    "Uni": "Uniform",
+    "Norm": "Normal",
+    "Gaussian": "Normal",
+    "Gauss": "Normal",
+    "Laplace_Gauss": "Normal",
+    "Exp": "Exponential",
+}
+
+# submodules which can be reached as attributes of the package (ProbDistro.conversion, ProbDistro.cache, ...)
+_SUBMODULES = (
+    "base_distribution", "base_discrete_distribution", "base_continuous_distribution", "base_batch_distribution",
+    "cache", "conversion", "continuous_distributions", "discrete_distributions", "estimation", "instrumentation",
+    "parallel", "shared", "special"
+)
+
+__all__ = list(_LAZY_ATTRIBUTES) + list(_ALIASES)
+
+
+def __getattr__(name: str):
+    if name in _ALIASES:
+        value = __getattr__(_ALIASES[name])
+
+    elif name in _LAZY_ATTRIBUTES:
+        module, attribute = _LAZY_ATTRIBUTES[name]
+        value = importlib.import_module(module)
+
+        if attribute is not None:
+            value = getattr(value, attribute)
+
+    elif name in _SUBMODULES:
+        value = importlib.import_module("{}.{}".format(__name__, name))
+
+    else:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    # later lookups find the value directly, without going through __getattr__ again
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | set(_SUBMODULES))
@@ -0,0 +1,184 @@
+import typing
+
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
+import ProbDistro.parallel as parallel
+import ProbDistro.special as special
+
+# methods taking a value (or array of values) to evaluate at, which a batch broadcasts against its parameters before
+# handing on to the distribution it batches, so they always take the array path
+_EVALUATIONS = (
+    "pmf", "logpmf", "pdf", "logpdf", "cdf", "sf", "logcdf", "logsf",
+    "equals", "less_than", "less_than_equals", "greater_than", "greater_than_equals", "_check_supported"
+)
+
+
+def _broadcasting(name: str) -> callable:
+    def method(self, x, executor: parallel.Executor = None):
+        if executor is not None:
+            return parallel.evaluate_batch(self, name, self._broadcast(x), executor)
+
+        return getattr(super(BatchDistribution, self), name)(self._broadcast(x))
+
+    method.__name__ = name
+    method.__qualname__ = "BatchDistribution.{}".format(name)
+
+    return method
+
+
+class BatchDistribution:
+    """
+    Mixed in ahead of a distribution to hold many parameter sets at once: every parameter is an array (all broadcast to
+    the same shape), and each method evaluates the whole batch in one array call, broadcasting its argument against the
+    parameters. Results are the same as evaluating each distribution in the batch on an array of its own.
+
+    Subclasses list the mixin first, so it takes priority over the distribution: class XBatch(BatchDistribution, X)
+
+    Every evaluation also takes an optional executor (a concurrent.futures executor, or a number of worker processes),
+    which splits the batch into slices evaluated in parallel, with results identical to evaluating it in one call
+    """
+    __slots__ = ()
+
+    # batches hold arrays, which compare element by element, so they are compared (and hashed) by identity instead,
+    # which also keeps them out of the evaluation cache
+    __eq__ = object.__eq__
+    __hash__ = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        for name in _EVALUATIONS:
+            if hasattr(cls, name) and name not in vars(cls):
+                setattr(cls, name, _broadcasting(name))
+
+        # a range cannot be tabulated by a single recurrence when each distribution has its own parameters
+        if hasattr(cls, "pmf_range"):
+            cls.pmf_range = lambda self, x, executor=None: self._equals_range(x, self.pmf, executor)
+
+    @staticmethod
+    def _parameter_arrays(*parameters: typing.Any) -> typing.Tuple[np.ndarray, ...]:
+        # broadcasts the parameters to a shared shape, as read only copies, so the batch cannot change once created
+        arrays = []
+
+        for parameter in np.broadcast_arrays(*(np.asarray(i) for i in parameters)):
+            parameter = parameter.copy()
+            parameter.setflags(write=False)
+            arrays.append(parameter)
+
+        return tuple(arrays)
+
+    @property
+    def shape(self) -> typing.Tuple[int, ...]:
+        return np.shape(getattr(self, self._fields[0]))
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    def __len__(self):
+        return self.shape[0] if self.shape else 1
+
+    def _broadcast(self, x: typing.Any) -> np.ndarray:
+        x = np.asarray(x)
+
+        return np.broadcast_to(x, np.broadcast_shapes(x.shape, self.shape))
+
+    def _take(self, index: slice) -> 'BatchDistribution':
+        # a batch of the distributions in a slice of this one's first axis (sharing its parameter arrays)
+        state = tuple(
+            (name, value[index] if np.ndim(value) else value)
+            for name, value in ((name, getattr(self, name)) for name in self._fields)
+        )
+
+        return base_distribution._restore(type(self), state)
+
+    def ppf(self, q: typing.Any, executor: parallel.Executor = None) -> np.ndarray:
+        self._check_probability(np.asarray(q))
+
+        if executor is not None:
+            return parallel.evaluate_batch(self, "ppf", self._broadcast(q), executor)
+
+        return self._ppf_array(self._broadcast(q))
+
+    def isf(self, q: typing.Any, executor: parallel.Executor = None) -> np.ndarray:
+        self._check_probability(np.asarray(q))
+
+        if executor is not None:
+            return parallel.evaluate_batch(self, "isf", self._broadcast(q), executor)
+
+        return self._isf_array(self._broadcast(q))
+
+    def standard_deviation(self) -> np.ndarray:
+        return np.sqrt(self.variance())
+
+    def _search_quantile(self, q: np.ndarray, upper_tail: bool) -> np.ndarray:
+        """
+        The batch counterpart of the quantile search. Every quantile belongs to a distribution with its own parameters,
+        so rather than narrowing down to the unresolved quantiles between rounds, each round evaluates the whole batch
+        and only moves the brackets which are still open
+        """
+        lower, upper, _ = self._get_defaults()
+        lower = np.broadcast_to(lower, q.shape).astype(float)
+        upper = np.broadcast_to(np.inf if upper is None else upper, q.shape).astype(float)
+
+        z = special.ndtri(q)
+        sigma = self.standard_deviation()
+
+        guess = np.clip(np.floor(self.expected_value() + sigma * (-z if upper_tail else z)), lower, upper)
+
+        # infinite quantiles (ppf(1) or isf(0) of an unbounded distribution) have nothing to search
+        infinite = np.isinf(guess)
+        guess = np.where(infinite, lower, guess)
+
+        reached = self._quantile_reached(guess, q, upper_tail)
+        lo = np.where(reached, lower - 1, guess)
+        hi = np.where(reached, guess, upper)
+
+        downwards = reached
+        width = np.broadcast_to(np.maximum(np.ceil(sigma), 1), q.shape).astype(float)
+        widening = ~infinite
+
+        while widening.any():
+            probe = np.where(downwards, hi - width, lo + width)
+            widening &= (probe > lo) & (probe < hi)
+
+            reached = self._quantile_reached(np.where(widening, probe, guess), q, upper_tail)
+            hi = np.where(widening & reached, probe, hi)
+            lo = np.where(widening & ~reached, probe, lo)
+
+            widening &= reached == downwards
+            width = width * 2
+
+        while True:
+            open_brackets = ~infinite & (hi > lo + 1)
+
+            if not open_brackets.any():
+                break
+
+            middle = np.where(open_brackets, np.floor((lo + hi) / 2), guess)
+            reached = self._quantile_reached(middle, q, upper_tail)
+
+            hi = np.where(open_brackets & reached, middle, hi)
+            lo = np.where(open_brackets & ~reached, middle, lo)
+
+        return np.where(infinite, np.inf, hi)
+
+    def to_discrete_random_variable(self, *args, **kwargs):
+        raise NotImplementedError(
+            "{} holds many distributions, so it cannot be converted into one random variable".format(
+                self.__class__.__name__
+            )
+        )
+
+    def sample(self, size: typing.Union[int, typing.Tuple[int, ...]] = None, seed: typing.Any = None) -> np.ndarray:
+        """
+        Draws random values from every distribution in the batch
+
+        :param size: the number of draws to make from each distribution (or the shape to arrange them in), which is
+        placed ahead of the batch's own shape, or None for a single draw from each
+        :param seed: a numpy.random.Generator, or a seed to create one from (None draws fresh entropy from the OS)
+        """
+        shape = self.shape if size is None else tuple(np.atleast_1d(size)) + self.shape
+
+        return self._sample(np.random.default_rng(seed), shape)
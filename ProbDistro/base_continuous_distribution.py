@@ -1,20 +1,34 @@
 import abc
 import typing
 
+import numpy as np
+
 import ProbDistro.base_distribution as base_distribution
+import ProbDistro.parallel as parallel
 
 
 class BaseContinuousDistribution(base_distribution.BaseDistribution, abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def pdf(self, x: float) -> float:
         pass
 
+    def logpdf(self, x: float) -> float:
+        return self._log(self.pdf(x))
+
     def equals(self, x: float) -> float:
+        if isinstance(x, np.ndarray):
+            return np.zeros(x.shape)
+
         return 0
 
     def _is_supported(self, x: float) -> bool:
         return True
 
+    def _is_supported_array(self, x: np.ndarray) -> np.ndarray:
+        return np.ones(x.shape, dtype=bool)
+
     def less_than(self, x: float) -> float:
         self._check_supported(x)
         return self.cdf(x)
@@ -25,14 +39,14 @@ class BaseContinuousDistribution(base_distribution.BaseDistribution, abc.ABC):
 
     def greater_than(self, x: float) -> float:
         self._check_supported(x)
-        return 1 - self.cdf(x)
+        return self.sf(x)
 
     def greater_than_equals(self, x: float) -> float:
         self._check_supported(x)
-        return 1 - self.cdf(x)
+        return self.sf(x)
 
     def between(self, upper: float, lower: float):
         return self.less_than_equals(upper) - self.less_than_equals(lower)
 
-    def pdf_range(self, x: typing.Iterable):
-        return self._equals_range(x, self.pdf)
+    def pdf_range(self, x: typing.Iterable, executor: parallel.Executor = None):
+        return self._equals_range(x, self.pdf, executor)
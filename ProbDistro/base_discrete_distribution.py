@@ -1,16 +1,36 @@
 import abc
+import math
 import typing
 
+import numpy as np
+
 import ProbDistro.base_distribution as base_distribution
+import ProbDistro.parallel as parallel
+import ProbDistro.special as special
 if typing.TYPE_CHECKING:
     import ProbDistro.discrete_distributions.discrete_random_variable as discrete_random_variable
 
 
 class BaseDiscreteDistribution(base_distribution.BaseDistribution, abc.ABC):
+    __slots__ = ()
+
+    # up to this size, the pmf is evaluated exactly and CDFs are summed from it rather than through a closed form
+    _exact_limit = 64
+
+    # recurrence tables are re-anchored on a freshly evaluated pmf value once per block, bounding rounding drift
+    _recurrence_block = 4096
+
+    # relative slack allowed when comparing a CDF against a target probability, so that ppf(cdf(k)) == k even when
+    # the two CDF evaluations round differently
+    _quantile_tolerance = 1e-12
+
     @abc.abstractmethod
     def pmf(self, x: float) -> float:
         pass
 
+    def logpmf(self, x: float) -> float:
+        return self._log(self.pmf(x))
+
     def equals(self, x: float) -> float:
         self._check_supported(x)
         return self.pmf(x)
@@ -25,7 +45,7 @@ class BaseDiscreteDistribution(base_distribution.BaseDistribution, abc.ABC):
 
     def greater_than(self, x: float) -> float:
         self._check_supported(x)
-        return 1 - self.less_than_equals(x)
+        return self.sf(x)
 
     def greater_than_equals(self, x: float) -> float:
         self._check_supported(x)
@@ -34,24 +54,262 @@ class BaseDiscreteDistribution(base_distribution.BaseDistribution, abc.ABC):
     def between(self, upper: float, lower: float):
         return self.equals(upper) - self.equals(lower)
 
-    def pmf_range(self, x: typing.Iterable):
-        return self._equals_range(x, self.pmf)
+    def pmf_range(self, x: typing.Iterable, executor: parallel.Executor = None):
+        """
+        :param x: the values to evaluate the PMF at
+        :param executor: a concurrent.futures executor (or a number of worker processes) to split the values across.
+        The results are identical to evaluating them serially
+        """
+        if isinstance(x, range) and x.step == 1 and len(x) > 0:
+            return self._tabulate(x.start, x.stop - 1, executor).tolist()
+
+        return self._equals_range(x, self.pmf, executor)
+
+    def _pmf_ratio(self, k: np.ndarray) -> typing.Optional[typing.Tuple[np.ndarray, np.ndarray]]:
+        # the numerator and denominator of pmf(k + 1) / pmf(k), for distributions with a simple term ratio
+        return None
+
+    def _mode(self) -> int:
+        return self._get_defaults()[0]
+
+    def _pmf_table(self, start: int, stop: int) -> np.ndarray:
+        """
+        Evaluates the pmf at every integer in [start, stop]. Where the distribution has a simple term ratio, each
+        block of the range is anchored at its point closest to the mode, and walked outwards in both directions, so
+        every point costs a multiplication rather than a fresh evaluation
+        """
+        table = np.zeros(stop - start + 1)
+
+        lower, upper, _ = self._get_defaults()
+        lower = start if lower is None else max(start, lower)
+        upper = stop if upper is None else min(stop, upper)
+
+        if lower > upper:
+            return table
+
+        if upper - lower < self._exact_limit or self._pmf_ratio(np.arange(1)) is None:
+            table[lower - start:upper - start + 1] = [self.pmf(i) for i in range(lower, upper + 1)]
+            return table
+
+        mode = self._mode()
+
+        for block_start in range(lower, upper + 1, self._recurrence_block):
+            block_stop = min(block_start + self._recurrence_block - 1, upper)
+            anchor = min(max(mode, block_start), block_stop)
+            offset = anchor - start
+
+            table[offset] = self.pmf(anchor)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                numerator, denominator = self._pmf_ratio(np.arange(anchor, block_stop))
+                table[offset + 1:block_stop - start + 1] = table[offset] * np.cumprod(numerator / denominator)
+
+                numerator, denominator = self._pmf_ratio(np.arange(anchor - 1, block_start - 1, -1))
+                table[block_start - start:offset] = (table[offset] * np.cumprod(denominator / numerator))[::-1]
+
+        return table
+
+    def _tabulate(self, start: int, stop: int, executor: parallel.Executor = None) -> np.ndarray:
+        # the pmf table over [start, stop], split across the executor's workers when one is given
+        if executor is None:
+            return self._pmf_table(start, stop)
+
+        return parallel.pmf_table(self, start, stop, executor)
+
+    def _tabulated_cdf_array(self, x: np.ndarray, lower: int, upper: int = None) -> np.ndarray:
+        # tabulates the pmf once over the integers [lower, max(x)] and answers every query from its cumulative sum
+        k = np.floor(x)
+        top = int(k.max(initial=lower))
+
+        if upper is not None:
+            top = min(top, upper)
+
+        table = np.minimum(np.cumsum(self._pmf_array(np.arange(lower, top + 1))), 1.0)
+        result = np.where(k < lower, 0.0, table[np.clip(k, lower, top).astype(np.int64) - lower])
+
+        if upper is not None:
+            result = np.where(k >= upper, 1.0, result)
+
+        return result
+
+    def _tabulated_sf_array(self, x: np.ndarray, lower: int, upper: int) -> np.ndarray:
+        # the upper tail counterpart of _tabulated_cdf_array, summing the pmf down from upper so small tails keep their
+        # precision. Every x is expected to be at least lower, with the mass above upper negligible
+        k = np.floor(x)
+        bottom = int(min(max(k.min(initial=upper), lower) + 1, upper))
+
+        table = np.minimum(np.cumsum(self._pmf_array(np.arange(upper, bottom - 1, -1)))[::-1], 1.0)
+        result = table[np.clip(k + 1, bottom, upper).astype(np.int64) - bottom]
+
+        return np.where(k >= upper, 0.0, result)
+
+    def _ppf(self, q: float) -> int:
+        return self._check_quantile(self._support_value(super()._ppf(q)), q, False)
+
+    def _isf(self, q: float) -> int:
+        return self._check_quantile(self._support_value(super()._isf(q)), q, True)
+
+    def _check_quantile(self, k: int, q: float, upper_tail: bool) -> int:
+        # the search runs on the array cdf (or sf), which can round differently from the scalar one (an exact sum for
+        # small parameters), so a scalar quantile is moved by one where the scalar function disagrees with it
+        if not math.isfinite(k):
+            return k
+
+        if k > self._get_defaults()[0] and self._quantile_reached_scalar(k - 1, q, upper_tail):
+            return k - 1
+
+        if not self._quantile_reached_scalar(k, q, upper_tail):
+            return k + 1
+
+        return k
+
+    def _quantile_reached_scalar(self, k: float, q: float, upper_tail: bool) -> bool:
+        # the scalar counterpart of _quantile_reached
+        upper = self._get_defaults()[1]
+
+        if upper is not None and k >= upper:
+            return True
+
+        slack = float(self._quantile_slack(q))
+
+        if upper_tail:
+            return q > 0 and self.sf(k) <= q + slack
+
+        return q < 1 and self.cdf(k) >= q - slack
+
+    def _quantile_slack(self, q: np.ndarray) -> np.ndarray:
+        # how far a CDF may fall short of (or an sf exceed) q and still be taken to have reached it
+        return self._quantile_tolerance * np.minimum(q, 1 - q)
+
+    @staticmethod
+    def _support_value(x: float) -> int:
+        return int(x) if math.isfinite(x) else x
+
+    def _ppf_array(self, q: np.ndarray) -> np.ndarray:
+        return self._search_quantile(q, False)
+
+    def _isf_array(self, q: np.ndarray) -> np.ndarray:
+        return self._search_quantile(q, True)
+
+    def _quantile_reached(self, k: np.ndarray, q: np.ndarray, upper_tail: bool) -> np.ndarray:
+        # whether each k is at or past its quantile: cdf(k) >= q, or sf(k) <= q for the upper tail
+        lower, upper, _ = self._get_defaults()
+        upper = math.inf if upper is None else upper
+
+        slack = self._quantile_slack(q)
+        k_supported = np.clip(k, lower, upper)
+
+        # q of exactly 1 (or 0 in the upper tail) is only reached at the top of the support, even where the
+        # cdf has already rounded to 1 (or the sf to 0) before it
+        if upper_tail:
+            reached = (self.sf(k_supported) <= q + slack) & (q > 0)
+        else:
+            reached = (self.cdf(k_supported) >= q - slack) & (q < 1)
+
+        # nothing below the support is ever past the quantile, and the top of the support always is
+        return np.where(k < lower, False, np.where(k >= upper, True, reached))
+
+    def _search_quantile(self, q: np.ndarray, upper_tail: bool) -> np.ndarray:
+        """
+        Resolves every quantile in q together: each starts from the normal approximation, widens a bracket around it
+        with doubling steps until the quantile is enclosed, and is then bisected down to a single point, with each
+        round evaluated as one array call to the cdf (or sf)
+        """
+        shape = q.shape
+        q = q.astype(float).ravel()
+
+        lower, upper, _ = self._get_defaults()
+        upper = math.inf if upper is None else upper
+
+        z = special.ndtri(q)
+        sigma = self.standard_deviation()
+        spread = max(math.ceil(sigma), 1)
+
+        guess = np.floor(self.expected_value() + sigma * (-z if upper_tail else z))
+        guess = np.clip(guess, lower, upper)
+
+        # lo is always short of the quantile and hi always reaches it. Quantiles that are infinite (ppf(1) or isf(0)
+        # of an unbounded distribution) have nothing to search, so both ends are set to infinity
+        lo = np.where(np.isinf(guess), np.inf, lower - 1.0)
+        hi = np.where(np.isinf(guess), np.inf, upper)
+
+        i = np.flatnonzero(np.isfinite(guess))
+        reached = self._quantile_reached(guess[i], q[i], upper_tail)
+        hi[i[reached]] = guess[i[reached]]
+        lo[i[~reached]] = guess[i[~reached]]
+
+        downwards = np.zeros(q.shape, dtype=bool)
+        downwards[i] = reached
+
+        width = np.full(q.shape, float(spread))
+        widening = np.isfinite(guess)
+
+        while widening.any():
+            i = np.flatnonzero(widening)
+            probe = np.where(downwards[i], hi[i] - width[i], lo[i] + width[i])
+
+            # once a probe would step past the far end of the bracket, the bracket is already closed
+            inside = (probe > lo[i]) & (probe < hi[i])
+            widening[i[~inside]] = False
+            i, probe = i[inside], probe[inside]
+
+            reached = self._quantile_reached(probe, q[i], upper_tail)
+            hi[i[reached]] = probe[reached]
+            lo[i[~reached]] = probe[~reached]
+
+            widening[i[reached != downwards[i]]] = False
+            width[i] *= 2
+
+        while True:
+            i = np.flatnonzero(hi > lo + 1)
+
+            if not len(i):
+                break
+
+            middle = np.floor((lo[i] + hi[i]) / 2)
+            reached = self._quantile_reached(middle, q[i], upper_tail)
+
+            hi[i[reached]] = middle[reached]
+            lo[i[~reached]] = middle[~reached]
+
+        return hi.reshape(shape)
+
+    def _refine_quantile(self, k: np.ndarray, q: np.ndarray, upper_tail: bool) -> np.ndarray:
+        # moves closed form quantiles by one where rounding left them next to the true quantile
+        lower = self._get_defaults()[0]
+        finite = np.isfinite(k)
+        k_finite = np.where(finite, k, lower)
+
+        k_finite = np.where(
+            (k_finite > lower) & self._quantile_reached(k_finite - 1, q, upper_tail), k_finite - 1, k_finite
+        )
+        k_finite = np.where(self._quantile_reached(k_finite, q, upper_tail), k_finite, k_finite + 1)
+
+        return np.where(finite, k_finite, k)
 
     @abc.abstractmethod
     def _get_defaults(self) -> tuple:
         pass
 
     def to_discrete_random_variable(
-            self, start: float = None, stop: float = None, step: float = None
+            self, start: float = None, stop: float = None, step: float = None, executor: parallel.Executor = None,
+            tail_tolerance: float = None
     ) -> 'discrete_random_variable.DiscreteRandomVariable':
+        """
+        :param start: the first value to include (the lower end of the support by default)
+        :param stop: the last value to include (the upper end of the support by default)
+        :param step: the spacing of the values (1 by default)
+        :param executor: a concurrent.futures executor (or a number of worker processes) to tabulate a step 1 range
+        across
+        :param tail_tolerance: cut each end of the range which is not given explicitly where no more than this much
+        probability lies beyond it, rather than at the end of the support. This allows distributions with unbounded
+        support to be converted without picking a stop value
+        """
 
         import ProbDistro.discrete_distributions.discrete_random_variable as drv
 
-        default_start, default_stop, default_step = self._get_defaults()
-
-        start = default_start if start is None else start
-        stop = default_stop if stop is None else stop
-        step = default_step if step is None else step
+        start, stop = self._truncation_bounds(start, stop, tail_tolerance)
+        step = self._get_defaults()[2] if step is None else step
 
         if start is None:
             raise ValueError("Starting value must be explicitly set")
@@ -62,14 +320,36 @@ class BaseDiscreteDistribution(base_distribution.BaseDistribution, abc.ABC):
         if step is None:
             raise ValueError("Step value must be explicitly set")
 
-        x = []
-        px = []
+        if step == 1 and float(start).is_integer() and stop >= start:
+            start = int(start)
+            stop = int(stop) if float(stop).is_integer() else int(stop // 1)
+
+            self._check_supported(start)
+            self._check_supported(stop)
+
+            return drv.DiscreteRandomVariable.from_arrays(
+                np.arange(start, stop + 1), self._tabulate(start, stop, executor), normalize=True
+            )
+
+        # every point is computed from its index, rather than by repeatedly adding the step, so rounding errors never
+        # accumulate along the grid
+        x = start + step * np.arange(max(math.floor((stop - start) / step * (1 + 1e-12)) + 1, 0))
+
+        return drv.DiscreteRandomVariable.from_arrays(x, self.equals(x), normalize=True)
+
+    def _truncation_bounds(
+            self, start: typing.Optional[float], stop: typing.Optional[float], tail_tolerance: typing.Optional[float]
+    ) -> typing.Tuple[typing.Optional[float], typing.Optional[float]]:
+        # fills in the default start and stop, cutting them off where at most tail_tolerance lies beyond them if given
+        default_start, default_stop, _ = self._get_defaults()
 
-        i = start
-        while i <= stop:
-            x.append(i)
-            px.append(self.equals(i))
+        if tail_tolerance is not None:
+            if not 0 < tail_tolerance < 1:
+                raise ValueError("The tail tolerance must be between 0 and 1. Got {}.".format(tail_tolerance))
 
-            i += step
+            # the mass below ppf(t) is below t, and the mass above isf(t) is at most t (isf works from the sf itself, so
+            # small upper tails are not lost to rounding in 1 - cdf)
+            default_start = self.ppf(tail_tolerance)
+            default_stop = self.isf(tail_tolerance)
 
-        return drv.DiscreteRandomVariable.correct_probabilities(x, px)
+        return default_start if start is None else start, default_stop if stop is None else stop
@@ -1,9 +1,137 @@
 import abc
+import collections.abc
+import functools
 import math
+import operator
 import typing
 
+import numpy as np
+
+import ProbDistro.cache as cache
+import ProbDistro.estimation as estimation
+import ProbDistro.instrumentation as instrumentation
+import ProbDistro.parallel as parallel
+
+
+def vectorized(method: callable) -> callable:
+    """
+    Decorates a single argument distribution method (such as pmf or cdf) so NumPy arrays are evaluated by the
+    matching "_<name>_array" kernel in a single whole-array pass, while scalar arguments keep the original method
+    (going through the evaluation cache, when one is enabled)
+    """
+    kernel = "_{}_array".format(method.__name__)
+    scalar = cache.cached(method)
+
+    @functools.wraps(method)
+    def wrapper(self, x):
+        if isinstance(x, np.ndarray):
+            return getattr(self, kernel)(x)
+
+        return scalar(self, x)
+
+    return wrapper
+
+
+class _DistributionMeta(abc.ABCMeta):
+    def __call__(cls, *args, **kwargs):
+        # parameters may only be assigned while __init__ runs, after which the distribution is frozen
+        distribution = cls.__new__(cls)
+        object.__setattr__(distribution, "_frozen", False)
+
+        distribution.__init__(*args, **kwargs)
+        object.__setattr__(distribution, "_frozen", True)
+
+        return distribution
+
+
+def _restore(cls: type, state: tuple) -> 'BaseDistribution':
+    # rebuilds a pickled (or copied) distribution from its slot values without running __init__ again
+    distribution = cls.__new__(cls)
+
+    for name, value in state:
+        object.__setattr__(distribution, name, value)
+
+    object.__setattr__(distribution, "_frozen", True)
+
+    return distribution
+
+
+class BaseDistribution(abc.ABC, metaclass=_DistributionMeta):
+    # distributions are immutable: the parameters live in slots which can only be assigned by __init__, so equal
+    # distributions hash equally, and evaluations can be cached against them
+    __slots__ = ("_frozen",)
+
+    # every slot holding state, and the public parameters among them in declaration order, filled in per subclass
+    _slots = ()
+    _fields = ()
+    _parameter_getter = staticmethod(lambda distribution: ())
+
+    # whether instances also have a __dict__ (a subclass without __slots__), whose public entries are parameters too
+    _dynamic = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        cls._slots = tuple(
+            name for klass in reversed(cls.__mro__) for name in klass.__dict__.get("__slots__", ())
+            if name != "_frozen"
+        )
+        cls._fields = tuple(name for name in cls._slots if not name.startswith("_"))
+        cls._dynamic = any("__slots__" not in klass.__dict__ for klass in cls.__mro__[:-1])
+
+        if len(cls._fields) > 1:
+            cls._parameter_getter = staticmethod(operator.attrgetter(*cls._fields))
+
+        elif cls._fields:
+            getter = operator.attrgetter(cls._fields[0])
+            cls._parameter_getter = staticmethod(lambda distribution: (getter(distribution),))
+
+        # distributions defined while instrumentation is recording are recorded too
+        if instrumentation.active() is not None:
+            instrumentation._attach(cls)
+
+    def __setattr__(self, name: str, value: typing.Any):
+        # private slots may still be filled in later, to cache values derived from the parameters
+        if self._frozen and not name.startswith("_"):
+            raise AttributeError("{} distributions are immutable, so '{}' cannot be reassigned".format(
+                self.__class__.__name__, name
+            ))
+
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name: str):
+        raise AttributeError("{} distributions are immutable, so '{}' cannot be deleted".format(
+            self.__class__.__name__, name
+        ))
+
+    def __reduce__(self):
+        # slots which are never filled in (such as constants which have not been needed yet) are left empty
+        state = tuple((name, getattr(self, name)) for name in self._slots if hasattr(self, name))
+
+        if self._dynamic:
+            state += tuple(vars(self).items())
+
+        return _restore, (type(self), state)
+
+    def _parameters(self) -> tuple:
+        if self._dynamic:
+            return self._parameter_getter(self) + self._dynamic_parameters()
+
+        return self._parameter_getter(self)
+
+    def _dynamic_parameters(self) -> tuple:
+        # public attributes a subclass without __slots__ keeps in its __dict__, as (name, value) pairs
+        return tuple(item for item in vars(self).items() if not item[0].startswith("_"))
+
+    def __eq__(self, other: typing.Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self._parameters() == other._parameters()
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._parameters()))
 
-class BaseDistribution(abc.ABC):
     @abc.abstractmethod
     def cdf(self, x: float) -> float:
         pass
@@ -40,6 +168,122 @@ class BaseDistribution(abc.ABC):
     def greater_than_equals(self, x: float) -> float:
         pass
 
+    def sf(self, x: float) -> float:
+        return 1 - self.cdf(x)
+
+    def logcdf(self, x: float) -> float:
+        return self._log(self.cdf(x))
+
+    def logsf(self, x: float) -> float:
+        return self._log(self.sf(x))
+
+    def ppf(self, q: float) -> float:
+        """
+        The quantile function (inverse of the CDF): the smallest x with P(X <= x) >= q
+
+        :param q: a probability (or array of probabilities, all resolved in a single pass)
+        """
+        self._check_probability(q)
+
+        if isinstance(q, np.ndarray):
+            return self._ppf_array(q)
+
+        return self._ppf(q)
+
+    def isf(self, q: float) -> float:
+        """
+        The inverse survival function: the smallest x with P(X > x) <= q.
+        Small upper tail probabilities are resolved directly, rather than being rounded away by ppf(1 - q)
+
+        :param q: a probability (or array of probabilities, all resolved in a single pass)
+        """
+        self._check_probability(q)
+
+        if isinstance(q, np.ndarray):
+            return self._isf_array(q)
+
+        return self._isf(q)
+
+    def _ppf(self, q: float) -> float:
+        return self._ppf_array(np.array([q], dtype=float))[0].item()
+
+    def _isf(self, q: float) -> float:
+        return self._isf_array(np.array([q], dtype=float))[0].item()
+
+    def _ppf_array(self, q: np.ndarray) -> np.ndarray:
+        raise NotImplementedError("{} does not support quantiles".format(self.__class__.__name__))
+
+    def _isf_array(self, q: np.ndarray) -> np.ndarray:
+        return self._ppf_array(1 - q)
+
+    @staticmethod
+    def _check_probability(q: float):
+        if isinstance(q, np.ndarray):
+            valid = (q >= 0) & (q <= 1)
+
+            if valid.all():
+                return
+
+            q = q[~valid][0]
+
+        elif 0 <= q <= 1:
+            return
+
+        raise ValueError("q={} is not a valid probability!".format(q))
+
+    @classmethod
+    def fit(cls, data: typing.Any, **options) -> 'BaseDistribution':
+        """
+        Estimates the parameters of this distribution from observations, by maximum likelihood, in a single pass
+
+        :param data: an array or sequence of observations, or an iterator (such as a generator) of observations
+        and/or chunks of observations, which is consumed one chunk at a time, so it never has to fit in memory
+        :param options: fixed (not estimated) arguments of the distribution, such as include_success_trial
+        """
+        return cls.partial_fit(data, **options).result()
+
+    @classmethod
+    def partial_fit(cls, data: typing.Any, estimator: estimation.Estimator = None, **options) -> estimation.Estimator:
+        """
+        Folds observations into an estimator, which can keep taking more data (through its own partial_fit), be
+        merged with the estimators of other workers, and give the fitted distribution through its result method
+
+        :param data: the observations, as accepted by fit
+        :param estimator: an estimator to continue, or None to start a new one
+        :param options: fixed (not estimated) arguments of the distribution, such as include_success_trial
+        """
+        if estimator is None:
+            estimator = estimation.Estimator(cls, **options)
+
+        return estimator.partial_fit(data)
+
+    @classmethod
+    def _from_moments(cls, estimator: estimation.Estimator, **options) -> 'BaseDistribution':
+        # builds the maximum likelihood distribution from the count, mean and sum of squares of the observations
+        raise NotImplementedError("{} does not support fitting".format(cls.__name__))
+
+    @classmethod
+    def _check_sample(cls, x: np.ndarray, **options):
+        # raises a ValueError for observations the distribution could never produce, whatever its parameters
+        pass
+
+    @staticmethod
+    def _require(x: np.ndarray, supported: np.ndarray):
+        if not supported.all():
+            raise ValueError("x={} is not supported by this distribution!".format(x[~supported][0]))
+
+    def sample(self, size: typing.Union[int, typing.Tuple[int, ...]] = None, seed: typing.Any = None):
+        """
+        Draws random values from this distribution
+
+        :param size: the shape of the array of draws to return, or None for a single draw
+        :param seed: a numpy.random.Generator, or a seed to create one from (None draws fresh entropy from the OS)
+        """
+        return self._sample(np.random.default_rng(seed), size)
+
+    def _sample(self, rng: np.random.Generator, size: typing.Union[int, typing.Tuple[int, ...]]):
+        raise NotImplementedError("{} does not support sampling".format(self.__class__.__name__))
+
     def __call__(self, x: float) -> float:
         return self.equals(x)
 
@@ -57,24 +301,82 @@ class BaseDistribution(abc.ABC):
         pass
 
     def _check_supported(self, x: float):
-        if self._is_supported(x):
+        if isinstance(x, np.ndarray):
+            supported = self._is_supported_array(x)
+
+            if supported.all():
+                return
+
+            x = x[~supported][0]
+
+        elif self._is_supported(x):
             return
 
         raise ValueError("x={} is not supported by this distribution!".format(x))
 
+    def _is_supported_array(self, x: np.ndarray) -> np.ndarray:
+        return np.vectorize(self._is_supported, otypes=[bool])(x)
+
+    @staticmethod
+    def _log(x: float) -> float:
+        if isinstance(x, np.ndarray):
+            with np.errstate(divide="ignore"):
+                return np.log(x)
+
+        return math.log(x) if x > 0 else -math.inf
+
+    @staticmethod
+    def _exp(x: float) -> float:
+        if isinstance(x, np.ndarray):
+            return np.exp(x)
+
+        return math.exp(x)
+
+    @staticmethod
+    def _is_integer_array(x: np.ndarray) -> np.ndarray:
+        return np.floor(x) == x
+
     def _format_variables(self) -> str:
-        return " ".join("{}={}".format(k, v) for k, v in self.__dict__.items())
+        variables = tuple((name, getattr(self, name)) for name in self._fields)
+
+        if self._dynamic:
+            variables += self._dynamic_parameters()
+
+        return " ".join("{}={}".format(name, value) for name, value in variables)
 
     @staticmethod
     def _ncr(n: int, r: int) -> int:
-        return math.factorial(n) // (math.factorial(r) * math.factorial(n - r))
+        if r > n:
+            raise ValueError("Cannot choose {} items out of {}".format(r, n))
+
+        return math.comb(n, r)
 
     @staticmethod
     def _npr(n: int, r: int) -> int:
-        return math.factorial(n) // math.factorial(n - r)
+        if r > n:
+            raise ValueError("Cannot choose {} items out of {}".format(r, n))
+
+        return math.perm(n, r)
+
+    def _equals_range(
+            self, x: typing.Iterable, caller: callable, executor: parallel.Executor = None
+    ) -> typing.Union[list, np.ndarray]:
+
+        if executor is not None:
+            caller = functools.partial(parallel.evaluate, self, caller.__name__, executor=executor)
+
+        if isinstance(x, np.ndarray):
+            return caller(x)
+
+        if not isinstance(x, collections.abc.Sequence):
+            x = list(x)
 
-    def _equals_range(self, x: typing.Iterable, caller: callable) -> list:
-        return [caller(i) for i in x]
+        return caller(np.asarray(x)).tolist()
 
-    def cdf_range(self, x: typing.Iterable):
-        return self._equals_range(x, self.cdf)
+    def cdf_range(self, x: typing.Iterable, executor: parallel.Executor = None):
+        """
+        :param x: the values to evaluate the CDF at
+        :param executor: a concurrent.futures executor (or a number of worker processes) to split the values across.
+        The results are identical to evaluating them serially
+        """
+        return self._equals_range(x, self.cdf, executor)
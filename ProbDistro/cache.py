@@ -0,0 +1,146 @@
+import collections
+import contextlib
+import functools
+import threading
+import typing
+
+CacheInfo = collections.namedtuple("CacheInfo", ["hits", "misses", "evictions", "size", "maxsize", "policy"])
+
+
+class EvaluationCache:
+    """
+    A bounded cache of distribution evaluations (pmf, cdf, moments, ...), keyed on the distribution, the method and
+    its argument. Distributions are compared by value, so equal distributions created separately share entries
+    """
+    policies = ("lru", "fifo")
+
+    def __init__(self, maxsize: int = 4096, policy: str = "lru"):
+        """
+        :param maxsize: the number of results to keep before the oldest are evicted
+        :param policy: "lru" evicts the least recently used result, "fifo" the least recently added one
+        """
+        if maxsize < 1:
+            raise ValueError("The cache must hold at least 1 result. Got {}.".format(maxsize))
+
+        if policy not in self.policies:
+            raise ValueError("Unknown eviction policy '{}'. Expected one of {}.".format(policy, self.policies))
+
+        self.maxsize = maxsize
+        self.policy = policy
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, key: typing.Hashable, compute: typing.Callable[[], typing.Any]) -> typing.Any:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+
+                if self.policy == "lru":
+                    self._entries.move_to_end(key)
+
+                return self._entries[key]
+
+            self.misses += 1
+
+        # computed outside the lock, since evaluations often query the cache themselves (cdf summing pmf values)
+        value = compute()
+
+        with self._lock:
+            self._entries[key] = value
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return value
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, len(self._entries), self.maxsize, self.policy)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# the cache currently in use, or None while caching is disabled (the default)
+_active: typing.Optional[EvaluationCache] = None
+
+
+def enable(maxsize: int = 4096, policy: str = "lru") -> EvaluationCache:
+    """
+    Starts caching evaluations in a new, empty cache, replacing any cache already in use
+
+    :param maxsize: the number of results to keep before the oldest are evicted
+    :param policy: "lru" or "fifo"
+    """
+    global _active
+    _active = EvaluationCache(maxsize, policy)
+
+    return _active
+
+
+def disable():
+    global _active
+    _active = None
+
+
+def active() -> typing.Optional[EvaluationCache]:
+    return _active
+
+
+def info() -> typing.Optional[CacheInfo]:
+    return None if _active is None else _active.info()
+
+
+def clear():
+    if _active is not None:
+        _active.clear()
+
+
+@contextlib.contextmanager
+def caching(maxsize: int = 4096, policy: str = "lru") -> typing.Iterator[EvaluationCache]:
+    """
+    Caches evaluations for the duration of a with block, restoring whatever cache was in use beforehand
+    """
+    global _active
+    previous = _active
+
+    try:
+        yield enable(maxsize, policy)
+    finally:
+        _active = previous
+
+
+def cached(method: callable) -> callable:
+    """
+    Decorates a distribution method so its results go through the active cache. Calls with unhashable distributions
+    (such as DiscreteRandomVariable, which can be modified) or arguments are evaluated directly
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args):
+        cache = _active
+
+        if cache is None:
+            return method(self, *args)
+
+        try:
+            key = (self, name, args)
+            hash(key)
+
+        except TypeError:
+            return method(self, *args)
+
+        return cache.lookup(key, lambda: method(self, *args))
+
+    return wrapper
@@ -1,9 +1,16 @@
 import math
 
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
+import ProbDistro.base_batch_distribution as base_batch_distribution
 import ProbDistro.base_continuous_distribution as base_continuous_distribution
+import ProbDistro.cache as cache
 
 
 class Exponential(base_continuous_distribution.BaseContinuousDistribution):
+    __slots__ = ('rate',)
+
     def __init__(self, rate: float):
         """
         A continuous random variable representing the probability of time between events of a Poisson distribution
@@ -15,17 +22,100 @@ class Exponential(base_continuous_distribution.BaseContinuousDistribution):
         """
         self.rate = rate
 
+    @base_distribution.vectorized
     def pdf(self, x: float) -> float:
-        return self.rate * math.e ** (-self.rate * x)
+        if x < 0:
+            return 0
+
+        return self.rate * math.exp(-self.rate * x)
+
+    def _pdf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.where(x >= 0, self.rate * np.exp(-self.rate * x), 0.0)
 
+    @base_distribution.vectorized
     def cdf(self, x: float) -> float:
-        return 1 - math.e ** (-self.rate * x)
+        if x < 0:
+            return 0
+
+        return -math.expm1(-self.rate * x)
+
+    def _cdf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.where(x >= 0, -np.expm1(-self.rate * x), 0.0)
+
+    @base_distribution.vectorized
+    def logpdf(self, x: float) -> float:
+        if x < 0:
+            return -math.inf
+
+        return math.log(self.rate) - self.rate * x
+
+    def _logpdf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.where(x >= 0, np.log(self.rate) - self.rate * x, -np.inf)
+
+    @base_distribution.vectorized
+    def logcdf(self, x: float) -> float:
+        return self._log(self.cdf(x))
+
+    def _logcdf_array(self, x: np.ndarray) -> np.ndarray:
+        return self._log(self._cdf_array(x))
+
+    @base_distribution.vectorized
+    def sf(self, x: float) -> float:
+        return math.exp(-self.rate * max(x, 0))
+
+    def _sf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.exp(-self.rate * np.maximum(x, 0))
+
+    @base_distribution.vectorized
+    def logsf(self, x: float) -> float:
+        return -self.rate * max(x, 0)
 
+    def _logsf_array(self, x: np.ndarray) -> np.ndarray:
+        return -self.rate * np.maximum(x, 0)
+
+    def _ppf_array(self, q: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore"):
+            return -np.log1p(-q) / self.rate
+
+    def _isf_array(self, q: np.ndarray) -> np.ndarray:
+        with np.errstate(divide="ignore"):
+            return -np.log(q) / self.rate
+
+    def _sample(self, rng: np.random.Generator, size):
+        # inverse CDF, using 1 - u (which lies in (0, 1]) so the logarithm is always finite
+        return -np.log1p(-rng.random(size)) / self.rate
+
+    @classmethod
+    def _from_moments(cls, estimator, **options) -> 'Exponential':
+        return cls(1 / estimator.mean)
+
+    @classmethod
+    def _check_sample(cls, x: np.ndarray, **options):
+        cls._require(x, x >= 0)
+
+    @cache.cached
     def expected_value(self) -> float:
         return 1 / self.rate
 
+    @cache.cached
     def variance(self) -> float:
         return 1 / (self.rate ** 2)
 
     def _is_supported(self, x: float) -> bool:
         return x >= 0
+
+    def _is_supported_array(self, x: np.ndarray) -> np.ndarray:
+        return x >= 0
+
+
+class ExponentialBatch(base_batch_distribution.BatchDistribution, Exponential):
+    __slots__ = ()
+
+    def __init__(self, rate: np.ndarray):
+        """
+        Many exponential distributions at once, evaluated together. Each distribution takes its rate from the
+        matching element of "rate"
+
+        :param rate: array of the average rates of arrivals
+        """
+        super().__init__(*self._parameter_arrays(rate))
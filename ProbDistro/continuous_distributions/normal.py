@@ -1,9 +1,17 @@
 import math
 
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
+import ProbDistro.base_batch_distribution as base_batch_distribution
 import ProbDistro.base_continuous_distribution as base_continuous_distribution
+import ProbDistro.cache as cache
+import ProbDistro.special as special
 
 
 class Normal(base_continuous_distribution.BaseContinuousDistribution):
+    __slots__ = ('mu', 'sigma')
+
     def __init__(self, mean: float, variance: float):
         """
          A continuous random variable representing a bell curve distribution, which is ubiquitous.
@@ -14,17 +22,88 @@ class Normal(base_continuous_distribution.BaseContinuousDistribution):
         self.mu = mean
         self.sigma = variance
 
+    @base_distribution.vectorized
     def pdf(self, x: float) -> float:
         a = 1 / (self.sigma * math.sqrt(2 * math.pi))
         b = -0.5 * ((x - self.mu) / self.sigma) ** 2
 
         return a * math.e ** b
 
+    def _pdf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.exp(-0.5 * ((x - self.mu) / self.sigma) ** 2) / (self.sigma * math.sqrt(2 * math.pi))
+
+    @base_distribution.vectorized
     def cdf(self, x: float) -> float:
         return 0.5 * (1 + math.erf((x - self.mu) / (self.sigma * math.sqrt(2))))
 
+    def _cdf_array(self, x: np.ndarray) -> np.ndarray:
+        return 0.5 * special.erfc((self.mu - x) / (self.sigma * math.sqrt(2)))
+
+    @base_distribution.vectorized
+    def logpdf(self, x: float) -> float:
+        return -0.5 * ((x - self.mu) / self.sigma) ** 2 - math.log(self.sigma * math.sqrt(2 * math.pi))
+
+    def _logpdf_array(self, x: np.ndarray) -> np.ndarray:
+        return -0.5 * ((x - self.mu) / self.sigma) ** 2 - np.log(self.sigma * math.sqrt(2 * math.pi))
+
+    @base_distribution.vectorized
+    def logcdf(self, x: float) -> float:
+        return special.log_ndtr((x - self.mu) / self.sigma)
+
+    def _logcdf_array(self, x: np.ndarray) -> np.ndarray:
+        return special.log_ndtr((x - self.mu) / self.sigma)
+
+    @base_distribution.vectorized
+    def logsf(self, x: float) -> float:
+        return special.log_ndtr((self.mu - x) / self.sigma)
+
+    def _logsf_array(self, x: np.ndarray) -> np.ndarray:
+        return special.log_ndtr((self.mu - x) / self.sigma)
+
+    @base_distribution.vectorized
+    def sf(self, x: float) -> float:
+        return 0.5 * math.erfc((x - self.mu) / (self.sigma * math.sqrt(2)))
+
+    def _sf_array(self, x: np.ndarray) -> np.ndarray:
+        return 0.5 * special.erfc((x - self.mu) / (self.sigma * math.sqrt(2)))
+
+    def _ppf_array(self, q: np.ndarray) -> np.ndarray:
+        return self.mu + self.sigma * special.ndtri(q)
+
+    def _isf_array(self, q: np.ndarray) -> np.ndarray:
+        return self.mu - self.sigma * special.ndtri(q)
+
+    def _sample(self, rng: np.random.Generator, size):
+        # NumPy's standard normal generator uses the ziggurat method
+        return self.mu + self.sigma * rng.standard_normal(size)
+
+    @classmethod
+    def _from_moments(cls, estimator, **options) -> 'Normal':
+        # the second parameter is used as the standard deviation (variance() returns its square)
+        return cls(estimator.mean, math.sqrt(estimator.variance()))
+
+    @classmethod
+    def _check_sample(cls, x: np.ndarray, **options):
+        cls._require(x, np.isfinite(x))
+
+    @cache.cached
     def expected_value(self) -> float:
         return self.mu
 
+    @cache.cached
     def variance(self) -> float:
         return self.sigma ** 2
+
+
+class NormalBatch(base_batch_distribution.BatchDistribution, Normal):
+    __slots__ = ()
+
+    def __init__(self, mean: np.ndarray, variance: np.ndarray):
+        """
+        Many normal distributions at once, evaluated together. Each distribution takes its parameters from the
+        matching elements of "mean" and "variance" (which are broadcast against each other)
+
+        :param mean: array of the means of the distributions
+        :param variance: array of the variances of the distributions
+        """
+        super().__init__(*self._parameter_arrays(mean, variance))
@@ -1,7 +1,14 @@
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
+import ProbDistro.base_batch_distribution as base_batch_distribution
 import ProbDistro.base_continuous_distribution as base_continuous_distribution
+import ProbDistro.cache as cache
 
 
 class Uniform(base_continuous_distribution.BaseContinuousDistribution):
+    __slots__ = ('a', 'b')
+
     def __init__(self, a: float, b: float):
         """
          A continuous random variable representing equally likely outcomes between "a" and "b"
@@ -14,12 +21,17 @@ class Uniform(base_continuous_distribution.BaseContinuousDistribution):
         self.a = min(a, b)
         self.b = max(a, b)
 
+    @base_distribution.vectorized
     def pdf(self, x: float) -> float:
         if self.a <= x <= self.b:
             return 1 / (self.b - self.a)
 
         return 0
 
+    def _pdf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.where((self.a <= x) & (x <= self.b), 1 / (self.b - self.a), 0.0)
+
+    @base_distribution.vectorized
     def cdf(self, x: float) -> float:
         if x < self.a:
             return 0
@@ -29,8 +41,36 @@ class Uniform(base_continuous_distribution.BaseContinuousDistribution):
 
         return 1
 
+    def _cdf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.clip((x - self.a) / (self.b - self.a), 0.0, 1.0)
+
+    def _sample(self, rng: np.random.Generator, size):
+        return self.a + (self.b - self.a) * rng.random(size)
+
+    def _ppf_array(self, q: np.ndarray) -> np.ndarray:
+        return self.a + q * (self.b - self.a)
+
+    def _isf_array(self, q: np.ndarray) -> np.ndarray:
+        return self.b - q * (self.b - self.a)
+
+    @cache.cached
     def expected_value(self) -> float:
         return 0.5 * (self.a + self.b)
 
+    @cache.cached
     def variance(self) -> float:
         return 1 / 12 * (self.b - self.a) ** 2
+
+
+class UniformBatch(base_batch_distribution.BatchDistribution, Uniform):
+    __slots__ = ()
+
+    def __init__(self, a: np.ndarray, b: np.ndarray):
+        """
+        Many uniform distributions at once, evaluated together. Each distribution takes its bounds from the matching
+        elements of "a" and "b" (which are broadcast against each other), correcting them if they are backwards
+
+        :param a: array of the lower bounds
+        :param b: array of the upper bounds
+        """
+        self.a, self.b = self._parameter_arrays(np.minimum(a, b), np.maximum(a, b))
@@ -1,7 +1,14 @@
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
+import ProbDistro.base_batch_distribution as base_batch_distribution
 import ProbDistro.base_discrete_distribution as base_discrete_distribution
+import ProbDistro.cache as cache
 
 
 class Bernoulli(base_discrete_distribution.BaseDiscreteDistribution):
+    __slots__ = ('p', 'q')
+
     def __init__(self, p: float):
         """
         A discrete random variable which can be used to represent the outcome of a single yes/no experiment.
@@ -12,9 +19,14 @@ class Bernoulli(base_discrete_distribution.BaseDiscreteDistribution):
         self.p = p
         self.q = 1 - p
 
+    @base_distribution.vectorized
     def pmf(self, x: float) -> float:
         return self.p if x == 1 else self.q
 
+    def _pmf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.where(x == 1, self.p, self.q)
+
+    @base_distribution.vectorized
     def cdf(self, x: float) -> float:
         if x < 0:
             return 0
@@ -24,14 +36,52 @@ class Bernoulli(base_discrete_distribution.BaseDiscreteDistribution):
 
         return 1
 
+    def _cdf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.where(x < 0, 0.0, np.where(x < 1, self.q, 1.0))
+
     def _is_supported(self, x: float) -> bool:
         return float(x) in (0, 1)
 
+    def _is_supported_array(self, x: np.ndarray) -> np.ndarray:
+        return (x == 0) | (x == 1)
+
+    def _ppf_array(self, q: np.ndarray) -> np.ndarray:
+        return np.where(q <= self.q, 0.0, 1.0)
+
+    def _isf_array(self, q: np.ndarray) -> np.ndarray:
+        return np.where(q >= self.p, 0.0, 1.0)
+
+    def _sample(self, rng: np.random.Generator, size):
+        return rng.binomial(1, self.p, size)
+
+    @classmethod
+    def _from_moments(cls, estimator, **options) -> 'Bernoulli':
+        return cls(estimator.mean)
+
+    @classmethod
+    def _check_sample(cls, x: np.ndarray, **options):
+        cls._require(x, (x == 0) | (x == 1))
+
+    @cache.cached
     def expected_value(self) -> float:
         return self.p
 
+    @cache.cached
     def variance(self) -> float:
         return self.p * self.q
 
     def _get_defaults(self) -> tuple:
         return 0, 1, 1
+
+
+class BernoulliBatch(base_batch_distribution.BatchDistribution, Bernoulli):
+    __slots__ = ()
+
+    def __init__(self, p: np.ndarray):
+        """
+        Many Bernoulli distributions at once, evaluated together. Each distribution takes its probability of success
+        from the matching element of "p"
+
+        :param p: array of the probabilities of success
+        """
+        super().__init__(*self._parameter_arrays(p))
@@ -1,8 +1,18 @@
+import math
+
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
+import ProbDistro.base_batch_distribution as base_batch_distribution
 import ProbDistro.base_discrete_distribution as base_discrete_distribution
+import ProbDistro.cache as cache
+import ProbDistro.special as special
 import ProbDistro.discrete_distributions.poisson as poisson
 
 
 class Binomial(base_discrete_distribution.BaseDiscreteDistribution):
+    __slots__ = ('n', 'p', 'q')
+
     def __init__(self, n: int, p: float):
         """
         A discrete random variable which can be used to represent the outcome of "n" yes/no experiments
@@ -15,17 +25,77 @@ class Binomial(base_discrete_distribution.BaseDiscreteDistribution):
         self.p = p
         self.q = 1 - p
 
+    @base_distribution.vectorized
     def pmf(self, x: int) -> float:
-        return self._ncr(self.n, x) * self.p ** x * self.q ** (self.n - x)
+        if not self._is_supported(x):
+            return 0
+
+        x = int(x)
+
+        if self.n <= self._exact_limit:
+            return self._ncr(self.n, x) * self.p ** x * self.q ** (self.n - x)
+
+        return math.exp(self.logpmf(x))
+
+    def _pmf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.exp(self._logpmf_array(x))
+
+    @base_distribution.vectorized
+    def logpmf(self, x: int) -> float:
+        if not self._is_supported(x):
+            return -math.inf
 
+        return special.binomial_logpmf(x, self.n, self.p)
+
+    def _logpmf_array(self, x: np.ndarray) -> np.ndarray:
+        supported = self._is_supported_array(x)
+
+        return np.where(supported, special.binomial_logpmf(np.where(supported, x, 0), self.n, self.p), -np.inf)
+
+    @base_distribution.vectorized
     def cdf(self, x: int) -> float:
         if x < 0:
             return 0
 
-        if 0 <= x <= self.n:
-            return sum(self.pmf(i) for i in range(x + 1))
+        if x >= self.n:
+            return 1
+
+        k = math.floor(x)
 
-        return 1
+        if self.n <= self._exact_limit:
+            return sum(self.pmf(i) for i in range(k + 1))
+
+        return special.betainc(self.n - k, k + 1, self.q)
+
+    def _cdf_array(self, x: np.ndarray) -> np.ndarray:
+        k = np.clip(np.floor(x), 0, np.maximum(self.n - 1, 0))
+        result = special.betainc(self.n - k, k + 1, self.q)
+
+        return np.where(x < 0, 0.0, np.where(x >= self.n, 1.0, result))
+
+    @base_distribution.vectorized
+    def sf(self, x: int) -> float:
+        if x < 0:
+            return 1
+
+        if x >= self.n:
+            return 0
+
+        # the incomplete beta function gives the upper tail directly at every size, where 1 - cdf(x) would cancel
+        k = math.floor(x)
+        return max(special.betainc(k + 1, self.n - k, self.p), 0.0)
+
+    def _sf_array(self, x: np.ndarray) -> np.ndarray:
+        k = np.clip(np.floor(x), 0, np.maximum(self.n - 1, 0))
+        result = np.maximum(special.betainc(k + 1, self.n - k, self.p), 0.0)
+
+        return np.where(x < 0, 1.0, np.where(x >= self.n, 0.0, result))
+
+    def _pmf_ratio(self, k: np.ndarray) -> tuple:
+        return (self.n - k) * self.p, (k + 1) * self.q
+
+    def _mode(self) -> int:
+        return min(math.floor((self.n + 1) * self.p), self.n)
 
     def _is_supported(self, x: float) -> bool:
         if isinstance(x, float):
@@ -34,9 +104,18 @@ class Binomial(base_discrete_distribution.BaseDiscreteDistribution):
 
         return 0 <= x <= self.n
 
+    def _is_supported_array(self, x: np.ndarray) -> np.ndarray:
+        return self._is_integer_array(x) & (x >= 0) & (x <= self.n)
+
+    def _sample(self, rng: np.random.Generator, size):
+        # NumPy switches to the BTPE rejection algorithm once n * min(p, q) is large
+        return rng.binomial(self.n, self.p, size)
+
+    @cache.cached
     def expected_value(self) -> float:
         return self.n * self.p
 
+    @cache.cached
     def variance(self) -> float:
         return self.n * self.p * self.q
 
@@ -45,3 +124,17 @@ class Binomial(base_discrete_distribution.BaseDiscreteDistribution):
 
     def _get_defaults(self) -> tuple:
         return 0, self.n, 1
+
+
+class BinomialBatch(base_batch_distribution.BatchDistribution, Binomial):
+    __slots__ = ()
+
+    def __init__(self, n: np.ndarray, p: np.ndarray):
+        """
+        Many binomial distributions at once, evaluated together. Each distribution takes its number of trials and
+        probability of success from the matching elements of "n" and "p" (which are broadcast against each other)
+
+        :param n: array of the numbers of trials
+        :param p: array of the probabilities of success
+        """
+        super().__init__(*self._parameter_arrays(n, p))
@@ -1,22 +1,106 @@
 import math
+import numbers
+import struct
 import typing
+
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
 import ProbDistro.base_discrete_distribution as base_discrete_distribution
+import ProbDistro.estimation as estimation
+import ProbDistro.parallel as parallel
+
+# large files are read this many values at a time, so only a bounded slice of them is ever held in memory
+_FILE_BLOCK = 1 << 22
+
+# the header of a saved random variable: magic bytes, format version, flags, support size and the dtype of the support
+_HEADER = struct.Struct("<4sHHQ16s")
+_MAGIC = b"PDRV"
+_VERSION = 1
+_HAS_CUMULATIVE = 1
+
+# every array in a saved file starts on a multiple of this many bytes, so it can be mapped and read without copying
+_ALIGNMENT = 64
 
 
 class DiscreteRandomVariable(base_discrete_distribution.BaseDiscreteDistribution):
+    __slots__ = ('x', 'px', '_cumulative', '_alias_table', '_moment_table', '_tail_table', '_normalization_error')
+
+    # unlike the parametric distributions, random variables can be edited in place (and renormalized), so they are
+    # mutable, compared by identity, and never hashed or cached
+    __setattr__ = object.__setattr__
+    __delattr__ = object.__delattr__
+    __eq__ = object.__eq__
+    __hash__ = None
+
+    # below this many multiplications, lattice convolutions are computed directly rather than through an FFT
+    _direct_convolution_limit = 1 << 16
+
     def __init__(self, x: typing.Sequence[float], px: typing.Sequence[float]):
-        if round(sum(px), 10) != 1:
-            raise ValueError(
-                "Sum of all probabilities must equal 1 by law of total probability. Got {}.".format(sum(px))
-            )
+        self._set_arrays(np.array(x), np.array(px, dtype=float), False)
 
+    def _set_arrays(self, x: np.ndarray, px: np.ndarray, normalize: bool):
         if len(x) != len(px):
             raise ValueError("There are {} x values, but {} probabilities. These counts must match.".format(
                 len(x), len(px)
             ))
 
-        self.x = list(x)
-        self.px = list(px)
+        if x.ndim != 1:
+            raise ValueError("The support must be one dimensional")
+
+        if len(x) > 1 and not (x[1:] > x[:-1]).all():
+            x, px = self._sort_support(x, px)
+
+        self.x = x
+        self.px = px
+
+        self._cumulative = (px, np.cumsum(px))
+        self._normalization_error = 0.0
+        self._invalidate()
+
+        if normalize:
+            self.normalize()
+
+        elif round(self._total(), 10) != 1:
+            raise ValueError(
+                "Sum of all probabilities must equal 1 by law of total probability. Got {}.".format(self._total())
+            )
+
+    @staticmethod
+    def _sort_support(x: np.ndarray, px: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # sorts the support (carrying the probabilities along), merging any repeated values into a single point
+        order = np.argsort(x, kind="stable")
+        x, px = x[order], px[order]
+
+        x, first = np.unique(x, return_index=True)
+        return x, np.add.reduceat(px, first) if len(px) else px
+
+    def _totals(self) -> np.ndarray:
+        # running totals of px, so cdf(self.x[i]) == self._totals()[i]. Rebuilt if px has since been replaced
+        if self._cumulative[0] is not self.px:
+            self._cumulative = (self.px, np.cumsum(self.px))
+
+        return self._cumulative[1]
+
+    def _total(self) -> float:
+        cumulative = self._totals()
+
+        return float(cumulative[-1]) if len(cumulative) else 0.0
+
+    @classmethod
+    def from_arrays(cls, x: typing.Any, px: typing.Any, normalize: bool = False) -> 'DiscreteRandomVariable':
+        """
+        Creates a random variable on top of existing buffers (NumPy arrays, array.array, memoryview, ...) without
+        copying them, as long as the support is already sorted without repeated values, and px holds 64 bit floats
+
+        :param x: the support of the random variable
+        :param px: the probability of each value in the support
+        :param normalize: rescale px in place so it sums to 1, rather than requiring it to already do so
+        """
+        rv = cls.__new__(cls)
+        rv._set_arrays(np.asarray(x), np.asarray(px, dtype=float), normalize)
+
+        return rv
 
     @classmethod
     def from_dict(cls, data: dict, correct: bool = False):
@@ -35,46 +119,634 @@ class DiscreteRandomVariable(base_discrete_distribution.BaseDiscreteDistribution
 
     @classmethod
     def correct_probabilities(cls, x: typing.Sequence[float], px: typing.Sequence[float]):
-        denominator = sum(px)
-        px = [i / denominator for i in px]
+        return cls.from_arrays(np.array(x), np.array(px, dtype=float), normalize=True)
+
+    def save(self, path: str, cumulative: bool = True):
+        """
+        Writes the random variable to a binary file: a fixed size header, followed by the support, the probabilities and
+        (optionally) their running totals, each stored as a contiguous array
+
+        :param path: the file to write
+        :param cumulative: also store the running totals of the probabilities, so loading does not need to recompute
+        them (which would take time proportional to the size of the support)
+        """
+        if self.x.dtype.hasobject:
+            raise ValueError("Only random variables with a numeric support can be saved")
+
+        arrays = [self.x, self.px, self._totals()] if cumulative else [self.x, self.px]
+
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(
+                _MAGIC, _VERSION, _HAS_CUMULATIVE if cumulative else 0, len(self.x), self.x.dtype.str.encode()
+            ))
+
+            for array in arrays:
+                file.write(bytes(-file.tell() % _ALIGNMENT))
+                np.ascontiguousarray(array).tofile(file)
+
+    @classmethod
+    def load(cls, path: str) -> 'DiscreteRandomVariable':
+        """
+        Opens a random variable written by save. The arrays are memory mapped (copy on write) rather than read, so
+        opening takes the same time whatever the size of the file, and every process which loads the same file shares
+        its pages. Editing the arrays in place only changes this process's copy, never the file
+        """
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            size = file.seek(0, 2)
+
+        if len(header) < _HEADER.size or header[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("{} is not a saved random variable".format(path))
+
+        _, version, flags, count, dtype = _HEADER.unpack(header)
+
+        if version > _VERSION:
+            raise ValueError("{} was saved in version {} of the format, which is newer than this release supports".format(
+                path, version
+            ))
+
+        dtypes = [np.dtype(dtype.rstrip(b"\0").decode()), np.dtype(float)]
+
+        if flags & _HAS_CUMULATIVE:
+            dtypes.append(np.dtype(float))
+
+        offset = _HEADER.size
+        arrays = []
+
+        for dtype in dtypes:
+            offset += -offset % _ALIGNMENT
+
+            if offset + count * dtype.itemsize > size:
+                raise ValueError("{} is not a saved random variable (it is shorter than its header describes)".format(
+                    path
+                ))
+
+            # viewed as plain arrays, so results computed from them are not memmaps themselves
+            arrays.append(np.memmap(path, dtype=dtype, mode="c", offset=offset, shape=(count,)).view(np.ndarray))
+            offset += count * dtype.itemsize
+
+        return cls._from_buffers(*arrays)
+
+    @classmethod
+    def _from_buffers(
+            cls, x: np.ndarray, px: np.ndarray, cumulative: np.ndarray = None
+    ) -> 'DiscreteRandomVariable':
+        # wraps arrays which were already checked (sorted and normalized) when they were written, without passing over
+        # them again, so the cost does not depend on their size
+        rv = cls.__new__(cls)
+        rv.x, rv.px = x, px
+        rv._cumulative = (px, np.cumsum(px) if cumulative is None else cumulative)
+        rv._normalization_error = 0.0
+        rv._invalidate()
+
+        return rv
+
+    @classmethod
+    def from_samples(cls, samples: typing.Any) -> 'DiscreteRandomVariable':
+        """
+        Creates the empirical distribution of a set of observations, with each distinct value weighted by how often it
+        was observed. Integer observations within a modest range are tallied with a single bincount, and anything else
+        through np.unique, so the observations are never looped over in Python
 
-        return cls(x, px)
+        :param samples: an array or sequence of observations, or an iterator (such as a generator) of observations
+        and/or chunks of observations, which is consumed one chunk at a time
+        """
+        return cls._from_chunks(estimation._chunks(samples, dtype=None))
+
+    @classmethod
+    def from_file(cls, path: str, dtype: typing.Any = None, binary: bool = False) -> 'DiscreteRandomVariable':
+        """
+        Creates the empirical distribution of the observations stored in a file, which is read a block at a time, so
+        files far larger than memory can be reduced
+
+        :param path: the file to read. A .npy file is memory mapped, and any other file is read as whitespace
+        separated text, unless binary is set
+        :param dtype: the type of the observations. Text observations are parsed as integers where they all are, and
+        floats otherwise, unless this is given. A raw binary file requires it
+        :param binary: read the file as a raw array of dtype values (as written by ndarray.tofile), memory mapping it
+        """
+        if str(path).endswith(".npy"):
+            return cls._from_chunks(cls._array_blocks(np.load(path, mmap_mode="r").ravel(), dtype))
+
+        if binary:
+            if dtype is None:
+                raise ValueError("The dtype of a raw binary file must be given")
+
+            return cls._from_chunks(cls._array_blocks(np.memmap(path, dtype=dtype, mode="r"), None))
+
+        return cls._from_chunks(cls._text_blocks(path, dtype))
+
+    @staticmethod
+    def _array_blocks(data: np.ndarray, dtype: typing.Any) -> typing.Iterator[np.ndarray]:
+        # slices a (memory mapped) array into blocks, so only one block of the file is paged in and converted at a time
+        for start in range(0, len(data), _FILE_BLOCK):
+            yield np.asarray(data[start:start + _FILE_BLOCK], dtype=dtype)
+
+    @staticmethod
+    def _text_blocks(path: str, dtype: typing.Any) -> typing.Iterator[np.ndarray]:
+        # reads whitespace separated values a block of bytes at a time, carrying any value cut off at the end of a block
+        # over to the next one
+        carry = b""
+
+        with open(path, "rb") as file:
+            while True:
+                block = file.read(_FILE_BLOCK)
+                final = not block
+                block = carry + block
+
+                cut = len(block) if final else max(block.rfind(i) for i in (b"\n", b" ", b"\t")) + 1
+                block, carry = block[:cut], block[cut:]
+
+                tokens = np.array(block.split())
+
+                if len(tokens):
+                    if dtype is not None:
+                        yield tokens.astype(dtype)
+
+                    else:
+                        try:
+                            yield tokens.astype(np.int64)
+
+                        except ValueError:
+                            yield tokens.astype(float)
+
+                if final:
+                    return
+
+    @classmethod
+    def _from_chunks(cls, chunks: typing.Iterable[np.ndarray]) -> 'DiscreteRandomVariable':
+        # tallies every chunk on its own, merging the tallies as it goes, and divides by the total count once at the end
+        x, counts = None, None
+
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+
+            values, tally = cls._count(chunk)
+
+            if x is None:
+                x, counts = values, tally
+
+            else:
+                x, counts = cls._sort_support(np.concatenate((x, values)), np.concatenate((counts, tally)))
+
+        if x is None:
+            raise ValueError("Cannot create a random variable without any observations")
+
+        return cls.from_arrays(x, counts / counts.sum())
+
+    @staticmethod
+    def _count(chunk: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # the distinct values of a chunk (in order) and how many times each occurs. Narrow types (bool, uint8, int16,
+        # float32, ...) are widened first, so the support is 64 bit and offsets from the minimum cannot wrap around
+        if chunk.dtype.kind in "biu" and chunk.dtype.itemsize < 8:
+            chunk = chunk.astype(np.int64)
+
+        elif chunk.dtype.kind == "f":
+            chunk = chunk.astype(np.result_type(chunk, float), copy=False)
+
+        if chunk.dtype.kind in "iu":
+            low, high = int(chunk.min()), int(chunk.max())
+
+            # a dense tally only pays off while it is no larger than the chunk itself
+            if high - low < 2 * len(chunk) + 1024:
+                tally = np.bincount((chunk - low).astype(np.intp, copy=False), minlength=high - low + 1)
+                x = np.flatnonzero(tally)
+
+                return (x + low).astype(chunk.dtype, copy=False), tally[x]
+
+        return np.unique(chunk, return_counts=True)
+
+    def normalize(self):
+        """
+        Rescales the probabilities in place so they sum to 1 (this also picks up any direct edits made to px)
+        """
+        cumulative = self._totals()
+
+        np.cumsum(self.px, out=cumulative)
+        self._normalization_error = 1 - self._total()
+        self.px /= self._total()
+        np.cumsum(self.px, out=cumulative)
+        self._invalidate()
+
+    @property
+    def normalization_error(self) -> float:
+        """
+        The probability which was missing from px (or in excess of 1, if negative) when it was last normalized.
+        For a random variable converted from a distribution, this is the probability of the values left out of it
+        """
+        return self._normalization_error
+
+    def _invalidate(self):
+        # drops anything derived from px, so it is rebuilt on next use
+        self._alias_table = None
+        self._moment_table = None
+        self._tail_table = None
+
+    def lazy(self) -> 'lazy_random_variable.LazyRandomVariable':
+        """
+        :return: this random variable as the leaf of a lazy expression, whose arithmetic is only carried out when needed
+        """
+        import ProbDistro.discrete_distributions.lazy_random_variable as lazy_random_variable
+
+        return lazy_random_variable.LazyRandomVariable.variable(self)
+
+    @staticmethod
+    def _widen(x: np.ndarray) -> np.ndarray:
+        # integer supports are combined in 64 bits, so narrow types (uint8, int16, ...) cannot wrap around
+        return x.astype(np.result_type(x, np.int64), copy=False)
+
+    @staticmethod
+    def _fits_int64(values: typing.Iterable) -> bool:
+        # whether exact integer results (as Python ints) can be held in an int64 array
+        return all(-2 ** 63 <= int(i) < 2 ** 63 for i in values)
 
     def __pow__(self, power, modulo=None) -> 'DiscreteRandomVariable':
-        return DiscreteRandomVariable([x ** power for x in self.x], self.px)
+        x = self._widen(self.x) if power >= 0 else self.x.astype(float)
+
+        if x.dtype.kind == "i" and float(power).is_integer() and len(x):
+            if not self._fits_int64((int(x[0]) ** int(power), int(x[-1]) ** int(power))):
+                x = x.astype(float)
+
+        return DiscreteRandomVariable(x ** power, self.px)
+
+    # the operators below take random variables and real numbers, and return NotImplemented for anything else (such as
+    # a lazy expression), so the other operand's reflected operator is tried instead
+
+    def __mul__(self, other: typing.Union['DiscreteRandomVariable', float]) -> 'DiscreteRandomVariable':
+        if isinstance(other, numbers.Real):
+            other = DiscreteRandomVariable([other], [1.0])
+
+        elif not isinstance(other, DiscreteRandomVariable):
+            return NotImplemented
+
+        return self._merge(other, np.multiply.outer)
+
+    __rmul__ = __mul__
+
+    def __add__(self, other: typing.Union['DiscreteRandomVariable', float]) -> 'DiscreteRandomVariable':
+        if isinstance(other, DiscreteRandomVariable):
+            return self.convolve(other)
+
+        if not isinstance(other, numbers.Real):
+            return NotImplemented
+
+        return DiscreteRandomVariable.from_arrays(self._widen(self.x) + other, self.px.copy())
+
+    __radd__ = __add__
+
+    def __neg__(self) -> 'DiscreteRandomVariable':
+        return DiscreteRandomVariable.from_arrays(-self._widen(self.x)[::-1], self.px[::-1].copy())
+
+    def __sub__(self, other: typing.Union['DiscreteRandomVariable', float]) -> 'DiscreteRandomVariable':
+        if not isinstance(other, (DiscreteRandomVariable, numbers.Real)):
+            return NotImplemented
+
+        return self + (-other)
+
+    def __rsub__(self, other: float) -> 'DiscreteRandomVariable':
+        if not isinstance(other, numbers.Real):
+            return NotImplemented
+
+        return -self + other
+
+    def convolve(self, other: 'DiscreteRandomVariable', tolerance: float = 0) -> 'DiscreteRandomVariable':
+        """
+        The distribution of the sum of this and another independent random variable.
+        When both supports lie on an integer lattice, the probabilities are convolved on that lattice (through an FFT
+        for large supports), and otherwise every pairwise sum is sorted and merged
+
+        :param other: the random variable to add
+        :param tolerance: support points with a probability at or below this are dropped, and the rest renormalized
+        """
+        a = self._integer_support()
+        b = other._integer_support()
+
+        if a is None or b is None:
+            return self._merge(other, np.add.outer, tolerance)
 
-    def __mul__(self, other: 'DiscreteRandomVariable') -> 'DiscreteRandomVariable':
-        result = {}
+        step = math.gcd(self._lattice_step(a), self._lattice_step(b)) or 1
 
-        for x, px in zip(self.x, self.px):
-            for y, py in zip(other.x, other.px):
-                if x * y not in result:
-                    result[x * y] = self.p_and(px, py)
+        # the lattice sizes are checked before anything is allocated, since a few far apart points can span a huge range
+        if (int(a[-1]) - int(a[0])) // step + (int(b[-1]) - int(b[0])) // step + 2 > len(a) * len(b) + 64:
+            # the lattice is mostly gaps, so the dense convolution would be more work than merging
+            return self._merge(other, np.add.outer, tolerance)
 
-                else:
-                    result[x * y] += self.p_and(px, py)
+        dense_a = self._to_lattice(a, self.px, step)
+        dense_b = self._to_lattice(b, other.px, step)
 
-        return DiscreteRandomVariable.from_dict(result)
+        if len(dense_a) * len(dense_b) <= self._direct_convolution_limit:
+            px = np.convolve(dense_a, dense_b)
+            normalize = False
 
+        else:
+            px = self._fft_convolve(dense_a, dense_b)
+            normalize = True
+
+        x = (a[0] + b[0] + step * np.arange(len(px))).astype(
+            np.result_type(self._widen(self.x), self._widen(other.x))
+        )
+
+        return self._truncated(x, px, tolerance, normalize)
+
+    def sum_iid(self, k: int, tolerance: float = 0) -> 'DiscreteRandomVariable':
+        """
+        The distribution of the sum of k independent copies of this random variable, using exponentiation by squaring
+
+        :param k: the number of copies
+        :param tolerance: support points with a probability at or below this are dropped after each convolution
+        """
+        if k < 0:
+            raise ValueError("The number of copies must be non-negative. Got {}.".format(k))
+
+        result = DiscreteRandomVariable.from_arrays(np.zeros(1, dtype=self.x.dtype), np.ones(1))
+        power = self
+
+        while k:
+            if k & 1:
+                result = result.convolve(power, tolerance)
+
+            k >>= 1
+
+            if k:
+                power = power.convolve(power, tolerance)
+
+        return result
+
+    def _integer_support(self) -> typing.Optional[np.ndarray]:
+        if self.x.dtype.kind in "iu":
+            return self.x.astype(np.int64, copy=False)
+
+        if self.x.dtype.kind == "f" and (np.abs(self.x) < 2 ** 53).all() and (np.floor(self.x) == self.x).all():
+            return self.x.astype(np.int64)
+
+        return None
+
+    @staticmethod
+    def _lattice_step(x: np.ndarray) -> int:
+        return int(np.gcd.reduce(np.diff(x))) if len(x) > 1 else 0
+
+    @staticmethod
+    def _to_lattice(x: np.ndarray, px: np.ndarray, step: int) -> np.ndarray:
+        dense = np.zeros((x[-1] - x[0]) // step + 1)
+        dense[(x - x[0]) // step] = px
+
+        return dense
+
+    @staticmethod
+    def _fft_convolve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        size = len(a) + len(b) - 1
+        n = 1 << (size - 1).bit_length()
+
+        px = np.fft.irfft(np.fft.rfft(a, n) * np.fft.rfft(b, n), n)[:size]
+
+        # anything within the FFT's rounding noise of zero is treated as zero
+        px[px <= 4 * np.finfo(float).eps * math.log2(n) * px.max()] = 0
+
+        return px
+
+    def _merge(
+            self, other: 'DiscreteRandomVariable', operator: np.ufunc, tolerance: float = 0
+    ) -> 'DiscreteRandomVariable':
+        # applies operator to every pair of support points, then sorts and sums the probability of equal results
+        a, b = self._widen(self.x), self._widen(other.x)
+
+        if a.dtype.kind == b.dtype.kind == "i":
+            # the extreme results come from the ends of the supports, worked out exactly to see if they fit in 64 bits
+            ends = operator(
+                np.array([int(a[0]), int(a[-1])], dtype=object), np.array([int(b[0]), int(b[-1])], dtype=object)
+            )
+
+            if not self._fits_int64(ends.ravel()):
+                a, b = a.astype(float), b.astype(float)
+
+        x = operator(a, b).ravel()
+        px = np.multiply.outer(self.px, other.px).ravel()
+
+        order = np.argsort(x, kind="stable")
+        x, first = np.unique(x[order], return_index=True)
+
+        return self._truncated(x, np.add.reduceat(px[order], first), tolerance, False)
+
+    @staticmethod
+    def _truncated(x: np.ndarray, px: np.ndarray, tolerance: float, normalize: bool) -> 'DiscreteRandomVariable':
+        keep = px > tolerance
+
+        if not keep.all():
+            x, px = x[keep], px[keep]
+            normalize = normalize or tolerance > 0
+
+        return DiscreteRandomVariable.from_arrays(x, px, normalize=normalize)
+
+    def _index(self, x: float) -> int:
+        # position of x within the sorted support, or -1 if it is not a support point
+        i = int(np.searchsorted(self.x, x))
+
+        if i < len(self.x) and self.x[i] == x:
+            return i
+
+        return -1
+
+    @base_distribution.vectorized
     def pmf(self, x: float) -> float:
-        return self.px[self.x.index(x)]
+        i = self._index(x)
+
+        if i < 0:
+            raise ValueError("{} is not in the support of this random variable".format(x))
+
+        return float(self.px[i])
 
+    def _pmf_array(self, x: np.ndarray) -> np.ndarray:
+        index = np.clip(np.searchsorted(self.x, x), 0, len(self.x) - 1)
+
+        return np.where(self.x[index] == x, self.px[index], 0.0)
+
+    @base_distribution.vectorized
     def cdf(self, x: float) -> float:
-        total = 0
-        for i in range(len(self.x)):
-            if self.x[i] <= x:
-                total += self.px[i]
+        i = int(np.searchsorted(self.x, x, side="right"))
+
+        return float(self._totals()[i - 1]) if i else 0
+
+    def _cdf_array(self, x: np.ndarray) -> np.ndarray:
+        index = np.searchsorted(self.x, x, side="right")
+
+        return np.where(index > 0, self._totals()[np.maximum(index - 1, 0)], 0.0)
+
+    @base_distribution.vectorized
+    def sf(self, x: float) -> float:
+        return float(self._tail()[int(np.searchsorted(self.x, x, side="right"))])
+
+    def _sf_array(self, x: np.ndarray) -> np.ndarray:
+        return self._tail()[np.searchsorted(self.x, x, side="right")]
+
+    def _tail(self) -> np.ndarray:
+        # tail[i] = P(X >= x[i]), followed by a 0, summed from the top down so small upper tails keep their precision
+        # (rather than cancelling out of the total less the running total). Rebuilt if px has since been replaced
+        if self._tail_table is None or self._tail_table[0] is not self.px:
+            tail = np.zeros(len(self.px) + 1)
+            np.cumsum(self.px[::-1], out=tail[-2::-1])
+
+            self._tail_table = (self.px, tail)
 
-        return total
+        return self._tail_table[1]
+
+    def less_than(self, x: float) -> float:
+        if isinstance(x, np.ndarray):
+            return super().less_than(x)
+
+        i = self._index(x)
+
+        if i < 0:
+            raise ValueError("x={} is not supported by this distribution!".format(x))
+
+        return float(self._totals()[i - 1]) if i else 0
 
     def _is_supported(self, x: float) -> bool:
-        return x in self.x
+        return self._index(x) >= 0
+
+    def _is_supported_array(self, x: np.ndarray) -> np.ndarray:
+        index = np.clip(np.searchsorted(self.x, x), 0, len(self.x) - 1)
+
+        return self.x[index] == x
+
+    def _ppf_array(self, q: np.ndarray) -> np.ndarray:
+        return self._quantile_index(q - self._quantile_slack(q))
+
+    def _isf_array(self, q: np.ndarray) -> np.ndarray:
+        # P(X > x[i]) = tail[i + 1] falls as i grows, so the answer follows the points where it is at most q, counted
+        # in the reversed (ascending) tail
+        above = self._tail()[:0:-1]
+        reached = np.searchsorted(above, q + self._quantile_slack(q), side="right")
+
+        return self.x[np.minimum(len(self.x) - reached, len(self.x) - 1)]
+
+    def _quantile_index(self, target: np.ndarray) -> np.ndarray:
+        # the first support point whose running total reaches target
+        return self.x[np.minimum(np.searchsorted(self._totals(), target), len(self.x) - 1)]
+
+    @staticmethod
+    def _support_value(x: float) -> float:
+        return x
+
+    def _check_quantile(self, k: float, q: float, upper_tail: bool) -> float:
+        # the scalar and array functions both come from the running totals, so there is nothing to reconcile
+        return k
+
+    def _sample(self, rng: np.random.Generator, size):
+        # Walker's alias method: pick a column uniformly, then either keep it or take its alias
+        probability, alias = self._alias()
+
+        column = rng.integers(len(self.x), size=size)
+        return self.x[np.where(rng.random(size) < probability[column], column, alias[column])]
+
+    def _alias(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # the alias table is built on first use, and rebuilt if px has since been replaced or renormalized
+        if self._alias_table is None or self._alias_table[0] is not self.px:
+            self._alias_table = (self.px, *self._build_alias(self.px))
+
+        return self._alias_table[1:]
+
+    @staticmethod
+    def _build_alias(px: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # Vose's pairing, swept over running totals rather than stacks: the under-full columns' deficits and the
+        # over-full columns' excesses are laid end to end, each under-full column takes its alias from the over-full
+        # column whose excess its deficit starts in, and each over-full column is topped up by the next one by however
+        # far the last deficit it served ran past its excess
+        n = len(px)
+        scaled = px * (n / px.sum())
+        probability = np.ones(n)
+        alias = np.arange(n)
+
+        small = np.flatnonzero(scaled < 1)
+        large = np.flatnonzero(scaled >= 1)
+
+        if not len(small):
+            return probability, alias
+
+        probability[small] = scaled[small]
+        deficit_end, deficit_error = DiscreteRandomVariable._running_total(1 - probability[small])
+        excess_end, excess_error = DiscreteRandomVariable._running_total(scaled[large] - 1)
+        del scaled
+
+        deficit_start = np.concatenate(([0.0], deficit_end[:-1]))
+        alias[small] = large[np.minimum(np.searchsorted(excess_end, deficit_start, side="right"), len(large) - 1)]
+        del deficit_start
+
+        # the last over-full column has nothing after it, and is only away from 1 through rounding
+        covering = np.minimum(np.searchsorted(deficit_end, excess_end[:-1], side="right"), len(small) - 1)
+        overshoot = (deficit_end[covering] - excess_end[:-1]) + (deficit_error[covering] - excess_error[:-1])
+
+        probability[large[:-1]] = 1 - np.clip(overshoot, 0, 1)
+        alias[large[:-1]] = large[1:]
+
+        return probability, alias
+
+    @staticmethod
+    def _running_total(values: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # the running totals, along with the running total of the rounding error of each addition (found exactly by
+        # TwoSum), so the difference of two nearby totals keeps full precision however far along they are
+        total = np.cumsum(values)
+        previous = np.concatenate(([0.0], total[:-1]))
+        step = total - previous
+
+        error = (previous - (total - step)) + (values - step)
+
+        return total, np.cumsum(error, out=error)
+
+    def _moments(self) -> np.ndarray:
+        # the raw moments E[X^k], followed by the central moments E[(X - mean)^k], for k = 1 to 4. Each power is built
+        # in place in a single reused buffer, and the moments are kept until px is replaced or normalized
+        if self._moment_table is None or self._moment_table[0] is not self.px:
+            x = self.x.astype(float)
+            power = np.empty_like(x)
+            moments = np.empty(8)
+
+            for start in (0, 4):
+                if start:
+                    x -= moments[0]
+
+                np.copyto(power, x)
+
+                for k in range(start, start + 4):
+                    moments[k] = np.dot(power, self.px)
+
+                    if k < start + 3:
+                        power *= x
+
+            self._moment_table = (self.px, moments)
+
+        return self._moment_table[1]
+
+    def moment(self, order: int, central: bool = False) -> float:
+        """
+        :param order: the power the values are raised to
+        :param central: take the moment about the mean, E[(X - mean)^order], rather than E[X^order]
+        """
+        if 1 <= order <= 4:
+            return float(self._moments()[order - 1 + 4 * central])
+
+        x = self.x.astype(float)
+
+        return float(np.dot((x - self.expected_value() if central else x) ** order, self.px))
 
     def expected_value(self) -> float:
-        return sum(a * b for a, b in zip(self.x, self.px))
+        return float(self._moments()[0])
 
     def variance(self) -> float:
-        return (self ** 2).expected_value() - self.expected_value() ** 2
+        return float(self._moments()[5])
+
+    def skewness(self) -> float:
+        moments = self._moments()
+
+        return float(moments[6] / moments[5] ** 1.5)
+
+    def kurtosis(self) -> float:
+        """
+        :return: the excess kurtosis, which is 0 for a normal distribution
+        """
+        moments = self._moments()
+
+        return float(moments[7] / moments[5] ** 2 - 3)
 
     @staticmethod
     def p_and(x: float, other: float):
@@ -105,39 +777,28 @@ class DiscreteRandomVariable(base_discrete_distribution.BaseDiscreteDistribution
         return DiscreteRandomVariable.p_disjoint_or(x, other)
 
     def jointly_distributed_table(self, other: 'DiscreteRandomVariable') -> typing.List[typing.List[float]]:
-        result = []
-
-        for y in other.px:
-            result.append([])
-            for x in self.px:
-                result[-1].append(self.p_and(x, y))
-
-        return result
+        return np.outer(other.px, self.px).tolist()
 
     def _get_defaults(self) -> tuple:
-        return min(self.x), max(self.x), 1
+        return self.x[0].item(), self.x[-1].item(), 1
 
     def to_discrete_random_variable(
-            self, start: float = None, stop: float = None, step: float = None
+            self, start: float = None, stop: float = None, step: float = None, executor: parallel.Executor = None,
+            tail_tolerance: float = None
     ) -> 'DiscreteRandomVariable':
+        # the probabilities are already tabulated, so there is nothing to hand to an executor
 
-        default_start, default_stop, default_step = self._get_defaults()
-
-        start = default_start if start is None else start
-        stop = default_stop if stop is None else stop
-
-        res_x = []
-        res_px = []
+        start, stop = self._truncation_bounds(start, stop, tail_tolerance)
 
-        for x, px in zip(self.x, self.px):
-            if start <= x <= stop:
-                res_x.append(x)
-                res_px.append(px)
+        first = np.searchsorted(self.x, start)
+        last = np.searchsorted(self.x, stop, side="right")
 
-        return DiscreteRandomVariable.correct_probabilities(res_x, res_px)
+        return DiscreteRandomVariable.correct_probabilities(self.x[first:last], self.px[first:last])
 
     def covariance(self, other: 'DiscreteRandomVariable') -> float:
-        return (self * other).expected_value() - (self.expected_value() * other.expected_value())
+        # random variables are combined as independent (as in __mul__), so E[XY] factors into E[X]E[Y] and the
+        # covariance is exactly 0, without building their product. JointDistribution covers dependent variables
+        return 0.0
 
     def correlation(self, other: 'DiscreteRandomVariable') -> float:
         return self.covariance(other) / math.sqrt(self.variance() * other.variance())
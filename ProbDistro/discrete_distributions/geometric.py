@@ -1,7 +1,17 @@
+import math
+
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
+import ProbDistro.base_batch_distribution as base_batch_distribution
 import ProbDistro.base_discrete_distribution as base_discrete_distribution
+import ProbDistro.cache as cache
+import ProbDistro.special as special
 
 
 class Geometric(base_discrete_distribution.BaseDiscreteDistribution):
+    __slots__ = ('p', 'q', 'include_success_trial')
+
     def __init__(self, p: float, include_success_trial: bool = True):
         """
         A discrete random variable which can be used to represent 2 situations.
@@ -19,17 +29,107 @@ class Geometric(base_discrete_distribution.BaseDiscreteDistribution):
         self.q = 1 - p
         self.include_success_trial = include_success_trial
 
+    @base_distribution.vectorized
     def pmf(self, x: float) -> float:
+        if not self._is_supported(x):
+            return 0
+
         if self.include_success_trial:
             return self.p * self.q ** (x - 1)
 
         return self.q ** x * self.p
 
+    def _pmf_array(self, x: np.ndarray) -> np.ndarray:
+        failures = x - 1 if self.include_success_trial else x
+        supported = self._is_supported_array(x)
+
+        return np.where(supported, self.p * np.power(self.q, np.where(supported, failures, 0)), 0.0)
+
+    @base_distribution.vectorized
     def cdf(self, x: float) -> float:
-        if self.include_success_trial:
-            return 1 - (self.q ** x)
+        return -math.expm1(self.logsf(x))
+
+    def _cdf_array(self, x: np.ndarray) -> np.ndarray:
+        return -np.expm1(self._logsf_array(x))
+
+    @base_distribution.vectorized
+    def logpmf(self, x: float) -> float:
+        if not self._is_supported(x):
+            return -math.inf
+
+        failures = x - 1 if self.include_success_trial else x
+        return math.log(self.p) + (failures * math.log1p(-self.p) if failures else 0)
+
+    def _logpmf_array(self, x: np.ndarray) -> np.ndarray:
+        failures = x - 1 if self.include_success_trial else x
+        supported = self._is_supported_array(x)
+
+        with np.errstate(divide="ignore"):
+            log_pmf = np.log(self.p) + special.xlogy(np.where(supported, failures, 0), self.q)
+
+        return np.where(supported, log_pmf, -np.inf)
+
+    @base_distribution.vectorized
+    def sf(self, x: float) -> float:
+        return math.exp(self.logsf(x))
+
+    def _sf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.exp(self._logsf_array(x))
+
+    # log(1 - p) is taken through log1p, since 1 - p rounds to 1 for tiny p, which would leave cdf at 0 (and logcdf at
+    # -inf) however many trials there are
+    @base_distribution.vectorized
+    def logsf(self, x: float) -> float:
+        trials = self._trials(x)
+
+        if not trials:
+            return 0.0
+
+        return trials * math.log1p(-self.p) if self.p < 1 else -math.inf
+
+    def _logsf_array(self, x: np.ndarray) -> np.ndarray:
+        trials = self._trials(x)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(trials == 0, 0.0, trials * np.log1p(-self.p))
 
-        return 1 - (self.q ** (x + 1))
+    def _trials(self, x: float) -> float:
+        # the number of failed trials that P(X > x) requires
+        trials = np.floor(x) if self.include_success_trial else np.floor(x) + 1
+
+        if isinstance(x, np.ndarray):
+            return np.maximum(trials, 0)
+
+        return max(int(trials), 0)
+
+    def _ppf_array(self, q: np.ndarray) -> np.ndarray:
+        # P(X <= x) >= q once the number of trials reaches log(1 - q) / log(1 - p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trials = np.ceil(np.log1p(-q) / np.log1p(-self.p))
+
+        return self._refine_quantile(self._from_trials(trials), q, False)
+
+    def _isf_array(self, q: np.ndarray) -> np.ndarray:
+        # P(X > x) <= q once the number of failed trials reaches log(q) / log(1 - p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trials = np.ceil(np.log(q) / np.log1p(-self.p))
+
+        return self._refine_quantile(self._from_trials(trials), q, True)
+
+    def _from_trials(self, trials: np.ndarray) -> np.ndarray:
+        # the inverse of _trials, clamped to the start of the support
+        lower = self._get_defaults()[0]
+        return lower + np.maximum(trials - 1, 0)
+
+    def _sample(self, rng: np.random.Generator, size):
+        # inverse CDF: the number of failures is floor(log(1 - u) / log(q))
+        with np.errstate(divide="ignore"):
+            failures = np.floor(np.log1p(-rng.random(size)) / np.log1p(-self.p)).astype(np.int64)
+
+        return failures + 1 if self.include_success_trial else failures
+
+    def _pmf_ratio(self, k: np.ndarray) -> tuple:
+        return np.full(k.shape, self.q), np.ones(k.shape)
 
     def _is_supported(self, x: float) -> bool:
         if isinstance(x, float):
@@ -41,12 +141,28 @@ class Geometric(base_discrete_distribution.BaseDiscreteDistribution):
 
         return x >= 0
 
+    def _is_supported_array(self, x: np.ndarray) -> np.ndarray:
+        return self._is_integer_array(x) & (x >= (1 if self.include_success_trial else 0))
+
+    @classmethod
+    def _from_moments(cls, estimator, include_success_trial: bool = True) -> 'Geometric':
+        # the mean number of trials is 1 / p, or (1 - p) / p failures without the success trial
+        trials = estimator.mean if include_success_trial else estimator.mean + 1
+
+        return cls(1 / trials, include_success_trial)
+
+    @classmethod
+    def _check_sample(cls, x: np.ndarray, include_success_trial: bool = True):
+        cls._require(x, cls._is_integer_array(x) & (x >= (1 if include_success_trial else 0)))
+
+    @cache.cached
     def expected_value(self) -> float:
         if self.include_success_trial:
             return 1 / self.p
 
         return self.q / self.p
 
+    @cache.cached
     def variance(self) -> float:
         return (1 - self.p) / (self.p ** 2)
 
@@ -55,3 +171,16 @@ class Geometric(base_discrete_distribution.BaseDiscreteDistribution):
             return 1, None, 1
 
         return 0, None, 1
+
+
+class GeometricBatch(base_batch_distribution.BatchDistribution, Geometric):
+    __slots__ = ()
+
+    def __init__(self, p: np.ndarray, include_success_trial: bool = True):
+        """
+        Many geometric distributions at once, evaluated together. Each distribution takes its probability of success
+        from the matching element of "p", while all of them share the same support (see Geometric)
+
+        :param p: array of the probabilities of success
+        """
+        super().__init__(*self._parameter_arrays(p), include_success_trial)
@@ -1,7 +1,17 @@
+import math
+
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
+import ProbDistro.base_batch_distribution as base_batch_distribution
 import ProbDistro.base_discrete_distribution as base_discrete_distribution
+import ProbDistro.cache as cache
+import ProbDistro.special as special
 
 
 class Hypergeometric(base_discrete_distribution.BaseDiscreteDistribution):
+    __slots__ = ('N', 'K', 'n', '_denominator', '_log_denominator')
+
     def __init__(self, N: int, K: int, n: int):
         """
         A discrete random variable which can be used to represent the probability of receiving "x" successes in
@@ -16,17 +26,150 @@ class Hypergeometric(base_discrete_distribution.BaseDiscreteDistribution):
         self.K = K
         self.n = n
 
+    @base_distribution.vectorized
     def pmf(self, k: int) -> float:
+        if not self._is_supported(k):
+            return 0
+
+        k = int(k)
+
+        if self.N > self._exact_limit:
+            return math.exp(self.logpmf(k))
+
         try:
-            return (self._ncr(self.K, k) * self._ncr(self.N - self.K, self.n - k)) / self._ncr(self.N, self.n)
+            return (self._ncr(self.K, k) * self._ncr(self.N - self.K, self.n - k)) / self._total_combinations()
         except ValueError:
             return 0
 
+    def _total_combinations(self) -> int:
+        # the number of ways to draw the sample, which every pmf evaluation divides by, so it is only computed once
+        try:
+            return self._denominator
+        except AttributeError:
+            self._denominator = self._ncr(self.N, self.n)
+            return self._denominator
+
+    def _log_total(self) -> float:
+        # the log-space counterpart of _total_combinations (over the same binomial weighting as the numerator terms)
+        try:
+            return self._log_denominator
+        except AttributeError:
+            self._log_denominator = special.binomial_logpmf(self.n, self.N, self.n / self.N)
+            return self._log_denominator
+
+    def _pmf_array(self, k: np.ndarray) -> np.ndarray:
+        return np.exp(self._logpmf_array(k))
+
+    @base_distribution.vectorized
+    def logpmf(self, k: int) -> float:
+        if not self._is_supported(k):
+            return -math.inf
+
+        # the ratio of three binomial masses sharing p = n / N, each accurate through Loader's expansion
+        p = self.n / self.N
+
+        return (
+            special.binomial_logpmf(k, self.K, p) + special.binomial_logpmf(self.n - k, self.N - self.K, p) -
+            self._log_total()
+        )
+
+    def _logpmf_array(self, k: np.ndarray) -> np.ndarray:
+        supported = self._is_supported_array(k)
+        k = np.where(supported, k, self._get_defaults()[0])
+        p = self.n / self.N
+
+        log_pmf = (
+            special.binomial_logpmf(k, self.K, p) + special.binomial_logpmf(self.n - k, self.N - self.K, p) -
+            self._log_total()
+        )
+
+        return np.where(supported, log_pmf, -np.inf)
+
+    @base_distribution.vectorized
     def cdf(self, k: int) -> float:
-        if k < 0:
+        lower, upper, _ = self._get_defaults()
+        k = math.floor(k)
+
+        if k < lower:
             return 0
 
-        return sum(self.pmf(i) for i in range(k + 1))
+        if k >= upper:
+            return 1
+
+        if self.N <= self._exact_limit:
+            return sum(self.pmf(i) for i in range(lower, k + 1))
+
+        # sum whichever tail lies on the far side of k from the mode, where the terms shrink monotonically
+        if k < self._mode():
+            return self._tail_sum(k, -1, lower)
+
+        return 1 - self._tail_sum(k + 1, 1, upper)
+
+    def _cdf_array(self, k: np.ndarray) -> np.ndarray:
+        # mass outside of 40 standard deviations of the mode is far below double precision, so skip tabulating it
+        lower, upper = self._tabulated_bounds()
+
+        return self._tabulated_cdf_array(k, lower, upper)
+
+    @base_distribution.vectorized
+    def sf(self, k: int) -> float:
+        lower, upper, _ = self._get_defaults()
+        k = math.floor(k)
+
+        if k < lower:
+            return 1
+
+        if k >= upper:
+            return 0
+
+        if self.N <= self._exact_limit:
+            return sum(self.pmf(i) for i in range(k + 1, upper + 1))
+
+        # at or above the mode, the upper tail is summed directly, where 1 - cdf(k) would cancel
+        if k >= self._mode():
+            return self._tail_sum(k + 1, 1, upper)
+
+        return 1 - self._tail_sum(k, -1, lower)
+
+    def _sf_array(self, k: np.ndarray) -> np.ndarray:
+        lower, upper = self._tabulated_bounds()
+        above = np.floor(k) >= self._mode()
+
+        tail = self._tabulated_sf_array(np.where(above, k, self._mode()), self._mode(), upper)
+
+        return np.where(above, tail, 1 - self._cdf_array(k))
+
+    def _tabulated_bounds(self) -> tuple:
+        # the range holding all but a negligible part of the mass: 40 standard deviations either side of the mode
+        lower, upper, _ = self._get_defaults()
+        spread = 40 * math.ceil(math.sqrt(self.variance())) + 10
+
+        return max(lower, self._mode() - spread), min(upper, self._mode() + spread)
+
+    def _mode(self) -> int:
+        return math.floor((self.n + 1) * (self.K + 1) / (self.N + 2))
+
+    def _pmf_ratio(self, k: np.ndarray) -> tuple:
+        return (self.K - k) * (self.n - k), (k + 1) * (self.N - self.K - self.n + k + 1)
+
+    def _tail_sum(self, start: int, step: int, end: int) -> float:
+        # walks from start towards end using the ratio between consecutive terms, stopping once they are negligible
+        term = math.exp(self.logpmf(start))
+        total = 0
+
+        i = start
+        while True:
+            total += term
+
+            if i == end or term <= total * 1e-17:
+                return total
+
+            if step > 0:
+                term *= (self.K - i) * (self.n - i) / ((i + 1) * (self.N - self.K - self.n + i + 1))
+            else:
+                term *= i * (self.N - self.K - self.n + i) / ((self.K - i + 1) * (self.n - i + 1))
+
+            i += step
 
     def _is_supported(self, x: float) -> bool:
         if isinstance(x, float):
@@ -35,11 +178,84 @@ class Hypergeometric(base_discrete_distribution.BaseDiscreteDistribution):
 
         return max(0, self.n + self.K - self.N) <= x <= min(self.n, self.K)
 
+    def _is_supported_array(self, x: np.ndarray) -> np.ndarray:
+        lower, upper, _ = self._get_defaults()
+        return self._is_integer_array(x) & (x >= lower) & (x <= upper)
+
+    def _sample(self, rng: np.random.Generator, size):
+        return rng.hypergeometric(self.K, self.N - self.K, self.n, size)
+
+    @cache.cached
     def expected_value(self) -> float:
         return self.n * (self.K / self.N)
 
+    @cache.cached
     def variance(self) -> float:
         return self.n * (self.K / self.N) * ((self.N - self.K) / self.N) * ((self.N - self.n) / (self.N - 1))
 
     def _get_defaults(self) -> tuple:
         return max(0, self.n + self.K - self.N), min(self.n, self.K), 1
+
+
+class HypergeometricBatch(base_batch_distribution.BatchDistribution, Hypergeometric):
+    __slots__ = ()
+
+    def __init__(self, N: np.ndarray, K: np.ndarray, n: np.ndarray):
+        """
+        Many hypergeometric distributions at once, evaluated together. Each distribution takes its parameters from
+        the matching elements of "N", "K" and "n" (which are broadcast against each other)
+
+        :param N: array of the population sizes
+        :param K: array of the numbers of success states
+        :param n: array of the draws/sample sizes
+        """
+        super().__init__(*self._parameter_arrays(N, K, n))
+
+    def _cdf_array(self, k: np.ndarray) -> np.ndarray:
+        # the same tail sums as the scalar cdf, with every distribution's tail walked in step
+        lower, upper, _ = self._get_defaults()
+        k = np.floor(k)
+
+        below = k < self._mode()
+        start = np.clip(np.where(below, k, k + 1), lower, upper)
+        end = np.where(below, lower, upper)
+
+        tail = self._tail_sum_array(start, below, end, (k >= lower) & (k < upper))
+
+        return np.where(k < lower, 0.0, np.where(k >= upper, 1.0, np.where(below, tail, 1 - tail)))
+
+    def _sf_array(self, k: np.ndarray) -> np.ndarray:
+        # the complement of _cdf_array, taking the tail on the far side of k from the mode directly
+        lower, upper, _ = self._get_defaults()
+        k = np.floor(k)
+
+        below = k < self._mode()
+        start = np.clip(np.where(below, k, k + 1), lower, upper)
+        end = np.where(below, lower, upper)
+
+        tail = self._tail_sum_array(start, below, end, (k >= lower) & (k < upper))
+
+        return np.where(k < lower, 1.0, np.where(k >= upper, 0.0, np.where(below, 1 - tail, tail)))
+
+    def _tail_sum_array(self, i: np.ndarray, downwards: np.ndarray, end: np.ndarray, active: np.ndarray) -> np.ndarray:
+        term = np.exp(self._logpmf_array(i))
+        total = np.zeros(i.shape)
+
+        while active.any():
+            total = np.where(active, total + term, total)
+            active = active & (i != end) & (term > total * 1e-17)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                up = (self.K - i) * (self.n - i) / ((i + 1) * (self.N - self.K - self.n + i + 1))
+                down = i * (self.N - self.K - self.n + i) / ((self.K - i + 1) * (self.n - i + 1))
+
+            term = term * np.where(downwards, down, up)
+            i = np.where(downwards, i - 1, i + 1)
+
+        return total
+
+    def _mode(self) -> np.ndarray:
+        return np.floor((self.n + 1) * (self.K + 1) / (self.N + 2))
+
+    def _get_defaults(self) -> tuple:
+        return np.maximum(0, self.n + self.K - self.N), np.minimum(self.n, self.K), 1
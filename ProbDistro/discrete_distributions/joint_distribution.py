@@ -0,0 +1,274 @@
+import math
+import typing
+
+import numpy as np
+
+import ProbDistro.discrete_distributions.discrete_random_variable as discrete_random_variable
+
+# tables with more cells than this are stored sparsely by from_pairs, unless most of their cells were observed
+_DENSE_LIMIT = 1 << 16
+
+
+class JointDistribution:
+    """
+    The joint distribution of two discrete random variables X and Y, where p[i, j] = P(X = x[i] and Y = y[j]).
+    The probabilities are held either as a dense 2 dimensional array, or (for large supports where most pairs never
+    occur) as a sparse list of the nonzero cells, in coordinate (COO) form
+    """
+    __slots__ = ('x', 'y', 'names', '_p', '_rows', '_columns', '_values')
+
+    def __init__(
+            self, x: typing.Sequence[float], y: typing.Sequence[float], p: typing.Any,
+            names: typing.Tuple[str, str] = ("X", "Y")
+    ):
+        """
+        :param x: the support of the first variable, along the rows of p
+        :param y: the support of the second variable, along the columns of p
+        :param p: the probability of every pair, as a len(x) by len(y) table
+        :param names: the labels of the two axes, which can be used in place of 0 and 1 to pick an axis
+        """
+        x, y = np.asarray(x), np.asarray(y)
+        p = np.array(p, dtype=float)
+
+        if p.shape != (len(x), len(y)):
+            raise ValueError("The table must have a row per x value and a column per y value. Got {} for {}".format(
+                p.shape, (len(x), len(y))
+            ))
+
+        x, rows = self._sort_axis(x)
+        y, columns = self._sort_axis(y)
+
+        self._set(x, y, names, p[np.ix_(rows, columns)], None)
+
+    @classmethod
+    def from_sparse(
+            cls, x: typing.Sequence[float], y: typing.Sequence[float], rows: typing.Any, columns: typing.Any,
+            values: typing.Any, names: typing.Tuple[str, str] = ("X", "Y")
+    ) -> 'JointDistribution':
+        """
+        Creates a joint distribution from only its nonzero cells
+
+        :param x: the (sorted) support of the first variable
+        :param y: the (sorted) support of the second variable
+        :param rows: the index into x of each cell
+        :param columns: the index into y of each cell
+        :param values: the probability of each cell
+        """
+        joint = cls.__new__(cls)
+        joint._set(
+            np.asarray(x), np.asarray(y), names, None,
+            (np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp), np.asarray(values, dtype=float))
+        )
+
+        return joint
+
+    @classmethod
+    def from_independent(
+            cls, a: 'discrete_random_variable.DiscreteRandomVariable',
+            b: 'discrete_random_variable.DiscreteRandomVariable', names: typing.Tuple[str, str] = ("X", "Y")
+    ) -> 'JointDistribution':
+        """
+        The joint distribution of two independent random variables, which is the outer product of their probabilities
+        """
+        joint = cls.__new__(cls)
+        joint._set(a.x, b.x, names, np.outer(a.px, b.px), None)
+
+        return joint
+
+    @classmethod
+    def from_pairs(
+            cls, x: typing.Any, y: typing.Any, sparse: bool = None, names: typing.Tuple[str, str] = ("X", "Y")
+    ) -> 'JointDistribution':
+        """
+        The empirical joint distribution of a set of observed pairs, with each pair weighted by how often it occurs
+
+        :param x: the observed values of the first variable
+        :param y: the observed values of the second variable, in the same order
+        :param sparse: store only the observed pairs. By default, this is decided by how large and empty the table is
+        """
+        x, y = np.asarray(x).ravel(), np.asarray(y).ravel()
+
+        if len(x) != len(y):
+            raise ValueError("There are {} x values, but {} y values. These counts must match.".format(len(x), len(y)))
+
+        if not len(x):
+            raise ValueError("Cannot create a joint distribution without any observations")
+
+        x_support, rows = np.unique(x, return_inverse=True)
+        y_support, columns = np.unique(y, return_inverse=True)
+
+        # every pair is numbered by its cell in the flattened table, so the pairs are tallied in one pass
+        cells, counts = np.unique(rows.ravel() * len(y_support) + columns.ravel(), return_counts=True)
+        size = len(x_support) * len(y_support)
+
+        if sparse is None:
+            sparse = size > max(4 * len(cells), _DENSE_LIMIT)
+
+        joint = cls.__new__(cls)
+
+        if sparse:
+            rows, columns = np.divmod(cells, len(y_support))
+            joint._set(x_support, y_support, names, None, (rows, columns, counts / len(x)))
+
+        else:
+            p = np.zeros(size)
+            p[cells] = counts / len(x)
+            joint._set(x_support, y_support, names, p.reshape(len(x_support), len(y_support)), None)
+
+        return joint
+
+    @staticmethod
+    def _sort_axis(values: np.ndarray) -> typing.Tuple[np.ndarray, np.ndarray]:
+        # the sorted support of an axis, and the order its rows (or columns) are taken in
+        if values.ndim != 1:
+            raise ValueError("The support must be one dimensional")
+
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+
+        if len(values) > 1 and not (values[1:] > values[:-1]).all():
+            raise ValueError("The support of each variable must not contain repeated values")
+
+        return values, order
+
+    def _set(self, x: np.ndarray, y: np.ndarray, names: tuple, p: typing.Optional[np.ndarray], cells: tuple):
+        self.x = x
+        self.y = y
+        self.names = tuple(names)
+        self._p = p
+        self._rows, self._columns, self._values = cells if cells is not None else (None, None, None)
+
+        total = float(p.sum() if p is not None else self._values.sum())
+
+        if round(total, 10) != 1:
+            raise ValueError(
+                "Sum of all probabilities must equal 1 by law of total probability. Got {}.".format(total)
+            )
+
+    @property
+    def sparse(self) -> bool:
+        return self._p is None
+
+    @property
+    def table(self) -> np.ndarray:
+        """
+        The probability of every pair, as a dense len(x) by len(y) array (built on demand for the sparse layout)
+        """
+        if self._p is not None:
+            return self._p
+
+        p = np.zeros((len(self.x), len(self.y)))
+        np.add.at(p, (self._rows, self._columns), self._values)
+
+        return p
+
+    def to_dense(self) -> 'JointDistribution':
+        return JointDistribution(self.x, self.y, self.table, self.names)
+
+    def to_sparse(self) -> 'JointDistribution':
+        if self.sparse:
+            return self
+
+        rows, columns = np.nonzero(self._p)
+
+        return JointDistribution.from_sparse(self.x, self.y, rows, columns, self._p[rows, columns], self.names)
+
+    def _axis(self, axis: typing.Union[int, str]) -> int:
+        # accepts an axis by its position or its label
+        if axis in (0, 1):
+            return axis
+
+        if axis in self.names:
+            return self.names.index(axis)
+
+        raise ValueError("Unknown axis {}. Expected 0, 1, or one of {}".format(axis, self.names))
+
+    def _support(self, axis: int) -> np.ndarray:
+        return self.x if axis == 0 else self.y
+
+    def _marginal_px(self, axis: int) -> np.ndarray:
+        if self._p is not None:
+            return self._p.sum(axis=1 - axis)
+
+        index = self._rows if axis == 0 else self._columns
+
+        return np.bincount(index, weights=self._values, minlength=len(self._support(axis)))
+
+    def marginal(self, axis: typing.Union[int, str] = 0) -> 'discrete_random_variable.DiscreteRandomVariable':
+        """
+        :param axis: the variable to keep (by position or label), summing the other one out
+        :return: the distribution of that variable on its own
+        """
+        axis = self._axis(axis)
+
+        return discrete_random_variable.DiscreteRandomVariable.from_arrays(
+            self._support(axis), self._marginal_px(axis), normalize=True
+        )
+
+    def conditional(
+            self, axis: typing.Union[int, str], value: float
+    ) -> 'discrete_random_variable.DiscreteRandomVariable':
+        """
+        :param axis: the variable being conditioned on (by position or label)
+        :param value: the value that variable is known to take
+        :return: the distribution of the other variable, given that one equals value
+        """
+        axis = self._axis(axis)
+        support = self._support(axis)
+        index = np.searchsorted(support, value)
+
+        if index == len(support) or support[index] != value:
+            raise ValueError("x={} is not supported by this distribution!".format(value))
+
+        other = self._support(1 - axis)
+
+        if self._p is not None:
+            px = self._p[index] if axis == 0 else self._p[:, index]
+
+        else:
+            selected = (self._rows if axis == 0 else self._columns) == index
+            px = np.zeros(len(other))
+            np.add.at(px, (self._columns if axis == 0 else self._rows)[selected], self._values[selected])
+
+        if not px.sum() > 0:
+            raise ValueError("Cannot condition on {}={}, which has a probability of 0".format(self.names[axis], value))
+
+        return discrete_random_variable.DiscreteRandomVariable.from_arrays(other, px.copy(), normalize=True)
+
+    def expected_value(self, g: typing.Callable[[np.ndarray, np.ndarray], np.ndarray]) -> float:
+        """
+        E[g(X, Y)], the expected value of a function of both variables
+
+        :param g: a vectorized function of the two variables, which is called once on arrays of x and y values
+        (broadcast against each other, for the dense layout)
+        """
+        if self._p is not None:
+            return float(np.sum(self._p * g(self.x[:, None], self.y[None, :])))
+
+        return float(np.dot(self._values, g(self.x[self._rows], self.y[self._columns])))
+
+    def _moments(self) -> typing.Tuple[float, float, float, float]:
+        # the mean and variance of each variable, from their marginals
+        px, py = self._marginal_px(0), self._marginal_px(1)
+        mean_x, mean_y = float(np.dot(self.x, px)), float(np.dot(self.y, py))
+
+        return (
+            mean_x, mean_y, float(np.dot(np.square(self.x - mean_x), px)), float(np.dot(np.square(self.y - mean_y), py))
+        )
+
+    def covariance(self) -> float:
+        # the deviations are taken from the means first, which avoids the cancellation of E[XY] - E[X]E[Y]
+        mean_x, mean_y, _, _ = self._moments()
+
+        return self.expected_value(lambda x, y: (x - mean_x) * (y - mean_y))
+
+    def correlation(self) -> float:
+        mean_x, mean_y, variance_x, variance_y = self._moments()
+
+        return self.expected_value(lambda x, y: (x - mean_x) * (y - mean_y)) / math.sqrt(variance_x * variance_y)
+
+    def __repr__(self):
+        return "<JointDistribution {}={} {}={} {}>".format(
+            self.names[0], self.x, self.names[1], self.y,
+            "cells={}".format(len(self._values)) if self.sparse else "p={}".format(self._p.tolist())
+        )
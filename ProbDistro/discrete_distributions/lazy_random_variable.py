@@ -0,0 +1,196 @@
+import math
+import numbers
+import typing
+
+import numpy as np
+
+import ProbDistro.discrete_distributions.discrete_random_variable as discrete_random_variable
+
+Operand = typing.Union['LazyRandomVariable', 'discrete_random_variable.DiscreteRandomVariable', float]
+
+
+class LazyRandomVariable:
+    """
+    A node in an expression built from random variables, which records the arithmetic done on it rather than carrying
+    it out. Moments (and so expected values and variances) are worked out from the moments of the leaves, through
+    linearity and independence, without computing any distribution. The full distribution of a node is only computed
+    when something else is asked of it, and is then kept, so nodes shared between expressions are computed once.
+    As with the arithmetic on DiscreteRandomVariable itself, every operand is treated as an independent variable
+    """
+    __slots__ = ('operation', 'operands', '_distribution', '_moments')
+
+    def __init__(self, operation: str, operands: tuple, distribution=None):
+        """
+        :param operation: one of "variable", "constant", "add", "multiply", "negate" or "power"
+        :param operands: the nodes the operation is applied to (the value itself, for a constant, and the node and the
+        exponent, for a power)
+        :param distribution: the distribution of a variable
+        """
+        self.operation = operation
+        self.operands = operands
+        self._distribution = distribution
+
+        # raw moments E[X^k] worked out so far, by k
+        self._moments = {}
+
+    @classmethod
+    def variable(cls, distribution: 'discrete_random_variable.DiscreteRandomVariable') -> 'LazyRandomVariable':
+        return cls("variable", (), distribution)
+
+    @classmethod
+    def _wrap(cls, value: Operand) -> 'LazyRandomVariable':
+        # turns the other side of an operator into a node
+        if isinstance(value, LazyRandomVariable):
+            return value
+
+        if isinstance(value, discrete_random_variable.DiscreteRandomVariable):
+            return cls.variable(value)
+
+        if isinstance(value, numbers.Real):
+            return cls("constant", (value,))
+
+        raise TypeError("Cannot combine a random variable with {}".format(type(value).__name__))
+
+    def __add__(self, other: Operand) -> 'LazyRandomVariable':
+        return LazyRandomVariable("add", (self, self._wrap(other)))
+
+    __radd__ = __add__
+
+    def __mul__(self, other: Operand) -> 'LazyRandomVariable':
+        return LazyRandomVariable("multiply", (self, self._wrap(other)))
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> 'LazyRandomVariable':
+        return LazyRandomVariable("negate", (self,))
+
+    def __sub__(self, other: Operand) -> 'LazyRandomVariable':
+        return self + (-self._wrap(other))
+
+    def __rsub__(self, other: Operand) -> 'LazyRandomVariable':
+        return -self + other
+
+    def __pow__(self, power: float, modulo=None) -> 'LazyRandomVariable':
+        return LazyRandomVariable("power", (self, power))
+
+    def moment(self, order: int) -> float:
+        """
+        E[X^order], from the moments of the operands where possible, and otherwise from this node's distribution
+        """
+        if order not in self._moments:
+            self._moments[order] = self._moment(order)
+
+        return self._moments[order]
+
+    def _moment(self, order: int) -> float:
+        if self._distribution is not None:
+            return self._distribution.moment(order)
+
+        operands = self.operands
+
+        if self.operation == "constant":
+            return float(operands[0] ** order)
+
+        if self.operation == "negate":
+            return (-1) ** order * operands[0].moment(order)
+
+        if self.operation == "multiply":
+            # E[(XY)^k] = E[X^k] E[Y^k] for independent X and Y
+            return operands[0].moment(order) * operands[1].moment(order)
+
+        if self.operation == "add":
+            # the binomial expansion of (X + Y)^k, where the expectation of every term factors by independence
+            return sum(
+                math.comb(order, i) * operands[0].moment(i) * operands[1].moment(order - i) for i in range(order + 1)
+            )
+
+        power = operands[1]
+
+        if float(power).is_integer() and power >= 0:
+            return operands[0].moment(order * int(power))
+
+        return self.distribution().moment(order)
+
+    def expected_value(self) -> float:
+        return self.moment(1)
+
+    mean = expected_value
+
+    def variance(self) -> float:
+        # variances of independent sums add up, which avoids the cancellation in E[X^2] - E[X]^2 wherever possible
+        if self._distribution is not None:
+            return self._distribution.variance()
+
+        if self.operation == "constant":
+            return 0.0
+
+        if self.operation == "negate":
+            return self.operands[0].variance()
+
+        if self.operation == "add":
+            return self.operands[0].variance() + self.operands[1].variance()
+
+        if self.operation == "multiply" and "constant" in (self.operands[0].operation, self.operands[1].operation):
+            variable, constant = sorted(self.operands, key=lambda i: i.operation == "constant")
+
+            return constant.operands[0] ** 2 * variable.variance()
+
+        return self.moment(2) - self.moment(1) ** 2
+
+    def standard_deviation(self) -> float:
+        return math.sqrt(self.variance())
+
+    def distribution(self) -> 'discrete_random_variable.DiscreteRandomVariable':
+        """
+        The full distribution of this node, computed (along with those of any operands not computed yet) on first use
+        """
+        if self._distribution is None:
+            self._distribution = self._evaluate()
+
+        return self._distribution
+
+    def _evaluate(self) -> 'discrete_random_variable.DiscreteRandomVariable':
+        operands = self.operands
+
+        if self.operation == "constant":
+            return discrete_random_variable.DiscreteRandomVariable.from_arrays(np.array(operands[:1]), np.ones(1))
+
+        if self.operation == "negate":
+            return -operands[0].distribution()
+
+        if self.operation == "power":
+            return operands[0].distribution() ** operands[1]
+
+        left, right = operands
+
+        # a constant operand shifts or scales the other one, rather than being combined with it point by point
+        if left.operation == "constant" or right.operation == "constant":
+            variable, constant = (left, right) if right.operation == "constant" else (right, left)
+            distribution = variable.distribution()
+
+            if self.operation == "add":
+                return distribution + constant.operands[0]
+
+            return discrete_random_variable.DiscreteRandomVariable.from_arrays(
+                distribution.x * constant.operands[0], distribution.px.copy()
+            )
+
+        if self.operation == "add":
+            return left.distribution() + right.distribution()
+
+        return left.distribution() * right.distribution()
+
+    def __getattr__(self, name: str):
+        # anything which cannot be answered from the moments (cdf, pmf, ppf, sample, ...) comes from the distribution
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self.distribution(), name)
+
+    def __repr__(self):
+        if self.operation == "variable":
+            return "<LazyRandomVariable {}>".format(self._distribution)
+
+        return "<LazyRandomVariable {}{}>".format(
+            self.operation, "" if self._distribution is None else " {}".format(self._distribution)
+        )
@@ -1,9 +1,17 @@
 import math
 
+import numpy as np
+
+import ProbDistro.base_distribution as base_distribution
+import ProbDistro.base_batch_distribution as base_batch_distribution
 import ProbDistro.base_discrete_distribution as base_discrete_distribution
+import ProbDistro.cache as cache
+import ProbDistro.special as special
 
 
 class Poisson(base_discrete_distribution.BaseDiscreteDistribution):
+    __slots__ = ('rate',)
+
     def __init__(self, rate: float):
         """
         A discrete random variable which can be used to represent the probability of "x" events occurring in
@@ -13,14 +21,68 @@ class Poisson(base_discrete_distribution.BaseDiscreteDistribution):
         """
         self.rate = rate
 
+    @base_distribution.vectorized
     def pmf(self, x: int) -> float:
-        return (self.rate ** x * math.e ** -self.rate) / math.factorial(x)
+        if not self._is_supported(x):
+            return 0
+
+        x = int(x)
+
+        if x <= self._exact_limit and self.rate <= self._exact_limit:
+            return (self.rate ** x * math.e ** -self.rate) / math.factorial(x)
+
+        return math.exp(self.logpmf(x))
+
+    def _pmf_array(self, x: np.ndarray) -> np.ndarray:
+        return np.exp(self._logpmf_array(x))
+
+    @base_distribution.vectorized
+    def logpmf(self, x: int) -> float:
+        if not self._is_supported(x):
+            return -math.inf
 
+        return special.poisson_logpmf(x, self.rate)
+
+    def _logpmf_array(self, x: np.ndarray) -> np.ndarray:
+        supported = self._is_supported_array(x)
+
+        return np.where(supported, special.poisson_logpmf(np.where(supported, x, 0), self.rate), -np.inf)
+
+    @base_distribution.vectorized
     def cdf(self, x: int) -> float:
         if x < 0:
             return 0
 
-        return sum(self.pmf(i) for i in range(x + 1))
+        k = math.floor(x)
+
+        if k <= self._exact_limit and self.rate <= self._exact_limit:
+            return sum(self.pmf(i) for i in range(k + 1))
+
+        return special.gammaincc(k + 1, self.rate)
+
+    def _cdf_array(self, x: np.ndarray) -> np.ndarray:
+        k = np.maximum(np.floor(x), 0)
+
+        return np.where(x < 0, 0.0, special.gammaincc(k + 1, self.rate))
+
+    @base_distribution.vectorized
+    def sf(self, x: int) -> float:
+        if x < 0:
+            return 1
+
+        # the incomplete gamma function gives the upper tail directly at every size, where 1 - cdf(x) would cancel
+        return max(special.gammainc(math.floor(x) + 1, self.rate), 0.0)
+
+    def _sf_array(self, x: np.ndarray) -> np.ndarray:
+        k = np.maximum(np.floor(x), 0)
+
+        return np.where(x < 0, 1.0, np.maximum(special.gammainc(k + 1, self.rate), 0.0))
+
+    def _pmf_ratio(self, k: np.ndarray) -> tuple:
+        return np.full(k.shape, self.rate), k + 1
+
+    def _mode(self) -> int:
+        return math.floor(self.rate)
 
     def _is_supported(self, x: float) -> bool:
         if isinstance(x, float):
@@ -29,11 +91,41 @@ class Poisson(base_discrete_distribution.BaseDiscreteDistribution):
 
         return x >= 0
 
+    def _is_supported_array(self, x: np.ndarray) -> np.ndarray:
+        return self._is_integer_array(x) & (x >= 0)
+
+    def _sample(self, rng: np.random.Generator, size):
+        # NumPy switches to the PTRS transformed rejection algorithm for rates of 10 and above
+        return rng.poisson(self.rate, size)
+
+    @classmethod
+    def _from_moments(cls, estimator, **options) -> 'Poisson':
+        return cls(estimator.mean)
+
+    @classmethod
+    def _check_sample(cls, x: np.ndarray, **options):
+        cls._require(x, cls._is_integer_array(x) & (x >= 0))
+
+    @cache.cached
     def expected_value(self) -> float:
         return self.rate
 
+    @cache.cached
     def variance(self) -> float:
         return self.rate
 
     def _get_defaults(self) -> tuple:
         return 0, None, 1
+
+
+class PoissonBatch(base_batch_distribution.BatchDistribution, Poisson):
+    __slots__ = ()
+
+    def __init__(self, rate: np.ndarray):
+        """
+        Many Poisson distributions at once, evaluated together. Each distribution takes its rate from the matching
+        element of "rate"
+
+        :param rate: array of the average rates of success
+        """
+        super().__init__(*self._parameter_arrays(rate))
@@ -0,0 +1,125 @@
+import collections.abc
+import typing
+
+import numpy as np
+
+# scalars arriving one at a time from an iterator are gathered into blocks of this size, so they are still folded in
+# with whole-array operations while holding only a bounded amount of the stream at once
+_BLOCK_SIZE = 1 << 16
+
+
+def _chunks(data: typing.Any, dtype: typing.Optional[type] = float) -> typing.Iterator[np.ndarray]:
+    # splits the data into 1 dimensional arrays (of the given dtype, or whatever NumPy infers for None): arrays and
+    # sequences of numbers are a single chunk, while iterators may yield arrays (or sequences) and single values in
+    # any mix
+    if isinstance(data, np.ndarray) or (isinstance(data, collections.abc.Sequence) and not isinstance(data, str)):
+        yield np.asarray(data, dtype=dtype).ravel()
+        return
+
+    block = []
+
+    for item in data:
+        if np.ndim(item) == 0:
+            block.append(item)
+
+            if len(block) == _BLOCK_SIZE:
+                yield np.asarray(block, dtype=dtype)
+                block = []
+
+            continue
+
+        if block:
+            yield np.asarray(block, dtype=dtype)
+            block = []
+
+        yield np.asarray(item, dtype=dtype).ravel()
+
+    if block:
+        yield np.asarray(block, dtype=dtype)
+
+
+class Estimator:
+    """
+    Accumulates the running count, mean and sum of squared deviations of a stream of observations, from which a
+    distribution's parameters are estimated. Each chunk is reduced on its own, and folded into the running totals with
+    the pairwise update of Chan et al. (Welford's update generalized to whole chunks), which stays accurate however
+    long the stream runs. Estimators over different shards of the data can be merged into one, in any order
+    """
+
+    def __init__(self, distribution: type, **options):
+        """
+        :param distribution: the distribution class being fitted
+        :param options: fixed (not estimated) arguments of the distribution, such as include_success_trial
+        """
+        self.distribution = distribution
+        self.options = options
+
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, count: int, mean: float, m2: float):
+        total = self.count + count
+        delta = mean - self.mean
+
+        self.mean += delta * (count / total)
+        self.m2 += m2 + delta * delta * (self.count * count / total)
+        self.count = total
+
+    def partial_fit(self, data: typing.Any) -> 'Estimator':
+        """
+        Folds more observations into the estimate
+
+        :param data: an array or sequence of observations, or an iterator (such as a generator) of observations
+        and/or chunks of observations, which is consumed one chunk at a time
+        :return: this estimator, so calls can be chained
+        """
+        for chunk in _chunks(data):
+            if not len(chunk):
+                continue
+
+            self.distribution._check_sample(chunk, **self.options)
+
+            mean = float(np.mean(chunk))
+            self._combine(len(chunk), mean, float(np.sum(np.square(chunk - mean))))
+
+        return self
+
+    def merge(self, other: 'Estimator') -> 'Estimator':
+        """
+        Combines the observations of two estimators (such as the results of workers fitting separate shards)
+
+        :return: a new estimator, leaving both of the originals as they are
+        """
+        if other.distribution is not self.distribution or other.options != self.options:
+            raise ValueError("Cannot merge an estimator of {} {} with one of {} {}".format(
+                self.distribution.__name__, self.options, other.distribution.__name__, other.options
+            ))
+
+        merged = Estimator(self.distribution, **self.options)
+
+        for estimator in (self, other):
+            if estimator.count:
+                merged._combine(estimator.count, estimator.mean, estimator.m2)
+
+        return merged
+
+    __add__ = merge
+
+    def variance(self) -> float:
+        # the maximum likelihood (biased) variance of the observations
+        return self.m2 / self.count
+
+    def result(self):
+        """
+        :return: the distribution with the maximum likelihood parameters for the observations seen so far
+        """
+        if not self.count:
+            raise ValueError("Cannot fit {} without any observations".format(self.distribution.__name__))
+
+        return self.distribution._from_moments(self, **self.options)
+
+    def __repr__(self):
+        return "<Estimator of {} count={} mean={} m2={}>".format(
+            self.distribution.__name__, self.count, self.mean, self.m2
+        )
@@ -0,0 +1,245 @@
+import contextlib
+import functools
+import threading
+import time
+import types
+import typing
+
+
+def _points(x: typing.Any) -> int:
+    # the number of values passed to a pmf method: the size of an array, or 1 for a scalar
+    return getattr(x, "size", 1)
+
+
+# the methods counted as pmf evaluations, and the number of points each call evaluates. The points are added to the
+# pmf count of the call itself and every call it is nested in (a logpmf computed inside of pmf, or a pmf table built
+# from pmf values, is only counted once)
+_PMF_METHODS = {
+    "pmf": _points,
+    "logpmf": _points,
+    "_pmf_array": _points,
+    "_logpmf_array": _points,
+    "_pmf_table": lambda start, stop: max(stop - start + 1, 0),
+}
+
+# the operators which are recorded, alongside every regular (non-dunder) method
+_OPERATORS = frozenset(("__pow__", "__mul__", "__add__", "__radd__", "__sub__", "__rsub__", "__neg__", "__call__"))
+
+# plumbing used to hash and print distributions, which would otherwise show up under every cached evaluation
+_SKIPPED = frozenset(("_parameters", "_parameter_getter", "_dynamic_parameters", "_format_variables"))
+
+
+class Instrumentation:
+    """
+    Records how often each distribution method is called (per concrete class), the cumulative time spent in it
+    (including any calls it makes) and the number of pmf evaluations it triggered
+    """
+
+    def __init__(self):
+        self._records = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _state(self) -> threading.local:
+        # every thread keeps its own stack of the calls in progress, and its own running pmf count
+        state = self._local
+
+        if not hasattr(state, "stack"):
+            state.stack = []
+            state.evaluations = 0
+
+        return state
+
+    def record(self, owner: str, method: str, seconds: float, evaluations: int):
+        with self._lock:
+            record = self._records.get((owner, method))
+
+            if record is None:
+                record = self._records[(owner, method)] = [0, 0.0, 0]
+
+            record[0] += 1
+            record[1] += seconds
+            record[2] += evaluations
+
+    def report(self) -> dict:
+        """
+        :return: {class name: {method name: {"calls": int, "seconds": float, "pmf_evaluations": int}}}
+        """
+        report = {}
+
+        with self._lock:
+            for (owner, method), (calls, seconds, evaluations) in sorted(self._records.items()):
+                report.setdefault(owner, {})[method] = {
+                    "calls": calls, "seconds": seconds, "pmf_evaluations": evaluations
+                }
+
+        return report
+
+    def calls(self, owner: str, method: str) -> int:
+        with self._lock:
+            return self._records.get((owner, method), (0,))[0]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def __len__(self):
+        return len(self._records)
+
+
+# the instrumentation currently recording, or None while disabled (the default)
+_active: typing.Optional[Instrumentation] = None
+
+# the original class attributes replaced by the recording wrappers, so they can be put back exactly
+_originals: typing.Dict[typing.Tuple[type, str], typing.Any] = {}
+
+
+def _wrap(function: callable, name: str, owner: typing.Optional[str]) -> callable:
+    # the owner is only given for static methods, which are recorded under the class defining them; everything else
+    # is recorded under the class of the instance (or class) it was called on
+    points = _PMF_METHODS.get(name)
+    counts_pmf = points is not None
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        instrumentation = _active
+
+        if instrumentation is None:
+            return function(*args, **kwargs)
+
+        if owner is None:
+            target = args[0]
+            key = (id(target), name)
+            target = target if isinstance(target, type) else type(target)
+            target = target.__name__
+
+        else:
+            target = owner
+            key = (owner, name)
+
+        state = instrumentation._state()
+
+        # an override calling up to the method it overrides (through super) is recorded as a single call
+        if state.stack and state.stack[-1][0] == key:
+            return function(*args, **kwargs)
+
+        evaluations = state.evaluations
+
+        if counts_pmf and not any(frame[1] for frame in state.stack):
+            state.evaluations += points(*args[1:], **kwargs)
+
+        state.stack.append((key, counts_pmf))
+        start = time.perf_counter()
+
+        try:
+            return function(*args, **kwargs)
+
+        finally:
+            elapsed = time.perf_counter() - start
+            state.stack.pop()
+
+            instrumentation.record(target, name, elapsed, state.evaluations - evaluations)
+
+    return wrapper
+
+
+def _attach(cls: type):
+    """
+    Replaces the methods defined by a distribution class with recording wrappers
+    """
+    for name, value in list(vars(cls).items()):
+        if name in _SKIPPED or (name.startswith("__") and name not in _OPERATORS):
+            continue
+
+        if isinstance(value, staticmethod) and isinstance(value.__func__, types.FunctionType):
+            wrapped = staticmethod(_wrap(value.__func__, name, cls.__name__))
+
+        elif isinstance(value, classmethod):
+            wrapped = classmethod(_wrap(value.__func__, name, None))
+
+        elif isinstance(value, types.FunctionType):
+            wrapped = _wrap(value, name, None)
+
+        else:
+            continue
+
+        _originals[(cls, name)] = value
+        setattr(cls, name, wrapped)
+
+
+def _detach():
+    for (cls, name), value in _originals.items():
+        setattr(cls, name, value)
+
+    _originals.clear()
+
+
+def _distribution_classes() -> typing.List[type]:
+    import ProbDistro
+    import ProbDistro.base_distribution as base_distribution
+
+    # the distributions are imported lazily, so load every one of them before looking for subclasses
+    for name in ProbDistro._LAZY_ATTRIBUTES:
+        getattr(ProbDistro, name)
+
+    classes = []
+    pending = [base_distribution.BaseDistribution]
+
+    while pending:
+        cls = pending.pop()
+
+        if cls not in classes:
+            classes.append(cls)
+            pending.extend(cls.__subclasses__())
+
+    return classes
+
+
+def enable() -> Instrumentation:
+    """
+    Starts recording calls to distribution methods in a new, empty Instrumentation, replacing any already in use.
+    Methods are only wrapped while instrumentation is enabled, so it costs nothing once disabled
+    """
+    global _active
+
+    if _active is None:
+        for cls in _distribution_classes():
+            _attach(cls)
+
+    _active = Instrumentation()
+
+    return _active
+
+
+def disable():
+    global _active
+    _active = None
+
+    _detach()
+
+
+def active() -> typing.Optional[Instrumentation]:
+    return _active
+
+
+def report() -> typing.Optional[dict]:
+    return None if _active is None else _active.report()
+
+
+@contextlib.contextmanager
+def instrumenting() -> typing.Iterator[Instrumentation]:
+    """
+    Records calls for the duration of a with block, restoring whatever instrumentation was in use beforehand
+    """
+    global _active
+    previous = _active
+
+    try:
+        yield enable()
+
+    finally:
+        if previous is None:
+            disable()
+
+        else:
+            _active = previous
@@ -0,0 +1,143 @@
+import concurrent.futures
+import contextlib
+import math
+import os
+import typing
+
+import numpy as np
+
+# below this many points per chunk, shipping the work to another process costs more than evaluating it in place
+_MIN_CHUNK = 1 << 14
+
+# every worker is handed a few chunks, so a slow chunk does not leave the other workers idle at the end
+_CHUNKS_PER_WORKER = 4
+
+# an executor to run the chunks on, or the number of worker processes to start a pool with for a single call
+Executor = typing.Union[concurrent.futures.Executor, int]
+
+
+@contextlib.contextmanager
+def _pool(executor: Executor) -> typing.Iterator[concurrent.futures.Executor]:
+    if isinstance(executor, concurrent.futures.Executor):
+        yield executor
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(executor) as pool:
+        yield pool
+
+
+def _workers(executor: Executor) -> int:
+    if isinstance(executor, int):
+        return executor
+
+    # neither executor exposes its size publicly, so fall back on the same default they use themselves
+    return getattr(executor, "_max_workers", None) or os.cpu_count() or 1
+
+
+def chunk_bounds(total: int, workers: int, align: int = 1) -> typing.List[typing.Tuple[int, int]]:
+    """
+    Splits the indices [0, total) into contiguous chunks, sized so every worker gets a few of them, but none are too
+    small to be worth sending to another process
+
+    :param total: the number of points to split up
+    :param workers: the number of workers the chunks will be shared between
+    :param align: every chunk but the last starts and ends on a multiple of this
+    :return: the (start, stop) index pairs of each chunk, in order
+    """
+    size = max(math.ceil(total / (workers * _CHUNKS_PER_WORKER)), _MIN_CHUNK)
+    size = math.ceil(size / align) * align
+
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def _submit_all(executor: Executor, function: callable, arguments: typing.List[tuple]) -> list:
+    # runs function over every set of arguments on the executor, returning the results in the same order
+    with _pool(executor) as pool:
+        futures = [pool.submit(function, *i) for i in arguments]
+
+        return [future.result() for future in futures]
+
+
+def _evaluate(distribution, method: str, x: np.ndarray) -> np.ndarray:
+    return getattr(distribution, method)(x)
+
+
+def _table(distribution, start: int, stop: int) -> np.ndarray:
+    return distribution._pmf_table(start, stop)
+
+
+def evaluate(distribution, method: str, x: np.ndarray, executor: Executor) -> np.ndarray:
+    """
+    Evaluates an array method of a distribution (such as cdf or pmf) over the chunks of x in parallel.
+    The array kernels work point by point, so the result is identical to a single serial call
+
+    :param distribution: the distribution to evaluate (sent to every worker)
+    :param method: the name of the method to call
+    :param x: the array of points to evaluate at
+    :param executor: the executor to run the chunks on, or a number of worker processes to start a pool with
+    """
+    flat = x.ravel()
+    bounds = chunk_bounds(len(flat), _workers(executor))
+
+    if len(bounds) < 2:
+        return getattr(distribution, method)(x)
+
+    results = _submit_all(executor, _evaluate, [(distribution, method, flat[start:stop]) for start, stop in bounds])
+
+    return np.concatenate(results).reshape(x.shape)
+
+
+def pmf_table(distribution, start: int, stop: int, executor: Executor) -> np.ndarray:
+    """
+    Tabulates the pmf of a discrete distribution over [start, stop] in parallel. The chunks line up with the blocks the
+    serial recurrence is anchored on, so every value is computed exactly as it would be in a single serial table
+    """
+    table = np.zeros(stop - start + 1)
+
+    lower, upper, _ = distribution._get_defaults()
+    lower = start if lower is None else max(start, lower)
+    upper = stop if upper is None else min(stop, upper)
+
+    bounds = chunk_bounds(max(upper - lower + 1, 0), _workers(executor), distribution._recurrence_block)
+
+    # a short final chunk would be evaluated directly rather than by the recurrence, so it joins the chunk before it
+    if len(bounds) > 1 and bounds[-1][1] - bounds[-1][0] < distribution._exact_limit:
+        bounds[-2:] = [(bounds[-2][0], bounds[-1][1])]
+
+    if len(bounds) < 2:
+        return distribution._pmf_table(start, stop)
+
+    results = _submit_all(
+        executor, _table, [(distribution, lower + first, lower + last - 1) for first, last in bounds]
+    )
+
+    table[lower - start:upper - start + 1] = np.concatenate(results)
+
+    return table
+
+
+def evaluate_batch(batch, method: str, x: np.ndarray, executor: Executor) -> np.ndarray:
+    """
+    Evaluates a method of a batch of distributions in parallel, handing each worker the distributions in a slice of
+    the batch's first axis, along with the matching slice of x (already broadcast against the batch)
+    """
+    if not batch.shape:
+        return getattr(batch, method)(x)
+
+    axis = x.ndim - len(batch.shape)
+    bounds = chunk_bounds(x.size, _workers(executor))
+
+    # the chunks are counted in points, so convert them into rows of the batch's first axis
+    row_size = x.size // batch.shape[0] if batch.shape[0] else 1
+    rows = sorted({min(math.ceil(start / row_size), batch.shape[0]) for start, _ in bounds} | {batch.shape[0]})
+
+    if len(rows) < 3:
+        return getattr(batch, method)(x)
+
+    arguments = []
+
+    for first, last in zip(rows, rows[1:]):
+        index = (slice(None),) * axis + (slice(first, last),)
+        arguments.append((batch._take(slice(first, last)), method, x[index]))
+
+    return np.concatenate(_submit_all(executor, _evaluate, arguments), axis=axis)
@@ -0,0 +1,201 @@
+import collections
+import ctypes
+import os
+import sys
+import threading
+import typing
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    import ProbDistro.discrete_distributions.discrete_random_variable as discrete_random_variable
+
+# every array in a segment starts on a multiple of this many bytes
+_ALIGNMENT = 64
+
+# the random variables already attached in this process, by segment name, so a worker handed the same handle by many
+# tasks maps the segment once. Only the most recently used are kept, and an owner drops its own entry when it is closed
+_ATTACHED_LIMIT = 64
+_attached = collections.OrderedDict()
+_lock = threading.RLock()
+
+
+def _layout(dtypes: typing.List[np.dtype], count: int) -> typing.Tuple[typing.List[int], int]:
+    # the offset of each array in the segment, and the size of the whole segment
+    offsets = []
+    size = 0
+
+    for dtype in dtypes:
+        size += -size % _ALIGNMENT
+        offsets.append(size)
+        size += count * dtype.itemsize
+
+    return offsets, max(size, 1)
+
+
+def _open(name: str) -> shared_memory.SharedMemory:
+    # attaches to an existing segment without leaving it registered with this process's resource tracker, which would
+    # otherwise unlink it (out from under the owner and every other worker) when this process exits
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+
+    segment = shared_memory.SharedMemory(name)
+
+    # before Python 3.13 attaching always registers the segment, so that one registration is withdrawn again
+    if os.name == "posix":
+        resource_tracker.unregister(segment._name, "shared_memory")
+
+    return segment
+
+
+class _Mapping:
+    # the base of every array viewing an attached segment, which keeps the segment open for as long as any of them is
+    # alive, and closes it after the last one is gone (however long after its cache entry was dropped that is)
+    def __init__(self, segment: shared_memory.SharedMemory):
+        self.segment = segment
+
+        self.__array_interface__ = {
+            "version": 3,
+            "shape": (segment.size,),
+            "typestr": "|u1",
+            "data": (ctypes.addressof(ctypes.c_char.from_buffer(segment.buf)), True),
+        }
+
+    def __del__(self):
+        self.segment.close()
+
+
+class SharedHandle:
+    """
+    A small, picklable reference to a random variable published into shared memory. Sending it to a worker costs a
+    few bytes whatever the size of the random variable, and the worker views the shared arrays without copying them.
+    Besides attach, any attribute of the random variable (cdf, pmf, ppf, ...) can be used on the handle directly
+    """
+    __slots__ = ('name', 'dtype', 'count')
+
+    def __init__(self, name: str, dtype: str, count: int):
+        """
+        :param name: the name of the shared memory segment
+        :param dtype: the dtype of the support
+        :param count: the size of the support
+        """
+        self.name = name
+        self.dtype = dtype
+        self.count = count
+
+    def __reduce__(self):
+        return SharedHandle, (self.name, self.dtype, self.count)
+
+    def attach(self) -> 'discrete_random_variable.DiscreteRandomVariable':
+        """
+        :return: the random variable, viewing the shared arrays (read only, since every process sees them). Attaching
+        again in the same process returns the same random variable
+        """
+        import ProbDistro.discrete_distributions.discrete_random_variable as discrete_random_variable
+
+        with _lock:
+            if self.name in _attached:
+                _attached.move_to_end(self.name)
+                return _attached[self.name]
+
+            # the arrays are read only views of the mapping, since every process sees them
+            mapping = np.asarray(_Mapping(_open(self.name)))
+            dtypes = [np.dtype(self.dtype), np.dtype(float), np.dtype(float)]
+            offsets, _ = _layout(dtypes, self.count)
+
+            arrays = [
+                mapping[offset:offset + self.count * dtype.itemsize].view(dtype)
+                for dtype, offset in zip(dtypes, offsets)
+            ]
+
+            _attached[self.name] = discrete_random_variable.DiscreteRandomVariable._from_buffers(*arrays)
+
+            if len(_attached) > _ATTACHED_LIMIT:
+                _attached.popitem(last=False)
+
+            return _attached[self.name]
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self.attach(), name)
+
+    def __repr__(self):
+        return "<SharedHandle name={} dtype={} count={}>".format(self.name, self.dtype, self.count)
+
+
+def _release(segment: shared_memory.SharedMemory):
+    # closes and removes a segment, once its owner is closed, garbage collected, or the interpreter exits
+    with _lock:
+        _attached.pop(segment.name, None)
+
+    segment.close()
+
+    # a worker sharing this process's resource tracker may have withdrawn the registration while attaching (see _open),
+    # so it is made again for unlink to withdraw, rather than the tracker failing to find it
+    reregister = os.name == "posix" and sys.version_info < (3, 13)
+
+    if reregister:
+        resource_tracker.register(segment._name, "shared_memory")
+
+    try:
+        segment.unlink()
+
+    except FileNotFoundError:
+        if reregister:
+            resource_tracker.unregister(segment._name, "shared_memory")
+
+
+class SharedDistribution:
+    """
+    Publishes a random variable's support, probabilities and running totals into a single shared memory segment, which
+    lives until this owner is closed (or garbage collected). Workers are handed the handle, and attach to the segment
+    """
+
+    def __init__(self, rv: 'discrete_random_variable.DiscreteRandomVariable'):
+        if rv.x.dtype.hasobject:
+            raise ValueError("Only random variables with a numeric support can be shared")
+
+        arrays = [rv.x, rv.px, rv._totals()]
+        offsets, size = _layout([i.dtype for i in arrays], len(rv.x))
+
+        self._segment = shared_memory.SharedMemory(create=True, size=size)
+
+        # the segment is removed when the owner goes away, even if close is never called
+        self._finalizer = weakref.finalize(self, _release, self._segment)
+
+        for array, offset in zip(arrays, offsets):
+            np.ndarray(array.shape, dtype=array.dtype, buffer=self._segment.buf, offset=offset)[:] = array
+
+        self.handle = SharedHandle(self._segment.name, rv.x.dtype.str, len(rv.x))
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def close(self):
+        """
+        Removes the segment. Workers which are still attached keep their view of it until they exit, but it can no
+        longer be attached to
+        """
+        self._finalizer()
+
+    def __enter__(self) -> SharedHandle:
+        return self.handle
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def share(rv: 'discrete_random_variable.DiscreteRandomVariable') -> SharedDistribution:
+    """
+    Publishes a random variable into shared memory. Used as a context manager, it gives the handle to pass to workers,
+    and removes the segment on exit:
+
+        with share(rv) as handle:
+            pool.map(task, [handle] * 100)
+    """
+    return SharedDistribution(rv)
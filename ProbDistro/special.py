@@ -0,0 +1,607 @@
+import math
+
+import numpy as np
+
+# Lanczos approximation (g=7, n=9), accurate to roughly 15 significant digits for positive arguments
+_LANCZOS_G = 7
+_LANCZOS_COEFFICIENTS = (
+    0.99999999999980993, 676.5203681218851, -1259.1392167224028, 771.32342877765313, -176.61502916214059,
+    12.507343278686905, -0.13857109526572012, 9.9843695780195716e-6, 1.5056327351493116e-7
+)
+
+# Chebyshev coefficients for erfc on [0, inf) (Numerical Recipes, 3rd edition), accurate to about 1.2e-16
+_ERFC_COEFFICIENTS = (
+    -1.3026537197817094, 6.4196979235649026e-1, 1.9476473204185836e-2, -9.561514786808631e-3,
+    -9.46595344482036e-4, 3.66839497852761e-4, 4.2523324806907e-5, -2.0278578112534e-5, -1.624290004647e-6,
+    1.303655835580e-6, 1.5626441722e-8, -8.5238095915e-8, 6.529054439e-9, 5.059343495e-9, -9.91364156e-10,
+    -2.27365122e-10, 9.6467911e-11, 2.394038e-12, -6.886027e-12, 8.94487e-13, 3.13092e-13, -1.12708e-13,
+    3.81e-16, 7.106e-15, -1.523e-15, -9.4e-17, 1.21e-16, -2.8e-17
+)
+
+
+def gammaln(x: np.ndarray) -> np.ndarray:
+    """
+    Element-wise natural logarithm of the gamma function for positive arguments
+
+    :param x: array of positive values
+    """
+    x = np.asarray(x, dtype=float) - 1
+    a = np.full_like(x, _LANCZOS_COEFFICIENTS[0])
+
+    for i, coefficient in enumerate(_LANCZOS_COEFFICIENTS[1:], start=1):
+        a += coefficient / (x + i)
+
+    t = x + _LANCZOS_G + 0.5
+
+    return 0.5 * math.log(2 * math.pi) + (x + 0.5) * np.log(t) - t + np.log(a)
+
+
+def xlogy(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Element-wise x * log(y), defined as 0 wherever x is 0 (even if y is also 0)
+    """
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(x == 0, 0.0, x * np.log(y))
+
+
+def erfc(x: np.ndarray) -> np.ndarray:
+    """
+    Element-wise complementary error function
+
+    :param x: array of real values
+    """
+    x = np.asarray(x, dtype=float)
+    z = np.abs(x)
+
+    t = 2 / (2 + z)
+    ty = 4 * t - 2
+
+    d = np.zeros_like(z)
+    dd = np.zeros_like(z)
+
+    for coefficient in _ERFC_COEFFICIENTS[:0:-1]:
+        d, dd = ty * d - dd + coefficient, d
+
+    result = t * np.exp(-z * z + 0.5 * (_ERFC_COEFFICIENTS[0] + ty * d) - dd)
+
+    return np.where(x >= 0, result, 2 - result)
+
+
+# the incomplete beta/gamma evaluations below target a relative error of 1e-13 or better in double precision
+_EPSILON = 1e-16
+_TINY = 1e-300
+_MAX_ITERATIONS = 100000
+_LOG_SQRT_2PI = 0.5 * math.log(2 * math.pi)
+
+_STIRLING_COEFFICIENTS = (1 / 12, 1 / 360, 1 / 1260, 1 / 1680, 1 / 1188)
+
+
+def _is_array(*values) -> bool:
+    return any(isinstance(i, np.ndarray) for i in values)
+
+
+def stirlerr(n: float) -> float:
+    """
+    The error of Stirling's approximation, log(n!) - log(sqrt(2 pi n) * (n / e) ** n), for n > 0
+
+    :param n: a positive value (or array of positive values)
+    """
+    if _is_array(n):
+        n = np.asarray(n, dtype=float)
+        small = n <= 15
+        safe = np.where(small, 16, n)
+
+        return np.where(small, _stirlerr_direct(np.where(small, n, 1), gammaln), _stirlerr_series(safe))
+
+    if n <= 15:
+        return _stirlerr_direct(n, math.lgamma)
+
+    return _stirlerr_series(n)
+
+
+def _stirlerr_direct(n, log_gamma: callable):
+    return log_gamma(n + 1) - (n + 0.5) * np.log(n) + n - _LOG_SQRT_2PI
+
+
+def _stirlerr_series(n):
+    s0, s1, s2, s3, s4 = _STIRLING_COEFFICIENTS
+    nn = n * n
+
+    return (s0 - (s1 - (s2 - (s3 - s4 / nn) / nn) / nn) / nn) / n
+
+
+def bd0(x: float, m: float) -> float:
+    """
+    Computes x * log(x / m) + m - x without cancellation (Loader's deviance term)
+
+    :param x: a non-negative value
+    :param m: a positive value
+    """
+    if _is_array(x, m):
+        x, m = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(m, dtype=float))
+        close = np.abs(x - m) < 0.1 * (x + m)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            direct = xlogy(x, x / m) + m - x
+            v = np.where(close, (x - m) / (x + m), 0)
+
+        s = (x - m) * v
+        ej = 2 * x * v
+        v = v * v
+
+        for j in range(1, 40):
+            ej = ej * v
+            s = s + ej / (2 * j + 1)
+
+        return np.where(close, s, direct)
+
+    if abs(x - m) < 0.1 * (x + m):
+        v = (x - m) / (x + m)
+        s = (x - m) * v
+        ej = 2 * x * v
+        v = v * v
+
+        for j in range(1, _MAX_ITERATIONS):
+            ej *= v
+            s1 = s + ej / (2 * j + 1)
+
+            if s1 == s:
+                return s1
+
+            s = s1
+
+    if x == 0:
+        return m
+
+    return x * math.log(x / m) + m - x
+
+
+def _log_beta_front(a, b, x):
+    # log(x ** a * (1 - x) ** b / B(a, b)) evaluated through Stirling corrections to avoid cancellation
+    s = a + b
+
+    return (
+        -bd0(a, s * x) - bd0(b, s * (1 - x)) + 0.5 * np.log(a * b / (2 * math.pi * s)) +
+        stirlerr(s) - stirlerr(a) - stirlerr(b)
+    )
+
+
+def _log_gamma_front(a, x):
+    # log(x ** a * exp(-x) / gamma(a)) evaluated through Stirling corrections to avoid cancellation
+    return -bd0(a, x) + 0.5 * np.log(a / (2 * math.pi)) - stirlerr(a)
+
+
+def _beta_continued_fraction(a, b, x):
+    qab = a + b
+    qap = a + 1
+    qam = a - 1
+
+    c = 1.0
+    d = 1 - qab * x / qap
+    d = 1 / (_TINY if abs(d) < _TINY else d)
+    h = d
+
+    for m in range(1, _MAX_ITERATIONS):
+        m2 = 2 * m
+
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 + aa * d
+        d = 1 / (_TINY if abs(d) < _TINY else d)
+        c = 1 + aa / c
+        c = _TINY if abs(c) < _TINY else c
+        h *= d * c
+
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 + aa * d
+        d = 1 / (_TINY if abs(d) < _TINY else d)
+        c = 1 + aa / c
+        c = _TINY if abs(c) < _TINY else c
+        delta = d * c
+        h *= delta
+
+        if abs(delta - 1) < _EPSILON:
+            break
+
+    return h
+
+
+def _beta_continued_fraction_array(a, b, x):
+    def guard(value):
+        return np.where(np.abs(value) < _TINY, _TINY, value)
+
+    qab = a + b
+    qap = a + 1
+    qam = a - 1
+
+    c = np.ones_like(x)
+    d = 1 / guard(1 - qab * x / qap)
+    h = d
+
+    # each element stops updating once it converges, since further terms only add rounding noise
+    active = np.ones(x.shape, dtype=bool)
+
+    for m in range(1, _MAX_ITERATIONS):
+        m2 = 2 * m
+
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1 / guard(1 + aa * d)
+        c = guard(1 + aa / c)
+        step = d * c
+
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1 / guard(1 + aa * d)
+        c = guard(1 + aa / c)
+        delta = d * c
+        h = np.where(active, h * step * delta, h)
+
+        active &= np.abs(delta - 1) >= _EPSILON
+
+        if not active.any():
+            break
+
+    return h
+
+
+def betainc(a: float, b: float, x: float) -> float:
+    """
+    The regularized incomplete beta function I_x(a, b) for a, b > 0
+
+    :param a: first shape parameter
+    :param b: second shape parameter
+    :param x: upper limit of integration, clipped to [0, 1]
+    """
+    if _is_array(a, b, x):
+        a, b, x = np.broadcast_arrays(*(np.asarray(i, dtype=float) for i in (a, b, x)))
+        interior = (x > 0) & (x < 1)
+
+        # the continued fraction converges quickly below the mean, so evaluate the other tail above it
+        swap = x > (a + 1) / (a + b + 2)
+        ia = np.where(interior, np.where(swap, b, a), 1)
+        ib = np.where(interior, np.where(swap, a, b), 1)
+        ix = np.where(interior, np.where(swap, 1 - x, x), 0.5)
+
+        tail = np.exp(_log_beta_front(ia, ib, ix)) * _beta_continued_fraction_array(ia, ib, ix) / ia
+        result = np.where(swap, 1 - tail, tail)
+
+        return np.where(x <= 0, 0.0, np.where(x >= 1, 1.0, result))
+
+    if x <= 0:
+        return 0.0
+
+    if x >= 1:
+        return 1.0
+
+    if x > (a + 1) / (a + b + 2):
+        return 1 - betainc(b, a, 1 - x)
+
+    return math.exp(_log_beta_front(a, b, x)) * _beta_continued_fraction(a, b, x) / a
+
+
+def _gamma_series(a, x):
+    term = 1 / a
+    total = term
+
+    for n in range(1, _MAX_ITERATIONS):
+        term *= x / (a + n)
+        total += term
+
+        if abs(term) < abs(total) * _EPSILON:
+            break
+
+    return total
+
+
+def _gamma_continued_fraction(a, x):
+    b = x + 1 - a
+    c = 1 / _TINY
+    d = 1 / b
+    h = d
+
+    for i in range(1, _MAX_ITERATIONS):
+        an = -i * (i - a)
+        b += 2
+
+        d = an * d + b
+        d = 1 / (_TINY if abs(d) < _TINY else d)
+        c = b + an / c
+        c = _TINY if abs(c) < _TINY else c
+        delta = d * c
+        h *= delta
+
+        if abs(delta - 1) < _EPSILON:
+            break
+
+    return h
+
+
+def _gamma_series_array(a, x):
+    term = 1 / a
+    total = term
+
+    # each element stops updating once it converges, so its value does not depend on the others evaluated with it
+    active = np.ones(total.shape, dtype=bool)
+
+    for n in range(1, _MAX_ITERATIONS):
+        term = term * x / (a + n)
+        total = np.where(active, total + term, total)
+
+        active &= np.abs(term) >= np.abs(total) * _EPSILON
+
+        if not active.any():
+            break
+
+    return total
+
+
+def _gamma_continued_fraction_array(a, x):
+    def guard(value):
+        return np.where(np.abs(value) < _TINY, _TINY, value)
+
+    b = x + 1 - a
+    c = np.full_like(x, 1 / _TINY)
+    d = 1 / guard(b)
+    h = d
+
+    # each element stops updating once it converges, since further terms only add rounding noise
+    active = np.ones(x.shape, dtype=bool)
+
+    for i in range(1, _MAX_ITERATIONS):
+        an = -i * (i - a)
+        b = b + 2
+
+        d = 1 / guard(an * d + b)
+        c = guard(b + an / c)
+        delta = d * c
+        h = np.where(active, h * delta, h)
+
+        active &= np.abs(delta - 1) >= _EPSILON
+
+        if not active.any():
+            break
+
+    return h
+
+
+def _gammainc_pair_array(a, x):
+    a, x = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(x, dtype=float))
+    lower = np.zeros(a.shape)
+    upper = np.ones(a.shape)
+
+    positive = x > 0
+    series = positive & (x < a + 1)
+    fraction = positive & ~series
+
+    if series.any():
+        sa, sx = a[series], x[series]
+        lower[series] = np.exp(_log_gamma_front(sa, sx)) * _gamma_series_array(sa, sx)
+        upper[series] = 1 - lower[series]
+
+    if fraction.any():
+        fa, fx = a[fraction], x[fraction]
+        upper[fraction] = np.exp(_log_gamma_front(fa, fx)) * _gamma_continued_fraction_array(fa, fx)
+        lower[fraction] = 1 - upper[fraction]
+
+    return lower, upper
+
+
+def _gammainc_pair(a, x):
+    if x <= 0:
+        return 0.0, 1.0
+
+    front = math.exp(_log_gamma_front(a, x))
+
+    if x < a + 1:
+        lower = front * _gamma_series(a, x)
+        return lower, 1 - lower
+
+    upper = front * _gamma_continued_fraction(a, x)
+    return 1 - upper, upper
+
+
+def gammainc(a: float, x: float) -> float:
+    """
+    The regularized lower incomplete gamma function P(a, x) for a > 0
+
+    :param a: shape parameter
+    :param x: upper limit of integration
+    """
+    if _is_array(a, x):
+        return _gammainc_pair_array(a, x)[0]
+
+    return _gammainc_pair(a, x)[0]
+
+
+def gammaincc(a: float, x: float) -> float:
+    """
+    The regularized upper incomplete gamma function Q(a, x) = 1 - P(a, x) for a > 0
+
+    :param a: shape parameter
+    :param x: lower limit of integration
+    """
+    if _is_array(a, x):
+        return _gammainc_pair_array(a, x)[1]
+
+    return _gammainc_pair(a, x)[1]
+
+
+def binomial_logpmf(k: float, n: float, p: float) -> float:
+    """
+    The natural logarithm of the binomial probability mass at k, using Loader's saddle point expansion
+    so it stays accurate for very large n
+
+    :param k: number of successes, 0 <= k <= n
+    :param n: number of trials
+    :param p: probability of success
+    """
+    q = 1 - p
+
+    if _is_array(k, n, p):
+        k, n, p, q = np.broadcast_arrays(*(np.asarray(i, dtype=float) for i in (k, n, p, q)))
+        interior = (k > 0) & (k < n) & (p > 0) & (q > 0)
+
+        safe_k = np.where(interior, k, 1)
+        safe_n = np.where(interior, n, 2)
+        safe_p = np.where(interior, p, 0.5)
+
+        log_pmf = (
+            stirlerr(safe_n) - stirlerr(safe_k) - stirlerr(safe_n - safe_k) -
+            bd0(safe_k, safe_n * safe_p) - bd0(safe_n - safe_k, safe_n * (1 - safe_p)) -
+            0.5 * (math.log(2 * math.pi) + np.log(safe_k) + np.log1p(-safe_k / safe_n))
+        )
+
+        with np.errstate(divide="ignore"):
+            edge = np.where(k == 0, xlogy(n, q), np.where(k == n, xlogy(n, p), -np.inf))
+
+        return np.where(interior, log_pmf, edge)
+
+    if k == 0:
+        return n * math.log(q) if n > 0 and q > 0 else (0.0 if n == 0 or p == 0 else -math.inf)
+
+    if k == n:
+        return n * math.log(p) if p > 0 else -math.inf
+
+    if p == 0 or q == 0:
+        return -math.inf
+
+    return (
+        stirlerr(n) - stirlerr(k) - stirlerr(n - k) - bd0(k, n * p) - bd0(n - k, n * q) -
+        0.5 * (math.log(2 * math.pi) + math.log(k) + math.log1p(-k / n))
+    )
+
+
+def poisson_logpmf(k: float, rate: float) -> float:
+    """
+    The natural logarithm of the Poisson probability mass at k, using Loader's saddle point expansion
+    so it stays finite for large k and rate
+
+    :param k: number of events, k >= 0
+    :param rate: the average rate
+    """
+    if _is_array(k, rate):
+        k, rate = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(rate, dtype=float))
+        interior = (k > 0) & (rate > 0)
+
+        safe_k = np.where(interior, k, 1)
+        safe_rate = np.where(interior, rate, 1)
+
+        log_pmf = -stirlerr(safe_k) - bd0(safe_k, safe_rate) - 0.5 * np.log(2 * math.pi * safe_k)
+
+        return np.where(interior, log_pmf, np.where(k == 0, -rate, -np.inf))
+
+    if k == 0:
+        return -rate
+
+    if rate == 0:
+        return -math.inf
+
+    return -stirlerr(k) - bd0(k, rate) - 0.5 * math.log(2 * math.pi * k)
+
+
+def log_ndtr(z: float) -> float:
+    """
+    The natural logarithm of the standard normal CDF, using an asymptotic series deep in the lower tail
+    where the CDF itself underflows
+
+    :param z: a standard score (or array of standard scores)
+    """
+    if _is_array(z):
+        z = np.asarray(z, dtype=float)
+        tail = z < -20
+
+        with np.errstate(divide="ignore"):
+            direct = np.where(
+                z > 0, np.log1p(-0.5 * erfc(z / math.sqrt(2))), np.log(0.5 * erfc(-z / math.sqrt(2)))
+            )
+
+        return np.where(tail, _log_ndtr_asymptotic(np.where(tail, z, -20)), direct)
+
+    if z < -20:
+        return _log_ndtr_asymptotic(z)
+
+    if z > 0:
+        return math.log1p(-0.5 * math.erfc(z / math.sqrt(2)))
+
+    return math.log(0.5 * math.erfc(-z / math.sqrt(2)))
+
+
+def _log_ndtr_asymptotic(z):
+    # log(phi(z) / -z) + log(1 - 1 / z^2 + 3 / z^4 - 15 / z^6 + ...)
+    term = 1.0
+    total = 1.0
+
+    for k in range(1, 12):
+        term = -term * (2 * k - 1) / (z * z)
+        total = total + term
+
+    return -0.5 * z * z - np.log(-z) - _LOG_SQRT_2PI + np.log(total)
+
+
+# Wichura's algorithm AS241 (PPND16), accurate to about 1e-16 relative error
+_NDTRI_CENTRAL = (
+    (3.3871328727963666080e0, 1.3314166789178437745e+2, 1.9715909503065514427e+3, 1.3731693765509461125e+4,
+     4.5921953931549871457e+4, 6.7265770927008700853e+4, 3.3430575583588128105e+4, 2.5090809287301226727e+3),
+    (1.0, 4.2313330701600911252e+1, 6.8718700749205790830e+2, 5.3941960214247511077e+3,
+     2.1213794301586595867e+4, 3.9307895800092710610e+4, 2.8729085735721942674e+4, 5.2264952788528545610e+3)
+)
+_NDTRI_INTERMEDIATE = (
+    (1.42343711074968357734e0, 4.63033784615654529590e0, 5.76949722146069140550e0, 3.64784832476320460504e0,
+     1.27045825245236838258e0, 2.41780725177450611770e-1, 2.27238449892691845833e-2, 7.74545014278341407640e-4),
+    (1.0, 2.05319162663775882187e0, 1.67638483018380384940e0, 6.89767334985100004550e-1,
+     1.48103976427480074590e-1, 1.51986665636164571966e-2, 5.47593808499534494600e-4, 1.05075007164441684324e-9)
+)
+_NDTRI_TAIL = (
+    (6.65790464350110377720e0, 5.46378491116411436990e0, 1.78482653991729133580e0, 2.96560571828504891230e-1,
+     2.65321895265761230930e-2, 1.24266094738807843860e-3, 2.71155556874348757815e-5, 2.01033439929228813265e-7),
+    (1.0, 5.99832206555887937690e-1, 1.36929880922735805310e-1, 1.48753612908506148525e-2,
+     7.86869131145613259100e-4, 1.84631831751005468180e-5, 1.42151175831644588870e-7, 2.04426310338993978564e-15)
+)
+
+
+def _rational(coefficients: tuple, x):
+    numerator, denominator = coefficients
+    return np.polyval(numerator[::-1], x) / np.polyval(denominator[::-1], x)
+
+
+def ndtri(p: float) -> float:
+    """
+    The inverse of the standard normal CDF, giving -inf at 0 and inf at 1
+
+    :param p: a probability (or array of probabilities) in [0, 1]
+    """
+    if _is_array(p):
+        p = np.asarray(p, dtype=float)
+        q = p - 0.5
+
+        central = np.abs(q) <= 0.425
+        r_central = 0.180625 - q * q
+
+        with np.errstate(divide="ignore"):
+            r = np.sqrt(-np.log(np.minimum(p, 1 - p)))
+
+        tail = np.where(
+            r <= 5,
+            _rational(_NDTRI_INTERMEDIATE, np.minimum(r, 5) - 1.6),
+            _rational(_NDTRI_TAIL, np.where(np.isinf(r), 5, r) - 5)
+        )
+        tail = np.where(np.isinf(r), np.inf, tail)
+
+        return np.where(central, q * _rational(_NDTRI_CENTRAL, r_central), np.copysign(tail, q))
+
+    q = p - 0.5
+
+    if abs(q) <= 0.425:
+        return q * float(_rational(_NDTRI_CENTRAL, 0.180625 - q * q))
+
+    r = min(p, 1 - p)
+
+    if r <= 0:
+        return math.copysign(math.inf, q)
+
+    r = math.sqrt(-math.log(r))
+
+    if r <= 5:
+        return math.copysign(float(_rational(_NDTRI_INTERMEDIATE, r - 1.6)), q)
+
+    return math.copysign(float(_rational(_NDTRI_TAIL, r - 5)), q)
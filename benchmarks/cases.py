@@ -0,0 +1,193 @@
+import collections
+import typing
+
+import numpy as np
+
+import ProbDistro
+
+# a single benchmark: setup builds its inputs (outside of the timing), and run(inputs) does the measured work,
+# processing "items" values (points evaluated, draws made, ...) per call
+Case = collections.namedtuple("Case", ["name", "setup", "run", "items", "quick"])
+
+
+def _case(name: str, setup: callable, run: callable, items: int = 1, quick: bool = True) -> Case:
+    return Case(name, setup, run, items, quick)
+
+
+def _scalar_calls(method: callable, x: typing.Sequence[float]) -> callable:
+    def run(_):
+        for i in x:
+            method(i)
+
+    return run
+
+
+def _tail(distribution, z: float) -> int:
+    # a support point z standard deviations from the mean
+    return int(distribution.expected_value() + z * distribution.standard_deviation())
+
+
+def binomial_cases() -> typing.Iterator[Case]:
+    for n in (10, 1000, 10 ** 5, 10 ** 7):
+        b = ProbDistro.Binomial(n, 0.3)
+        quick = n <= 10 ** 5
+
+        for position, z in (("mean", 0), ("tail", 6)):
+            x = min(_tail(b, z), n)
+            yield _case("Binomial.cdf[n={},x={}]".format(n, position), None, _scalar_calls(b.cdf, [x] * 100), 100, quick)
+
+        yield _case("Binomial.pmf[n={}]".format(n), None, _scalar_calls(b.pmf, [_tail(b, 1)] * 100), 100, quick)
+
+        points = np.arange(0, min(n, 10 ** 5) + 1)
+        yield _case("Binomial.cdf_array[n={}]".format(n), None, lambda _, b=b, x=points: b.cdf(x), len(points), quick)
+
+        if n <= 10 ** 5:
+            yield _case("Binomial.pmf_range[n={}]".format(n), None, lambda _, b=b: b.pmf_range(range(b.n + 1)), n + 1)
+            yield _case(
+                "Binomial.to_discrete_random_variable[n={}]".format(n), None,
+                lambda _, b=b: b.to_discrete_random_variable(), n + 1
+            )
+
+        q = np.linspace(0.001, 0.999, 1000)
+        yield _case("Binomial.ppf[n={}]".format(n), None, lambda _, b=b: b.ppf(q), len(q), quick)
+        yield _case("Binomial.sample[n={}]".format(n), None, lambda _, b=b: b.sample(10 ** 5, seed=0), 10 ** 5, quick)
+
+
+def poisson_cases() -> typing.Iterator[Case]:
+    for rate in (1, 1000, 10 ** 6):
+        p = ProbDistro.Poisson(rate)
+        quick = rate <= 1000
+
+        for position, z in (("mean", 0), ("tail", 6)):
+            x = _tail(p, z)
+            yield _case("Poisson.cdf[rate={},x={}]".format(rate, position), None, _scalar_calls(p.cdf, [x] * 100), 100, quick)
+
+        yield _case("Poisson.pmf[rate={}]".format(rate), None, _scalar_calls(p.pmf, [_tail(p, 1)] * 100), 100, quick)
+
+        top = _tail(p, 8) + 1
+        yield _case(
+            "Poisson.pmf_range[rate={}]".format(rate), None, lambda _, p=p, top=top: p.pmf_range(range(top)), top, quick
+        )
+
+        q = np.linspace(0.001, 0.999, 1000)
+        yield _case("Poisson.ppf[rate={}]".format(rate), None, lambda _, p=p: p.ppf(q), len(q), quick)
+        yield _case("Poisson.sample[rate={}]".format(rate), None, lambda _, p=p: p.sample(10 ** 5, seed=0), 10 ** 5, quick)
+
+
+def hypergeometric_cases() -> typing.Iterator[Case]:
+    for N in (50, 5000, 10 ** 6):
+        h = ProbDistro.Hypergeometric(N, N // 3, N // 5)
+        quick = N <= 5000
+
+        yield _case("Hypergeometric.pmf[N={}]".format(N), None, _scalar_calls(h.pmf, [_tail(h, 1)] * 100), 100, quick)
+        yield _case("Hypergeometric.cdf[N={}]".format(N), None, _scalar_calls(h.cdf, [_tail(h, 1)] * 100), 100, quick)
+
+        x = np.arange(*h._get_defaults()[:2])
+        yield _case("Hypergeometric.cdf_array[N={}]".format(N), None, lambda _, h=h, x=x: h.cdf(x), len(x), quick)
+
+
+def geometric_cases() -> typing.Iterator[Case]:
+    for p in (0.5, 0.001):
+        g = ProbDistro.Geometric(p)
+        x = np.arange(1, 10 ** 5 + 1)
+
+        yield _case("Geometric.pmf[p={}]".format(p), None, _scalar_calls(g.pmf, range(1, 101)), 100)
+        yield _case("Geometric.cdf_array[p={}]".format(p), None, lambda _, g=g: g.cdf(x), len(x))
+        yield _case(
+            "Geometric.to_discrete_random_variable[p={}]".format(p), None,
+            lambda _, g=g: g.to_discrete_random_variable(stop=10 ** 4), 10 ** 4
+        )
+
+
+def bernoulli_cases() -> typing.Iterator[Case]:
+    b = ProbDistro.Bernoulli(0.3)
+
+    yield _case("Bernoulli.pmf", None, _scalar_calls(b.pmf, [0, 1] * 50), 100)
+    yield _case("Bernoulli.sample", None, lambda _: b.sample(10 ** 6, seed=0), 10 ** 6)
+
+
+def _random_variable(size: int, seed: int = 0) -> 'ProbDistro.DiscreteRandomVariable':
+    px = np.random.default_rng(seed).random(size)
+    return ProbDistro.DiscreteRandomVariable.from_arrays(np.arange(size), px, normalize=True)
+
+
+def discrete_random_variable_cases() -> typing.Iterator[Case]:
+    for size in (10, 100, 1000):
+        yield _case(
+            "DiscreteRandomVariable.__mul__[support={}]".format(size),
+            lambda size=size: (_random_variable(size), _random_variable(size, 1)),
+            lambda rvs: rvs[0] * rvs[1], size * size, size <= 100
+        )
+        yield _case(
+            "DiscreteRandomVariable.covariance[support={}]".format(size),
+            lambda size=size: (_random_variable(size), _random_variable(size, 1)),
+            lambda rvs: rvs[0].covariance(rvs[1]), size * size, size <= 100
+        )
+
+    for size in (100, 10 ** 4, 10 ** 6):
+        quick = size <= 10 ** 4
+
+        yield _case(
+            "DiscreteRandomVariable.__add__[support={}]".format(size),
+            lambda size=size: (_random_variable(size), _random_variable(size, 1)),
+            lambda rvs: rvs[0] + rvs[1], 2 * size, quick
+        )
+        yield _case(
+            "DiscreteRandomVariable.cdf_array[support={}]".format(size),
+            lambda size=size: (_random_variable(size), np.random.default_rng(2).random(10 ** 5) * size),
+            lambda inputs: inputs[0].cdf(inputs[1]), 10 ** 5, quick
+        )
+        yield _case(
+            "DiscreteRandomVariable.sample[support={}]".format(size),
+            lambda size=size: _random_variable(size),
+            lambda rv: rv.sample(10 ** 6, seed=0), 10 ** 6, quick
+        )
+
+    yield _case(
+        "DiscreteRandomVariable.sum_iid[support=1000,k=64]", lambda: _random_variable(1000),
+        lambda rv: rv.sum_iid(64), 64 * 1000
+    )
+
+
+def continuous_cases() -> typing.Iterator[Case]:
+    x = np.linspace(-10, 10, 10 ** 6)
+    q = np.linspace(0, 1, 10 ** 6)
+
+    for distribution in (ProbDistro.Normal(0, 2), ProbDistro.Exponential(0.5), ProbDistro.Uniform(-3, 3)):
+        name = distribution.__class__.__name__
+
+        yield _case("{}.pdf".format(name), None, _scalar_calls(distribution.pdf, x[:100].tolist()), 100)
+        yield _case("{}.cdf".format(name), None, _scalar_calls(distribution.cdf, x[:100].tolist()), 100)
+        yield _case("{}.cdf_array".format(name), None, lambda _, d=distribution: d.cdf(x), len(x))
+        yield _case("{}.ppf_array".format(name), None, lambda _, d=distribution: d.ppf(q), len(q))
+        yield _case("{}.sample".format(name), None, lambda _, d=distribution: d.sample(10 ** 6, seed=0), 10 ** 6)
+
+
+def batch_cases() -> typing.Iterator[Case]:
+    rng = np.random.default_rng(0)
+
+    for size in (1000, 10 ** 5):
+        n, p, k = rng.integers(1, 1000, size), rng.random(size), rng.integers(0, 1000, size)
+        quick = size <= 1000
+
+        yield _case(
+            "BinomialBatch.cdf[size={}]".format(size), None, lambda _, b=ProbDistro.BinomialBatch(n, p), k=k: b.cdf(k),
+            size, quick
+        )
+        yield _case(
+            "PoissonBatch.ppf[size={}]".format(size), None,
+            lambda _, b=ProbDistro.PoissonBatch(n), q=p: b.ppf(q), size, quick
+        )
+        yield _case(
+            "NormalBatch.cdf[size={}]".format(size), None,
+            lambda _, b=ProbDistro.NormalBatch(k, n), x=p * 1000: b.cdf(x), size, quick
+        )
+
+
+def all_cases() -> typing.List[Case]:
+    groups = (
+        bernoulli_cases, binomial_cases, geometric_cases, hypergeometric_cases, poisson_cases,
+        discrete_random_variable_cases, continuous_cases, batch_cases
+    )
+
+    return [case for group in groups for case in group()]
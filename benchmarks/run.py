@@ -0,0 +1,160 @@
+"""
+Runs the benchmark suite, optionally writing the results to a JSON baseline file, and optionally comparing them against
+an earlier baseline, exiting with status 1 if any case has regressed
+
+    python -m benchmarks.run --output benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.25
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+import typing
+
+import numpy as np
+
+import benchmarks.cases as cases
+
+FORMAT_VERSION = 1
+
+
+def measure(case: cases.Case, repeat: int = 5, min_time: float = 0.2) -> dict:
+    """
+    Measures the throughput (items processed per second) and the peak memory allocated by a single benchmark case
+
+    :param case: the case to measure
+    :param repeat: the number of timing runs, of which the fastest is kept
+    :param min_time: the minimum duration of each timing run, which is made up of as many calls as that takes
+    :return: the measurements for the case
+    """
+    inputs = case.setup() if case.setup is not None else None
+
+    timer = timeit.Timer(lambda: case.run(inputs))
+    number = max(1, timer.autorange()[0])
+
+    while timer.timeit(number) < min_time and number < 1 << 20:
+        number *= 2
+
+    seconds = min(timer.repeat(repeat, number)) / number
+
+    # the peak is taken from a separate call, since tracing the allocations slows the call down considerably
+    tracemalloc.start()
+    try:
+        case.run(inputs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": seconds, "throughput": case.items / seconds, "items": case.items, "peak_memory": peak}
+
+
+def metadata() -> dict:
+    return {
+        "format": FORMAT_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def run(selected: typing.Iterable[cases.Case], repeat: int = 5, min_time: float = 0.2, stream=sys.stdout) -> dict:
+    results = {}
+
+    for case in selected:
+        results[case.name] = measure(case, repeat, min_time)
+
+        if stream is not None:
+            print(format_result(case.name, results[case.name]), file=stream, flush=True)
+
+    return {"metadata": metadata(), "results": results}
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.25) -> typing.List[str]:
+    """
+    Compares two benchmark runs, listing every case which has regressed by more than the threshold in either throughput
+    or peak memory. Cases which only appear in one of the runs are ignored
+
+    :param baseline: the earlier run
+    :param current: the run to check
+    :param threshold: the tolerated relative regression (0.25 allows a case to become 25% slower or larger)
+    :return: a description of each regression found
+    """
+    regressions = []
+
+    for name, result in current["results"].items():
+        if name not in baseline["results"]:
+            continue
+
+        expected = baseline["results"][name]
+
+        if result["throughput"] < expected["throughput"] * (1 - threshold):
+            regressions.append("{}: throughput {:.4g}/s -> {:.4g}/s ({:+.1%})".format(
+                name, expected["throughput"], result["throughput"], result["throughput"] / expected["throughput"] - 1
+            ))
+
+        # allocations of a few KiB are dominated by interpreter noise, so they are never reported
+        if result["peak_memory"] > max(expected["peak_memory"] * (1 + threshold), expected["peak_memory"] + 65536):
+            regressions.append("{}: peak memory {} -> {} bytes ({:+.1%})".format(
+                name, expected["peak_memory"], result["peak_memory"],
+                result["peak_memory"] / max(expected["peak_memory"], 1) - 1
+            ))
+
+    return regressions
+
+
+def format_result(name: str, result: dict) -> str:
+    return "{:<64} {:>12.4g} items/s {:>12.4g} s {:>12} bytes".format(
+        name, result["throughput"], result["seconds"], result["peak_memory"]
+    )
+
+
+def main(argv: typing.List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks every distribution and operation in ProbDistro")
+    parser.add_argument("--output", help="file to write the results to (nothing is written without it)")
+    parser.add_argument("--compare", help="baseline file to check the results against for regressions")
+    parser.add_argument("--threshold", type=float, default=0.25, help="tolerated relative regression")
+    parser.add_argument("--filter", default="", help="only run the cases whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="skip the largest parameter scales")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per case, of which the fastest is kept")
+    args = parser.parse_args(argv)
+
+    # a comparison run would otherwise replace the baseline it is being checked against
+    if args.output is not None and args.compare is not None and (
+            os.path.realpath(args.output) == os.path.realpath(args.compare)
+    ):
+        parser.error("--output must not be the baseline given to --compare")
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    selected = [
+        case for case in cases.all_cases() if args.filter in case.name and (case.quick or not args.quick)
+    ]
+
+    current = run(selected, args.repeat)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    if baseline is None:
+        return 0
+
+    regressions = compare(baseline, current, args.threshold)
+
+    for regression in regressions:
+        print("REGRESSION " + regression)
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -28,6 +28,7 @@ setup(
         'HYPERGEOMETRIC'
     ],
     install_requires=[
+        'numpy'
     ],
     classifiers=[
         'Development Status :: 4 - Beta',
@@ -0,0 +1,123 @@
+import pickle
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append('..')
+
+from ProbDistro import *
+
+
+def rows(*parameters):
+    return list(zip(*(np.asarray(i).tolist() for i in parameters)))
+
+
+class TestBatch(unittest.TestCase):
+    def assertMatchesScalar(self, batch, scalars, method, x):
+        # each distribution in the batch gives the same result as its scalar class does on an array
+        x = np.broadcast_to(np.asarray(x), batch.shape)
+        expected = [getattr(scalar, method)(np.array([i]))[0] for scalar, i in zip(scalars, x)]
+
+        np.testing.assert_allclose(getattr(batch, method)(x), expected, rtol=1e-12, atol=1e-300)
+
+    def test_discrete(self):
+        rng = np.random.default_rng(0)
+
+        n, p, k = rng.integers(1, 3000, 200), rng.random(200), rng.integers(-5, 3000, 200)
+        batch, scalars = BinomialBatch(n, p), [Binomial(*i) for i in rows(n, p)]
+
+        for method in ("pmf", "logpmf", "cdf", "sf"):
+            self.assertMatchesScalar(batch, scalars, method, k)
+
+        rate = rng.random(200) * 1000
+        batch, scalars = PoissonBatch(rate), [Poisson(*i) for i in rows(rate)]
+
+        for method in ("pmf", "cdf", "sf"):
+            self.assertMatchesScalar(batch, scalars, method, k)
+
+        N = rng.integers(10, 5000, 200)
+        K, draws = (N * rng.random(200)).astype(int), (N * rng.random(200)).astype(int)
+        batch, scalars = HypergeometricBatch(N, K, draws), [Hypergeometric(*i) for i in rows(N, K, draws)]
+
+        for method in ("pmf", "cdf"):
+            self.assertMatchesScalar(batch, scalars, method, k // 3)
+
+        p = rng.random(200)
+        batch, scalars = GeometricBatch(p, False), [Geometric(i, False) for i in p.tolist()]
+
+        for method in ("pmf", "cdf", "logsf"):
+            self.assertMatchesScalar(batch, scalars, method, k % 20)
+
+        batch, scalars = BernoulliBatch(p), [Bernoulli(i) for i in p.tolist()]
+        self.assertMatchesScalar(batch, scalars, "pmf", k % 2)
+
+    def test_continuous(self):
+        rng = np.random.default_rng(1)
+        a, b, x = rng.normal(size=100), rng.random(100) + 0.5, rng.normal(size=100) * 2
+
+        for batch, scalars in (
+                (NormalBatch(a, b), [Normal(*i) for i in rows(a, b)]),
+                (UniformBatch(a, b), [Uniform(*i) for i in rows(a, b)]),
+                (ExponentialBatch(b), [Exponential(*i) for i in rows(b)])
+        ):
+            for method in ("pdf", "cdf", "sf", "logcdf"):
+                self.assertMatchesScalar(batch, scalars, method, x)
+
+    def test_quantiles(self):
+        rng = np.random.default_rng(2)
+        n, p, q = rng.integers(1, 10 ** 5, 100), rng.random(100), rng.random(100)
+
+        batch, scalars = BinomialBatch(n, p), [Binomial(*i) for i in rows(n, p)]
+        self.assertEqual(batch.ppf(q).tolist(), [s.ppf(i) for s, i in zip(scalars, q.tolist())])
+        self.assertEqual(batch.isf(q).tolist(), [s.isf(i) for s, i in zip(scalars, q.tolist())])
+
+        batch = PoissonBatch([0.5, 10, 1e5])
+        self.assertEqual(batch.ppf([0, 1, 0.5]).tolist(), [0, np.inf, Poisson(1e5).ppf(0.5)])
+
+        self.assertRaises(ValueError, lambda: batch.ppf([0.5, 2, 0.5]))
+
+    def test_moments(self):
+        batch = BinomialBatch([10, 20, 30], 0.5)
+
+        self.assertEqual(batch.expected_value().tolist(), [5, 10, 15])
+        self.assertEqual(batch.variance().tolist(), [2.5, 5, 7.5])
+        np.testing.assert_allclose(
+            batch.standard_deviation(), [Binomial(i, 0.5).standard_deviation() for i in (10, 20, 30)]
+        )
+
+        self.assertEqual(NormalBatch([1, 2], 3).mean().tolist(), [1, 2])
+
+    def test_broadcasting(self):
+        batch = PoissonBatch([1, 2, 3])
+
+        # a column of points is evaluated against every distribution in the batch
+        table = batch.pmf(np.arange(4)[:, None])
+        self.assertEqual(table.shape, (4, 3))
+        np.testing.assert_allclose(table[:, 1], Poisson(2).pmf(np.arange(4)))
+
+        self.assertEqual(batch.sample(size=5, seed=0).shape, (5, 3))
+        self.assertEqual(batch.sample(seed=0).shape, (3,))
+
+        self.assertEqual((batch.shape, batch.size, len(batch)), ((3,), 3, 3))
+
+    def test_support(self):
+        batch = BinomialBatch([5, 10], 0.5)
+
+        self.assertEqual(batch.equals([5, 10]).tolist(), [Binomial(5, 0.5).pmf(5), Binomial(10, 0.5).pmf(10)])
+        self.assertRaises(ValueError, lambda: batch.equals(7))
+        self.assertRaises(NotImplementedError, batch.to_discrete_random_variable)
+
+    def test_immutable(self):
+        batch = BinomialBatch([5, 10], 0.5)
+
+        self.assertRaises(AttributeError, lambda: setattr(batch, "n", np.array([1, 2])))
+        self.assertRaises(ValueError, lambda: batch.n.__setitem__(0, 1))
+        self.assertRaises(TypeError, lambda: hash(batch))
+
+        restored = pickle.loads(pickle.dumps(batch))
+        self.assertEqual(restored.cdf(3).tolist(), batch.cdf(3).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
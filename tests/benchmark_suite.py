@@ -0,0 +1,53 @@
+import contextlib
+import io
+import sys
+import unittest
+
+sys.path.append('..')
+
+import benchmarks.cases as cases
+import benchmarks.run as run
+
+
+def result(throughput: float, peak_memory: int) -> dict:
+    return {"seconds": 1 / throughput, "throughput": throughput, "items": 1, "peak_memory": peak_memory}
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_case_names_unique(self):
+        names = [case.name for case in cases.all_cases()]
+        self.assertEqual(len(names), len(set(names)))
+
+    def test_measure(self):
+        case = cases.Case("sum", lambda: list(range(1000)), sum, 1000, True)
+        measured = run.run([case], repeat=1, min_time=0.001, stream=None)
+
+        self.assertEqual(set(measured), {"metadata", "results"})
+        self.assertEqual(measured["results"]["sum"]["items"], 1000)
+        self.assertGreater(measured["results"]["sum"]["throughput"], 0)
+
+    def test_compare(self):
+        baseline = {"results": {"a": result(100, 10 ** 6), "b": result(100, 10 ** 6), "c": result(100, 100)}}
+        current = {"results": {
+            "a": result(80, 10 ** 6), "b": result(50, 2 * 10 ** 6), "c": result(100, 1000), "d": result(1, 1)
+        }}
+
+        regressions = run.compare(baseline, current, 0.25)
+
+        # "a" is within the threshold, "c" only grew by a negligible amount, and "d" has nothing to compare against
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(regression.startswith("b: ") for regression in regressions))
+
+        self.assertEqual(run.compare(baseline, current, 0.1)[0], "a: throughput 100/s -> 80/s (-20.0%)")
+
+    def test_output_is_not_baseline(self):
+        # writing the results over the baseline being compared against is refused before anything is run
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                run.main(["--compare", "baseline.json", "--output", "./baseline.json", "--filter", "no such case"])
+
+        self.assertEqual(run.main(["--filter", "no such case"]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -37,8 +37,8 @@ class TestBernoulli(unittest.TestCase):
     def test_to_discrete_rv(self):
         p = Bernoulli(0.7)
         rv = p.to_discrete_random_variable()
-        self.assertEqual(rv.x, [0, 1])
-        self.assertEqual(rv.px, [0.30000000000000004, 0.7])
+        self.assertEqual(rv.x.tolist(), [0, 1])
+        self.assertEqual(rv.px.tolist(), [0.30000000000000004, 0.7])
 
 
 if __name__ == '__main__':
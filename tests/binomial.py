@@ -1,3 +1,4 @@
+import fractions
 import math
 import sys
 import unittest
@@ -25,6 +26,35 @@ class TestBinomial(unittest.TestCase):
         self.assertEqual(p.cdf(5), 0.623046875)
         self.assertEqual(p.cdf(10), 1)
 
+    def test_cdf_closed_form(self):
+        p = Binomial(300, 0.3)
+
+        for x in (50, 90, 120, 299):
+            expected = sum(
+                math.comb(300, i) * fractions.Fraction(3, 10) ** i * fractions.Fraction(7, 10) ** (300 - i)
+                for i in range(x + 1)
+            )
+            self.assertAlmostEqual(p.cdf(x) / float(expected), 1, places=12)
+
+        self.assertEqual(p.cdf(300), 1)
+        self.assertAlmostEqual(Binomial(10 ** 7, 0.5).cdf(5 * 10 ** 6), 0.5001261566229471, places=12)
+
+    def test_pmf_range_recurrence(self):
+        p = Binomial(5000, 0.3)
+        table = p.pmf_range(range(0, 5001))
+
+        self.assertEqual(len(table), 5001)
+        self.assertAlmostEqual(sum(table), 1, places=12)
+
+        for x in (1000, 1200, 1500, 1800):
+            self.assertAlmostEqual(table[x] / p.pmf(x), 1, places=10)
+
+        self.assertEqual(table[5000], 0)
+
+        rv = p.to_discrete_random_variable()
+        self.assertEqual(rv.x[-1], 5000)
+        self.assertAlmostEqual(rv.pmf(1500) / p.pmf(1500), 1, places=10)
+
     def test_properties(self):
         p = Binomial(10, 0.5)
 
@@ -36,9 +66,9 @@ class TestBinomial(unittest.TestCase):
     def test_to_discrete_rv(self):
         p = Binomial(10, 0.5)
         rv = p.to_discrete_random_variable()
-        self.assertEqual(rv.x, [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+        self.assertEqual(rv.x.tolist(), [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
         self.assertEqual(
-            rv.px, [
+            rv.px.tolist(), [
                 0.0009765625, 0.009765625, 0.0439453125, 0.1171875, 0.205078125, 0.24609375, 0.205078125,
                 0.1171875, 0.0439453125, 0.009765625, 0.0009765625
             ]
@@ -1,6 +1,11 @@
+import array
+import os
 import sys
+import tempfile
 import unittest
 
+import numpy as np
+
 sys.path.append('..')
 
 from ProbDistro import *
@@ -59,6 +64,149 @@ class TestRandomVariable(unittest.TestCase):
 
         self.assertEqual(a.cdf(5), 1)
 
+    def test_sorted_support(self):
+        a = DiscreteRandomVariable([3, 1, 2, 1], [0.25, 0.25, 0.25, 0.25])
+
+        self.assertEqual(a.x.tolist(), [1, 2, 3])
+        self.assertEqual(a.px.tolist(), [0.5, 0.25, 0.25])
+        self.assertEqual(a.cdf(2.5), 0.75)
+        self.assertEqual(a.less_than(3), 0.75)
+        self.assertEqual(a.less_than(1), 0)
+        self.assertRaises(ValueError, lambda: a.less_than(1.5))
+
+    def test_large_support(self):
+        n = 100000
+        a = DiscreteRandomVariable(list(range(n)), [1 / n] * n)
+
+        self.assertEqual(a.pmf(n - 1), 1 / n)
+        self.assertAlmostEqual(a.cdf(n / 2), (n / 2 + 1) / n)
+        self.assertAlmostEqual(a.less_than(n - 1), (n - 1) / n)
+        self.assertFalse(a._is_supported(n))
+
+    def test_from_arrays(self):
+        x = np.arange(4)
+        px = np.array([0.5, 0.25, 0.125, 0.125])
+        a = DiscreteRandomVariable.from_arrays(x, px)
+
+        self.assertTrue(np.shares_memory(a.x, x))
+        self.assertTrue(np.shares_memory(a.px, px))
+        self.assertEqual(a.cdf(1), 0.75)
+
+        px = array.array("d", [2, 1, 1])
+        a = DiscreteRandomVariable.from_arrays(array.array("q", [1, 2, 3]), px, normalize=True)
+
+        self.assertEqual(px.tolist(), [0.5, 0.25, 0.25])
+        self.assertEqual(a.cdf(2), 0.75)
+
+        self.assertRaises(ValueError, lambda: DiscreteRandomVariable.from_arrays(x, np.ones(4)))
+
+    def test_normalize(self):
+        a = DiscreteRandomVariable.correct_probabilities([1, 2, 3], [0.5, 0.25, 0.25])
+        a.px *= 2
+
+        a.normalize()
+        self.assertEqual(a.px.tolist(), [0.5, 0.25, 0.25])
+        self.assertEqual(a.cdf(2), 0.75)
+
+    def test_replaced_px(self):
+        # the running totals follow px when it is replaced outright, as everything else derived from it does
+        a = DiscreteRandomVariable([0, 1, 2], [0.2, 0.3, 0.5])
+        a.cdf(0)
+        a.px = np.array([0.5, 0.25, 0.25])
+
+        self.assertEqual(a.cdf(0), a.pmf(0))
+        self.assertEqual(a.cdf(np.array([0, 1])).tolist(), [0.5, 0.75])
+        self.assertEqual(a.less_than(2), 0.75)
+        self.assertEqual(a.ppf(0.6), 1)
+        self.assertEqual(a.sf(1), 0.25)
+
+    def test_from_samples(self):
+        a = DiscreteRandomVariable.from_samples([3, 1, 1, 2, 3, 3])
+        self.assertEqual(a.x.tolist(), [1, 2, 3])
+        self.assertEqual(a.px.tolist(), [2 / 6, 1 / 6, 3 / 6])
+
+        # widely spread integers are counted with unique rather than bincount
+        x = np.random.default_rng(0).integers(-10 ** 12, 10 ** 12, 1000)
+        x = np.concatenate((x, x[:10]))
+        a = DiscreteRandomVariable.from_samples(iter([x[:300], x[300:]]))
+        values, counts = np.unique(x, return_counts=True)
+
+        self.assertTrue(np.array_equal(a.x, values))
+        self.assertTrue(np.array_equal(a.px, counts / len(x)))
+
+        a = DiscreteRandomVariable.from_samples(i / 2 for i in range(4))
+        self.assertEqual(a.x.tolist(), [0, 0.5, 1, 1.5])
+
+        # narrow integer samples give a 64 bit support, which arithmetic on the result cannot overflow
+        a = DiscreteRandomVariable.from_samples(np.array([-128, 127, 127, 0], dtype=np.int8))
+        self.assertEqual(a.x.tolist(), [-128, 0, 127])
+        self.assertEqual(a.x.dtype, np.int64)
+
+        a = DiscreteRandomVariable.from_samples(np.array([200, 250], dtype=np.uint8))
+        self.assertEqual((a + a).x.tolist(), [400, 450, 500])
+        self.assertEqual(DiscreteRandomVariable.from_samples(np.array([0.5], dtype=np.float32)).x.dtype, np.float64)
+
+        self.assertRaises(ValueError, lambda: DiscreteRandomVariable.from_samples([]))
+
+    def test_from_file(self):
+        x = np.random.default_rng(1).poisson(20, 10 ** 5)
+        expected = DiscreteRandomVariable.from_samples(x)
+
+        with tempfile.TemporaryDirectory() as directory:
+            text, raw, npy = (os.path.join(directory, name) for name in ("x.txt", "x.bin", "x.npy"))
+
+            np.savetxt(text, x.reshape(-1, 10), fmt="%d")
+            x.astype(np.int32).tofile(raw)
+            np.save(npy, x)
+
+            for a in (
+                DiscreteRandomVariable.from_file(text),
+                DiscreteRandomVariable.from_file(raw, dtype=np.int32, binary=True),
+                DiscreteRandomVariable.from_file(npy)
+            ):
+                self.assertTrue(np.array_equal(a.x, expected.x))
+                self.assertTrue(np.array_equal(a.px, expected.px))
+
+            with open(text, "w") as file:
+                file.write("1.5 2\n3\t1.5")
+
+            self.assertEqual(DiscreteRandomVariable.from_file(text).px.tolist(), [0.5, 0.25, 0.25])
+            self.assertRaises(ValueError, lambda: DiscreteRandomVariable.from_file(raw, binary=True))
+
+    def test_save(self):
+        rv = Poisson(30).to_discrete_random_variable(tail_tolerance=1e-12)
+        fractional = DiscreteRandomVariable([0.5, 1.5, 4], [0.25, 0.25, 0.5])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rv.pdrv")
+
+            for cumulative in (True, False):
+                rv.save(path, cumulative)
+                loaded = DiscreteRandomVariable.load(path)
+
+                self.assertTrue(np.array_equal(loaded.x, rv.x))
+                self.assertTrue(np.array_equal(loaded.px, rv.px))
+                self.assertEqual(loaded.cdf(31), rv.cdf(31))
+                self.assertEqual(loaded.ppf(0.9), rv.ppf(0.9))
+
+            # edits to a loaded random variable stay in memory, rather than being written back to the file
+            loaded.px *= 2
+            loaded.normalize()
+            self.assertTrue(np.array_equal(DiscreteRandomVariable.load(path).px, rv.px))
+
+            fractional.save(path)
+            self.assertEqual(DiscreteRandomVariable.load(path).x.tolist(), [0.5, 1.5, 4])
+
+            with open(path, "rb") as file:
+                saved = file.read()
+
+            # foreign, empty and truncated files are all refused with the same error
+            for contents in (b"not a random variable" * 4, b"PDRV", b"", saved[:-8]):
+                with open(path, "wb") as file:
+                    file.write(contents)
+
+                self.assertRaises(ValueError, lambda: DiscreteRandomVariable.load(path))
+
     def test_expected_value(self):
         x = [1, 2, 3, 4]
         px = [0.5, 0.25, 0.125, 0.125]
@@ -74,12 +222,43 @@ class TestRandomVariable(unittest.TestCase):
         p = DiscreteRandomVariable([1, 2], [0.5, 0.5])
         self.assertEqual(round(p.variance(), 4), 0.25)
 
+    def test_moments(self):
+        x = np.random.default_rng(0).poisson(4, 10 ** 5)
+        p = DiscreteRandomVariable.from_samples(x)
+
+        self.assertAlmostEqual(p.moment(2), np.mean(x.astype(float) ** 2), places=8)
+        self.assertAlmostEqual(p.moment(3, central=True), np.mean((x - x.mean()) ** 3), places=8)
+        self.assertAlmostEqual(p.moment(5), np.mean(x.astype(float) ** 5), delta=1e-6)
+        self.assertAlmostEqual(p.variance(), np.var(x), places=10)
+
+        # sample estimates of a Poisson(4) skewness and excess kurtosis
+        self.assertAlmostEqual(p.skewness(), 0.5, delta=0.02)
+        self.assertAlmostEqual(p.kurtosis(), 0.25, delta=0.05)
+
+        # the cached moments are dropped once the probabilities change
+        q = DiscreteRandomVariable([1, 2], [0.5, 0.5])
+        self.assertEqual(q.expected_value(), 1.5)
+
+        q.px[:] = [1, 3]
+        q.normalize()
+        self.assertEqual(q.expected_value(), 1.75)
+
     def test_exponent(self):
         p = DiscreteRandomVariable([1, 2, 3], [0.5, 0.25, 0.25]) ** 2
-        self.assertEqual(p.x, [1, 4, 9])
+        self.assertEqual(p.x.tolist(), [1, 4, 9])
 
         p = DiscreteRandomVariable([1, 2, 3], [0.5, 0.25, 0.25]) ** 3
-        self.assertEqual(p.x, [1, 8, 27])
+        self.assertEqual(p.x.tolist(), [1, 8, 27])
+
+        self.assertEqual(p.x.dtype, np.int64)
+
+    def test_overflow(self):
+        # results beyond the range of int64 are computed in floating point, rather than wrapping around
+        p = DiscreteRandomVariable([100000, 200000], [0.5, 0.5])
+
+        self.assertEqual((p ** 4).x.tolist(), [1e20, 1.6e21])
+        self.assertEqual((p * p * p * p).x.tolist(), [1e20, 2e20, 4e20, 8e20, 1.6e21])
+        self.assertEqual((p * p).x.dtype, np.int64)
 
     def test_to_discrete_rv(self):
         p = DiscreteRandomVariable(
@@ -88,10 +267,15 @@ class TestRandomVariable(unittest.TestCase):
         )
         rv = p.to_discrete_random_variable(1, 3)
 
-        self.assertEqual(rv.x, [1, 2, 3])
+        self.assertEqual(rv.x.tolist(), [1, 2, 3])
         self.assertEqual(
-            rv.px, [0.5714285714285714, 0.2857142857142857, 0.14285714285714285]
+            rv.px.tolist(), [0.5714285714285714, 0.2857142857142857, 0.14285714285714285]
         )
+        self.assertAlmostEqual(rv.normalization_error, 0.125)
+        self.assertEqual(p.normalization_error, 0)
+
+        rv = p.to_discrete_random_variable(tail_tolerance=0.2)
+        self.assertEqual(rv.x.tolist(), [1, 2, 3])
 
 
 if __name__ == '__main__':
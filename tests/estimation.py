@@ -0,0 +1,77 @@
+import pickle
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append('..')
+
+from ProbDistro import *
+
+
+class TestEstimation(unittest.TestCase):
+    def test_fit(self):
+        self.assertEqual(Poisson.fit([1, 2, 3, 6]), Poisson(3))
+        self.assertEqual(Bernoulli.fit([0, 1, 1, 1]), Bernoulli(0.75))
+        self.assertEqual(Exponential.fit([0.5, 1.5]), Exponential(1))
+        self.assertEqual(Geometric.fit([1, 3, 2, 2]), Geometric(0.5))
+        self.assertEqual(Geometric.fit([0, 2, 1, 1], include_success_trial=False), Geometric(0.5, False))
+
+        normal = Normal.fit([2, 4, 4, 4, 5, 5, 7, 9])
+        self.assertEqual((normal.expected_value(), normal.variance()), (5, 4))
+
+    def test_stable(self):
+        # a large offset would swamp a naive sum of squares
+        x = np.random.default_rng(0).normal(1e9, 3, 10 ** 5)
+        normal = Normal.fit(x)
+
+        self.assertAlmostEqual(normal.expected_value(), np.mean(x), delta=1e-6)
+        self.assertAlmostEqual(normal.variance(), np.var(x), delta=1e-6)
+
+    def test_streaming(self):
+        x = np.random.default_rng(1).poisson(4.5, 10 ** 5)
+
+        def chunks():
+            for i in range(0, len(x), 1000):
+                yield x[i:i + 1000]
+
+        expected = Poisson.fit(x).rate
+
+        self.assertAlmostEqual(Poisson.fit(chunks()).rate, expected, places=12)
+        self.assertAlmostEqual(Poisson.fit(int(i) for i in x).rate, expected, places=12)
+
+        estimator = None
+        for chunk in chunks():
+            estimator = Poisson.partial_fit(chunk, estimator)
+
+        self.assertEqual(estimator.count, len(x))
+        self.assertAlmostEqual(estimator.result().rate, expected, places=12)
+
+    def test_merge(self):
+        x = np.random.default_rng(2).normal(3, 2, 10 ** 4)
+        shards = [Normal.partial_fit(x[i::4]) for i in range(4)]
+
+        # estimators travel between processes by pickling
+        shards = [pickle.loads(pickle.dumps(shard)) for shard in shards]
+        merged = shards[0] + shards[1] + shards[2] + shards[3]
+
+        self.assertEqual(merged.count, len(x))
+        self.assertAlmostEqual(merged.result().expected_value(), np.mean(x), places=12)
+        self.assertAlmostEqual(merged.result().variance(), np.var(x), places=10)
+
+        self.assertRaises(ValueError, lambda: Normal.partial_fit([1]) + Exponential.partial_fit([1]))
+        self.assertRaises(
+            ValueError, lambda: Geometric.partial_fit([1]) + Geometric.partial_fit([1], include_success_trial=False)
+        )
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, lambda: Poisson.fit([1, 2.5]))
+        self.assertRaises(ValueError, lambda: Bernoulli.fit([0, 2]))
+        self.assertRaises(ValueError, lambda: Geometric.fit([0, 1]))
+        self.assertRaises(ValueError, lambda: Exponential.fit([-1]))
+        self.assertRaises(ValueError, lambda: Normal.fit([]))
+        self.assertRaises(NotImplementedError, lambda: Binomial.fit([1, 2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
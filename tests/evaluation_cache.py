@@ -0,0 +1,134 @@
+import copy
+import pickle
+import sys
+import unittest
+
+sys.path.append('..')
+
+from ProbDistro import *
+import ProbDistro.cache as cache
+
+
+class TestImmutable(unittest.TestCase):
+    def test_frozen(self):
+        b = Binomial(10, 0.5)
+
+        self.assertRaises(AttributeError, lambda: setattr(b, "n", 20))
+        self.assertRaises(AttributeError, lambda: setattr(b, "x", 20))
+        self.assertRaises(AttributeError, lambda: delattr(b, "p"))
+        self.assertFalse(hasattr(b, "__dict__"))
+
+        self.assertEqual(b.n, 10)
+        self.assertEqual(repr(b), "<BinomialDistribution n=10 p=0.5 q=0.5>")
+
+    def test_value_equality(self):
+        self.assertEqual(Binomial(10, 0.5), Binomial(10, 0.5))
+        self.assertEqual(hash(Binomial(10, 0.5)), hash(Binomial(10, 0.5)))
+        self.assertNotEqual(Binomial(10, 0.5), Binomial(10, 0.4))
+        self.assertNotEqual(Poisson(3), Exponential(3))
+        self.assertNotEqual(Geometric(0.5), Geometric(0.5, include_success_trial=False))
+
+        self.assertEqual(len({Normal(0, 1), Normal(0, 1), Normal(1, 1)}), 2)
+
+    def test_copy(self):
+        for distribution in (Binomial(10, 0.5), Hypergeometric(20, 7, 12), Uniform(4, 1)):
+            for restored in (pickle.loads(pickle.dumps(distribution)), copy.deepcopy(distribution)):
+                self.assertEqual(restored, distribution)
+                self.assertRaises(AttributeError, lambda: setattr(restored, distribution._fields[0], 1))
+                self.assertRaises(AttributeError, lambda: delattr(restored, distribution._fields[0]))
+
+    def test_subclass_without_slots(self):
+        class Shifted(Poisson):
+            def __init__(self, rate, shift):
+                super().__init__(rate)
+                self.shift = shift
+
+            def pmf(self, x):
+                return super().pmf(x - self.shift)
+
+        # parameters kept in the instance __dict__ count towards equality, hashing and the repr as well
+        self.assertEqual(Shifted(2, 1), Shifted(2, 1))
+        self.assertNotEqual(Shifted(2, 1), Shifted(2, 3))
+        self.assertNotEqual(hash(Shifted(2, 1)), hash(Shifted(2, 3)))
+        self.assertEqual(repr(Shifted(2, 1)), "<ShiftedDistribution rate=2 shift=1>")
+        self.assertEqual(copy.deepcopy(Shifted(2, 1)), Shifted(2, 1))
+        self.assertRaises(AttributeError, lambda: setattr(Shifted(2, 1), "shift", 3))
+
+        with cache.caching():
+            self.assertEqual(Shifted(2, 1).pmf(1), Poisson(2).pmf(0))
+            self.assertEqual(Shifted(2, 3).pmf(3), Poisson(2).pmf(0))
+            self.assertEqual(Shifted(2, 3).pmf(1), 0)
+
+    def test_random_variable_mutable(self):
+        rv = DiscreteRandomVariable([1, 2, 3], [0.2, 0.3, 0.5])
+        rv.px = rv.px[::-1].copy()
+
+        self.assertNotEqual(rv, DiscreteRandomVariable([1, 2, 3], [0.5, 0.3, 0.2]))
+        self.assertRaises(TypeError, lambda: hash(rv))
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(cache.active())
+        self.assertIsNone(cache.info())
+
+    def test_hits_and_misses(self):
+        with cache.caching() as evaluations:
+            for _ in range(3):
+                Poisson(2.5).pmf(3)
+                Poisson(2.5).expected_value()
+
+            info = evaluations.info()
+            self.assertEqual((info.hits, info.misses, info.size), (4, 2, 2))
+
+            # the result is the same, whether or not it came from the cache
+            self.assertEqual(Poisson(2.5).pmf(3), 0.21376301724973645)
+
+        self.assertIsNone(cache.active())
+
+    def test_nested_evaluations(self):
+        with cache.caching() as evaluations:
+            Binomial(10, 0.5).cdf(4)
+            self.assertEqual(evaluations.misses, 6)
+
+            Binomial(10, 0.5).pmf(2)
+            self.assertEqual(evaluations.hits, 1)
+
+    def test_eviction(self):
+        with cache.caching(maxsize=2, policy="lru") as evaluations:
+            p = Poisson(1)
+            p.pmf(1), p.pmf(2), p.pmf(1), p.pmf(3)
+
+            # 2 was the least recently used, so it was evicted rather than 1
+            p.pmf(1)
+            self.assertEqual((evaluations.hits, evaluations.evictions), (2, 1))
+
+        with cache.caching(maxsize=2, policy="fifo") as evaluations:
+            p = Poisson(1)
+            p.pmf(1), p.pmf(2), p.pmf(1), p.pmf(3)
+
+            # 1 was added first, so it was evicted even though it was just used
+            p.pmf(1)
+            self.assertEqual((evaluations.hits, evaluations.evictions), (1, 2))
+
+    def test_uncacheable(self):
+        with cache.caching() as evaluations:
+            rv = DiscreteRandomVariable([1, 2, 3], [0.2, 0.3, 0.5])
+            rv.pmf(1), rv.pmf(1)
+
+            self.assertEqual(len(evaluations), 0)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, lambda: cache.EvaluationCache(0))
+        self.assertRaises(ValueError, lambda: cache.EvaluationCache(policy="random"))
+
+    def test_clear(self):
+        with cache.caching() as evaluations:
+            Poisson(1).pmf(1)
+            cache.clear()
+
+            self.assertEqual(evaluations.info(), cache.CacheInfo(0, 0, 0, 0, 4096, "lru"))
+
+
+if __name__ == '__main__':
+    unittest.main()
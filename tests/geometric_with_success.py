@@ -41,12 +41,20 @@ class TestGeometricWithSuccess(unittest.TestCase):
 
         rv = p.to_discrete_random_variable(stop=5)
 
-        self.assertEqual(rv.x, [1, 2, 3, 4, 5])
+        self.assertEqual(rv.x.tolist(), [1, 2, 3, 4, 5])
         self.assertEqual(
-            rv.px,
+            rv.px.tolist(),
             [0.750733137829912, 0.187683284457478, 0.0469208211143695, 0.011730205278592375, 0.002932551319648094]
         )
 
+        rv = p.to_discrete_random_variable(tail_tolerance=1e-9)
+        self.assertEqual(rv.x.tolist(), list(range(1, 16)))
+        self.assertAlmostEqual(rv.normalization_error, p.sf(15), delta=1e-15)
+
+        # the grid is built from whole multiples of the step, so no point drifts off the lattice
+        rv = p.to_discrete_random_variable(1, 301, 3)
+        self.assertEqual(rv.x.tolist(), list(range(1, 302, 3)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -42,9 +42,9 @@ class TestGeometricWithSuccess(unittest.TestCase):
 
         rv = p.to_discrete_random_variable(stop=4)
 
-        self.assertEqual(rv.x, [0, 1, 2, 3, 4])
+        self.assertEqual(rv.x.tolist(), [0, 1, 2, 3, 4])
         self.assertEqual(
-            rv.px,
+            rv.px.tolist(),
             [0.750733137829912, 0.187683284457478, 0.0469208211143695, 0.011730205278592375, 0.002932551319648094]
         )
 
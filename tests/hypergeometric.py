@@ -1,3 +1,6 @@
+import fractions
+import math
+import pickle
 import sys
 import unittest
 
@@ -31,6 +34,32 @@ class TestHypergeometric(unittest.TestCase):
 
         self.assertEqual(p.cdf(4), 1)
 
+    def test_cdf_large(self):
+        p = Hypergeometric(500, 200, 100)
+
+        for k in (10, 40, 60):
+            expected = sum(
+                fractions.Fraction(math.comb(200, i) * math.comb(300, 100 - i), math.comb(500, 100))
+                for i in range(k + 1)
+            )
+            self.assertAlmostEqual(p.cdf(k) / float(expected), 1, places=10)
+
+        self.assertEqual(p.cdf(100), 1)
+
+    def test_cached_constants(self):
+        small = Hypergeometric(10, 5, 3)
+        large = Hypergeometric(100000, 30000, 2000)
+
+        # the constant denominators are filled in on first use, then reused (and carried over by pickling)
+        first = (small.pmf(1), large.pmf(600))
+        self.assertEqual(small._denominator, math.comb(10, 3))
+
+        restored = pickle.loads(pickle.dumps(large))
+        self.assertEqual(restored._log_denominator, large._log_denominator)
+        self.assertEqual((small.pmf(1), restored.pmf(600)), first)
+
+        self.assertFalse(hasattr(pickle.loads(pickle.dumps(Hypergeometric(10, 5, 3))), "_denominator"))
+
     def test_properties(self):
         p = Hypergeometric(10, 5, 3)
 
@@ -42,11 +71,21 @@ class TestHypergeometric(unittest.TestCase):
     def test_to_discrete_rv(self):
         p = Hypergeometric(10, 5, 3)
         rv = p.to_discrete_random_variable()
-        self.assertEqual(rv.x, [0, 1, 2, 3])
+        self.assertEqual(rv.x.tolist(), [0, 1, 2, 3])
         self.assertEqual(
-            rv.px, [0.08333333333333333, 0.4166666666666667, 0.4166666666666667, 0.08333333333333333]
+            rv.px.tolist(), [0.08333333333333333, 0.4166666666666667, 0.4166666666666667, 0.08333333333333333]
         )
 
+    def test_tail_tolerance(self):
+        # both tails are cut where the mass beyond them drops to the tolerance, far below where 1 - cdf rounds to 0
+        p = Hypergeometric(1000, 500, 500)
+        rv = p.to_discrete_random_variable(tail_tolerance=1e-20)
+
+        self.assertEqual((rv.x[0], rv.x[-1]), (177, 323))
+        self.assertLessEqual(p.sf(rv.x[-1]), 1e-20)
+        self.assertGreater(p.sf(rv.x[-2]), 1e-20)
+        self.assertLess(p.cdf(rv.x[0] - 1), 1e-20)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import unittest
+
+sys.path.append('..')
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# generous enough for a slow CI machine, while still far below the cost of importing NumPy
+IMPORT_BUDGET = 0.05
+
+
+def run(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+class TestImportTime(unittest.TestCase):
+    def test_import_is_lazy(self):
+        loaded = run(
+            "import sys\n"
+            "import ProbDistro\n"
+            "print(sorted(m for m in sys.modules if m == 'numpy' or m.startswith('ProbDistro')))"
+        )
+
+        self.assertEqual(loaded, "['ProbDistro']")
+
+    def test_import_budget(self):
+        elapsed = run(
+            "import time\n"
+            "start = time.perf_counter()\n"
+            "import ProbDistro\n"
+            "print(time.perf_counter() - start)"
+        )
+
+        self.assertLess(float(elapsed), IMPORT_BUDGET)
+
+    def test_attributes_load_on_access(self):
+        loaded = run(
+            "import sys\n"
+            "import ProbDistro\n"
+            "print(ProbDistro.Gauss(0, 1), ProbDistro.conversions.__name__, ProbDistro.Pois is ProbDistro.Poisson)\n"
+            "print('ProbDistro.discrete_distributions.binomial' in sys.modules)"
+        )
+
+        self.assertEqual(loaded, "<NormalDistribution mu=0 sigma=1> ProbDistro.conversion True\nTrue")
+
+    def test_star_import(self):
+        import ProbDistro
+
+        namespace = {}
+        exec("from ProbDistro import *", namespace)
+
+        for name in ProbDistro.__all__:
+            self.assertIs(namespace[name], getattr(ProbDistro, name))
+
+        self.assertRaises(AttributeError, lambda: ProbDistro.Gamma)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import sys
+import unittest
+
+sys.path.append('..')
+
+from ProbDistro import *
+import ProbDistro.instrumentation as instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(instrumentation.active())
+        self.assertIsNone(instrumentation.report())
+
+    def test_call_counts(self):
+        with instrumentation.instrumenting() as recorded:
+            b = Binomial(10, 0.5)
+            b.cdf(4)
+            b.less_than(3)
+
+            report = recorded.report()
+
+        self.assertEqual(report["Binomial"]["cdf"]["calls"], 2)
+        self.assertEqual(report["Binomial"]["less_than"]["calls"], 1)
+        # once by less_than itself, and again by the equals it calls
+        self.assertEqual(report["Binomial"]["_check_supported"]["calls"], 2)
+        self.assertGreater(report["Binomial"]["cdf"]["seconds"], 0)
+
+        # the report is plain data, ready to be serialized
+        self.assertEqual(json.loads(json.dumps(report)), report)
+
+    def test_pmf_evaluations(self):
+        with instrumentation.instrumenting() as recorded:
+            Binomial(10, 0.5).cdf(4)
+            Poisson(3).pmf_range(range(100))
+
+            report = recorded.report()
+
+        # the cdf sums the pmf at 0, 1, ..., 4
+        self.assertEqual(report["Binomial"]["cdf"]["pmf_evaluations"], 5)
+        self.assertEqual(report["Binomial"]["pmf"]["calls"], 5)
+        self.assertEqual(report["Poisson"]["pmf_range"]["pmf_evaluations"], 100)
+
+    def test_inherited_methods(self):
+        with instrumentation.instrumenting() as recorded:
+            DiscreteRandomVariable([1, 2, 3], [0.2, 0.3, 0.5]).variance()
+            Geometric(0.5).mean()
+
+            report = recorded.report()
+
+        # the variance comes from the moments, without building the distribution of X ** 2
+        self.assertEqual(report["DiscreteRandomVariable"]["_moments"]["calls"], 1)
+        self.assertNotIn("__pow__", report["DiscreteRandomVariable"])
+        self.assertEqual(report["Geometric"]["mean"]["calls"], 1)
+
+    def test_detached_when_disabled(self):
+        cdf = vars(Binomial)["cdf"]
+
+        with instrumentation.instrumenting():
+            self.assertIsNot(vars(Binomial)["cdf"], cdf)
+
+        self.assertIs(vars(Binomial)["cdf"], cdf)
+
+    def test_new_subclasses(self):
+        with instrumentation.instrumenting() as recorded:
+            class Shifted(Poisson):
+                __slots__ = ()
+
+                def pmf(self, x: float) -> float:
+                    return super().pmf(x - 1)
+
+            Shifted(2).pmf(3)
+
+            self.assertEqual(recorded.calls("Shifted", "pmf"), 1)
+
+        self.assertFalse(hasattr(Shifted.pmf, "__wrapped__"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append('..')
+
+from ProbDistro import *
+
+
+class TestJointDistribution(unittest.TestCase):
+    def setUp(self):
+        self.a = DiscreteRandomVariable([1, 2, 3, 4], [0.05, 0.125, 0.525, 0.3])
+        self.b = DiscreteRandomVariable([2, 4, 6], [0.3, 0.6, 0.1])
+
+    def test_from_independent(self):
+        joint = JointDistribution.from_independent(self.a, self.b, names=("A", "B"))
+
+        self.assertTrue(np.allclose(joint.table.T, self.a.jointly_distributed_table(self.b)))
+        self.assertTrue(np.allclose(joint.marginal("A").px, self.a.px))
+        self.assertTrue(np.allclose(joint.marginal(1).px, self.b.px))
+        self.assertTrue(np.allclose(joint.conditional("A", 3).px, self.b.px))
+
+        self.assertAlmostEqual(joint.covariance(), 0, delta=1e-15)
+        self.assertAlmostEqual(
+            joint.expected_value(lambda x, y: x * y), self.a.expected_value() * self.b.expected_value()
+        )
+
+        self.assertRaises(ValueError, lambda: joint.marginal("C"))
+        self.assertRaises(ValueError, lambda: joint.conditional("A", 5))
+
+    def test_table(self):
+        # the axes are sorted along with the table
+        joint = JointDistribution([2, 1], [0, 1], [[0.1, 0.2], [0.3, 0.4]])
+
+        self.assertEqual(joint.x.tolist(), [1, 2])
+        self.assertEqual(joint.table.tolist(), [[0.3, 0.4], [0.1, 0.2]])
+        self.assertTrue(np.allclose(joint.conditional(1, 0).px, [0.75, 0.25]))
+
+        self.assertRaises(ValueError, lambda: JointDistribution([1, 2], [0, 1], [[0.1, 0.2], [0.3, 0.3]]))
+        self.assertRaises(ValueError, lambda: JointDistribution([1, 1], [0, 1], [[0.1, 0.2], [0.3, 0.4]]))
+        self.assertRaises(ValueError, lambda: JointDistribution([1, 2], [0], [[0.1, 0.2], [0.3, 0.4]]))
+
+    def test_from_pairs(self):
+        rng = np.random.default_rng(0)
+        x = rng.integers(0, 1000, 5000)
+        y = x + rng.integers(0, 1000, 5000)
+
+        sparse = JointDistribution.from_pairs(x, y)
+        dense = JointDistribution.from_pairs(x, y, sparse=False)
+
+        self.assertTrue(sparse.sparse)
+        self.assertFalse(dense.sparse)
+        self.assertTrue(np.array_equal(sparse.table, dense.table))
+
+        self.assertAlmostEqual(sparse.correlation(), np.corrcoef(x, y)[0, 1], places=12)
+        self.assertAlmostEqual(dense.correlation(), np.corrcoef(x, y)[0, 1], places=12)
+        self.assertAlmostEqual(sparse.covariance(), np.cov(x, y, bias=True)[0, 1], places=6)
+
+        for joint in (sparse, dense):
+            self.assertTrue(np.allclose(joint.marginal(0).px, DiscreteRandomVariable.from_samples(x).px))
+
+            given = joint.conditional(0, x[0])
+            self.assertTrue(np.array_equal(given.x[given.px > 0], np.unique(y[x == x[0]])))
+
+        self.assertTrue(np.array_equal(dense.to_sparse().table, dense.table))
+
+
+if __name__ == '__main__':
+    unittest.main()
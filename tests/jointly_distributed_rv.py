@@ -1,6 +1,8 @@
 import sys
 import unittest
 
+import numpy as np
+
 sys.path.append('..')
 
 from ProbDistro import *
@@ -44,20 +46,72 @@ class TestJointlyDistributedRV(unittest.TestCase):
 
         ab = a * b
 
-        self.assertEqual(ab.x, [2, 4, 6, 8, 12, 16, 18, 24])
-        self.assertEqual(ab.px, [0.015, 0.0675, 0.1625, 0.16499999999999998, 0.3275, 0.18, 0.052500000000000005, 0.03])
+        self.assertEqual(ab.x.tolist(), [2, 4, 6, 8, 12, 16, 18, 24])
+        self.assertEqual(ab.px.tolist(), [0.015, 0.0675, 0.1625, 0.16499999999999998, 0.3275, 0.18, 0.052500000000000005, 0.03])
+
+    def test_addition(self):
+        die = DiscreteRandomVariable([1, 2, 3, 4, 5, 6], [1 / 6] * 6)
+        total = die + die
+
+        self.assertEqual(total.x.tolist(), list(range(2, 13)))
+        np.testing.assert_allclose(total.px * 36, [1, 2, 3, 4, 5, 6, 5, 4, 3, 2, 1])
+
+        difference = die - die
+        self.assertEqual(difference.x.tolist(), list(range(-5, 6)))
+        self.assertAlmostEqual(difference.pmf(0), 1 / 6)
+
+        self.assertEqual((die + 0.5).x.tolist(), [1.5, 2.5, 3.5, 4.5, 5.5, 6.5])
+        self.assertEqual((7 - die).x.tolist(), [1, 2, 3, 4, 5, 6])
+
+    def test_addition_non_lattice(self):
+        a = DiscreteRandomVariable([0.5, 1.7], [0.5, 0.5])
+        total = a + a
+
+        np.testing.assert_allclose(total.x, [1, 2.2, 3.4])
+        np.testing.assert_allclose(total.px, [0.25, 0.5, 0.25])
+
+    def test_addition_narrow_support(self):
+        u = DiscreteRandomVariable.from_arrays(np.array([72, 97, 122], dtype=np.uint8), np.ones(3) / 3)
+
+        # the results are worked out in 64 bits, rather than wrapping around in the support's own type
+        self.assertEqual((u + u).x.tolist(), [144, 169, 194, 219, 244])
+        self.assertEqual((u - u).x.tolist(), [-50, -25, 0, 25, 50])
+        self.assertEqual((-u).x.tolist(), [-122, -97, -72])
+        self.assertEqual((u + 200).x.tolist(), [272, 297, 322])
+
+    def test_addition_sparse(self):
+        # a lattice spanning 10^11 points is never allocated, since the supports are merged instead
+        a = DiscreteRandomVariable([0, 1, 10 ** 11], [0.2, 0.3, 0.5])
+
+        self.assertEqual((a + a).x.tolist(), [0, 1, 2, 10 ** 11, 10 ** 11 + 1, 2 * 10 ** 11])
+
+    def test_sum_iid(self):
+        bernoulli = Bernoulli(0.3).to_discrete_random_variable()
+        total = bernoulli.sum_iid(1000)
+
+        # the FFT path drops tail values lost in its rounding noise, but everything else matches the binomial
+        self.assertAlmostEqual(total._total(), 1)
+        np.testing.assert_allclose(
+            total.pmf(np.arange(240, 360)), Binomial(1000, 0.3).pmf(np.arange(240, 360)), rtol=1e-9
+        )
+
+        truncated = bernoulli.sum_iid(1000, tolerance=1e-12)
+        self.assertLess(len(truncated.x), 300)
+        self.assertAlmostEqual(truncated.pmf(300), Binomial(1000, 0.3).pmf(300))
+
+        self.assertEqual(bernoulli.sum_iid(0).x.tolist(), [0])
 
     def test_covariance(self):
         a = DiscreteRandomVariable([1, 2, 3, 4], [0.05, 0.125, 0.525, 0.3])
         b = DiscreteRandomVariable([2, 4, 6], [0.3, 0.6, 0.1])
 
-        self.assertEqual(a.covariance(b), 1.7763568394002505e-15)
+        self.assertEqual(a.covariance(b), 0)
 
     def test_correlation(self):
         a = DiscreteRandomVariable([1, 2, 3, 4], [0.05, 0.125, 0.525, 0.3])
         b = DiscreteRandomVariable([2, 4, 6], [0.3, 0.6, 0.1])
 
-        self.assertEqual(a.correlation(b), 1.8809278223539317e-15)
+        self.assertEqual(a.correlation(b), 0)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,82 @@
+import sys
+import unittest
+
+sys.path.append('..')
+
+from ProbDistro import *
+import ProbDistro.instrumentation as instrumentation
+
+
+class TestLazyRandomVariable(unittest.TestCase):
+    def setUp(self):
+        self.a = DiscreteRandomVariable([1, 2, 3, 4], [0.05, 0.125, 0.525, 0.3])
+        self.b = DiscreteRandomVariable([2, 4, 6], [0.3, 0.6, 0.1])
+
+    def test_moments(self):
+        a, b = self.a.lazy(), self.b.lazy()
+
+        with instrumentation.instrumenting() as recorded:
+            product = (a * b) ** 2
+            total = a + b - 3 * a + 2
+
+            expected = (product.expected_value(), total.expected_value(), total.variance())
+            report = recorded.report()
+
+        # nothing but the moments of the leaves were needed
+        self.assertNotIn("__mul__", report["DiscreteRandomVariable"])
+        self.assertNotIn("__add__", report["DiscreteRandomVariable"])
+        self.assertIsNone(product._distribution)
+
+        eager = (self.a * self.b) ** 2
+        self.assertAlmostEqual(expected[0], eager.expected_value(), places=12)
+
+        eager = self.a + self.b + -DiscreteRandomVariable.from_arrays(self.a.x * 3, self.a.px.copy()) + 2
+        self.assertAlmostEqual(expected[1], eager.expected_value(), places=12)
+        self.assertAlmostEqual(expected[2], eager.variance(), places=12)
+
+        # powers without a moment rule fall back on the distribution
+        self.assertAlmostEqual((a ** 0.5).expected_value(), (self.a ** 0.5).expected_value(), places=12)
+
+    def test_distribution(self):
+        a, b = self.a.lazy(), self.b.lazy()
+        shared = a * b
+        left, right = shared + 1, shared - b
+
+        self.assertAlmostEqual(left.cdf(9), (self.a * self.b + 1).cdf(9), places=12)
+
+        # the shared node was computed for the first query, and is reused by the second
+        computed = shared._distribution
+        self.assertIsNotNone(computed)
+
+        self.assertAlmostEqual(right.ppf(0.5), (self.a * self.b - self.b).ppf(0.5))
+        self.assertIs(shared._distribution, computed)
+
+        self.assertRaises(TypeError, lambda: a + "1")
+
+    def test_mixed_operands(self):
+        a = self.a.lazy()
+
+        # a random variable on the left leaves a lazy operand to the lazy side, rather than failing or computing it
+        with instrumentation.instrumenting() as recorded:
+            expressions = (self.b * a, self.b + a, self.b - a, a * self.b, a - self.b)
+            report = recorded.report()
+
+        self.assertNotIn("_merge", report["DiscreteRandomVariable"])
+        self.assertNotIn("convolve", report["DiscreteRandomVariable"])
+
+        for expression in expressions:
+            self.assertIsInstance(expression, LazyRandomVariable)
+
+        self.assertAlmostEqual(expressions[0].expected_value(), (self.b * self.a).expected_value(), places=12)
+        self.assertAlmostEqual(expressions[1].variance(), (self.b + self.a).variance(), places=12)
+        self.assertAlmostEqual(expressions[2].expected_value(), (self.b - self.a).expected_value(), places=12)
+
+        # real numbers are still taken directly, and anything else is refused
+        self.assertEqual((self.b * 2).x.tolist(), [4, 8, 12])
+        self.assertEqual((2 * self.b).x.tolist(), [4, 8, 12])
+        self.assertRaises(TypeError, lambda: self.b + "1")
+        self.assertRaises(TypeError, lambda: self.b * [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import math
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append('..')
+
+from ProbDistro import *
+
+
+class TestLogSpace(unittest.TestCase):
+    def test_matches_linear_space(self):
+        distributions = [
+            (Bernoulli(0.3), "pmf", [0, 1]),
+            (Binomial(20, 0.3), "pmf", [0, 3, 6, 20]),
+            (Poisson(4.5), "pmf", [0, 2, 9]),
+            (Geometric(0.2), "pmf", [1, 4, 7]),
+            (Geometric(0.2, include_success_trial=False), "pmf", [0, 4, 7]),
+            (Hypergeometric(40, 12, 9), "pmf", [0, 3, 9]),
+            (Normal(1, 2), "pdf", [-3, 0.5, 4]),
+            (Exponential(1.5), "pdf", [0.1, 0.5, 4]),
+            (Uniform(-1, 3), "pdf", [0, 2.5]),
+        ]
+
+        for distribution, linear, x in distributions:
+            log_method = getattr(distribution, "log" + linear)
+
+            for i in x:
+                self.assertAlmostEqual(log_method(i), math.log(getattr(distribution, linear)(i)), places=10)
+                self.assertAlmostEqual(distribution.logcdf(i), math.log(distribution.cdf(i)), places=10)
+                self.assertAlmostEqual(distribution.sf(i), 1 - distribution.cdf(i), places=12)
+
+            np.testing.assert_allclose(log_method(np.array(x)), [log_method(i) for i in x], rtol=1e-12)
+            np.testing.assert_allclose(distribution.logsf(np.array(x)), [distribution.logsf(i) for i in x])
+
+    def test_large_parameters(self):
+        p = Binomial(10 ** 6, 0.3)
+
+        self.assertAlmostEqual(p.logpmf(300000), -7.046370251546536, places=10)
+        self.assertTrue(math.isfinite(p.logpmf(10)))
+        self.assertGreater(p.pmf(300000), 0)
+
+        p = Poisson(1000)
+
+        self.assertAlmostEqual(p.logpmf(1000), -4.372899506026442, places=10)
+        self.assertAlmostEqual(p.logpmf(5000), -4052.3671139660873, places=8)
+        self.assertEqual(p.pmf(5000), 0)
+
+    def test_outside_support(self):
+        self.assertEqual(Binomial(10, 0.5).logpmf(11), -math.inf)
+        self.assertEqual(Poisson(2).logpmf(-1), -math.inf)
+        self.assertEqual(Exponential(2).logcdf(0), -math.inf)
+
+    def test_tails(self):
+        self.assertAlmostEqual(Normal(0, 1).logcdf(-40), -804.6084420137538, places=8)
+        self.assertAlmostEqual(Normal(0, 1).logsf(40), -804.6084420137538, places=8)
+        self.assertAlmostEqual(Normal(0, 1).sf(10) / 7.619853024160593e-24, 1, places=12)
+        self.assertAlmostEqual(Exponential(2).logsf(1000), -2000)
+        self.assertAlmostEqual(Poisson(1000).sf(1200) / 3.8849395709879237e-10, 1, places=12)
+
+        # 1 - p rounds to 1 here, so the lower tail is only kept through log1p and expm1
+        geometric = Geometric(1e-20)
+        self.assertEqual(geometric.cdf(1), 1e-20)
+        self.assertAlmostEqual(geometric.logcdf(3), math.log(3e-20), places=12)
+        np.testing.assert_allclose(geometric.cdf(np.array([1, 5])), [1e-20, 5e-20], rtol=1e-12)
+
+    def test_small_tails(self):
+        # small distributions take the upper tail directly as well, rather than cancelling it out of 1 - cdf
+        for distribution, x in (
+                (Binomial(60, 0.1), 50), (Poisson(3), 40), (Binomial(10, 0.5), 9), (Poisson(0.5), 20),
+                (Hypergeometric(1000, 500, 500), 400), (Hypergeometric(60, 20, 20), 18)
+        ):
+            array = distribution.sf(np.array([x]))[0]
+
+            self.assertGreater(distribution.sf(x), 0)
+            self.assertAlmostEqual(distribution.sf(x) / array, 1, places=12)
+            self.assertAlmostEqual(distribution.logsf(x), distribution.logsf(np.array([x]))[0], places=10)
+            self.assertAlmostEqual(distribution.greater_than(x) / array, 1, places=12)
+
+        self.assertAlmostEqual(Binomial(60, 0.1).logsf(50), -94.94396182428007, places=8)
+        self.assertAlmostEqual(Hypergeometric(1000, 500, 500).logsf(400), -198.00161249725808, places=8)
+        self.assertAlmostEqual(Hypergeometric(60, 20, 20).sf(18) / 1.9108533221846733e-13, 1, places=12)
+
+        batch = HypergeometricBatch(np.array([1000, 60]), np.array([500, 20]), np.array([500, 20]))
+        np.testing.assert_allclose(
+            batch.sf(np.array([400, 18])), [1.020921346259054e-86, 1.9108533221846733e-13], rtol=1e-12
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
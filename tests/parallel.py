@@ -0,0 +1,81 @@
+import concurrent.futures
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append('..')
+
+from ProbDistro import *
+import ProbDistro.parallel as parallel
+
+
+class TestParallel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = concurrent.futures.ProcessPoolExecutor(2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+
+    def test_chunk_bounds(self):
+        bounds = parallel.chunk_bounds(10 ** 6, 4, 4096)
+
+        self.assertEqual(bounds[0][0], 0)
+        self.assertEqual(bounds[-1][1], 10 ** 6)
+        self.assertTrue(all(stop == start for (_, stop), (start, _) in zip(bounds, bounds[1:])))
+        self.assertTrue(all(start % 4096 == 0 for start, _ in bounds))
+
+        # small inputs are not worth splitting up
+        self.assertEqual(parallel.chunk_bounds(100, 4), [(0, 100)])
+
+    def test_pmf_range(self):
+        for distribution in (Binomial(10 ** 5, 0.3), Poisson(5 * 10 ** 4), Geometric(1e-5)):
+            x = range(7, 10 ** 5 + 13)
+
+            self.assertEqual(distribution.pmf_range(x, executor=self.pool), distribution.pmf_range(x))
+
+    def test_to_discrete_random_variable(self):
+        h = Hypergeometric(10 ** 6, 3 * 10 ** 5, 10 ** 5)
+
+        serial = h.to_discrete_random_variable()
+        split = h.to_discrete_random_variable(executor=self.pool)
+
+        self.assertTrue(np.array_equal(serial.x, split.x))
+        self.assertTrue(np.array_equal(serial.px, split.px))
+
+    def test_cdf_range(self):
+        x = np.arange(0, 10 ** 5, 2)
+
+        for distribution in (Binomial(10 ** 5, 0.5), Hypergeometric(10 ** 5, 5 * 10 ** 4, 2 * 10 ** 4), Normal(0, 1)):
+            self.assertTrue(np.array_equal(distribution.cdf_range(x, executor=self.pool), distribution.cdf_range(x)))
+
+        self.assertEqual(Poisson(3).cdf_range(range(5), executor=2), Poisson(3).cdf_range(range(5)))
+
+    def test_heterogeneous_chunks(self):
+        # each chunk holds points which converge at different speeds, which must not change any point's value
+        distribution = Poisson(1000.7)
+        x = np.repeat([1011, 1001], 16384)
+
+        self.assertTrue(np.array_equal(parallel.evaluate(distribution, "cdf", x, self.pool), distribution.cdf(x)))
+        self.assertTrue(np.array_equal(distribution.cdf(x[-1:]), distribution.cdf(x)[-1:]))
+
+    def test_batch(self):
+        rng = np.random.default_rng(0)
+        n, p, k = rng.integers(1, 3000, 50000), rng.random(50000), rng.integers(0, 3000, 50000)
+        batch = BinomialBatch(n, p)
+
+        with concurrent.futures.ThreadPoolExecutor(4) as threads:
+            for executor in (self.pool, threads):
+                self.assertTrue(np.array_equal(batch.cdf(k, executor=executor), batch.cdf(k)))
+                self.assertTrue(np.array_equal(batch.ppf(p, executor=executor), batch.ppf(p)))
+
+        # points broadcast ahead of the batch's own axes are split along the batch
+        batch = PoissonBatch(np.arange(1, 40001).reshape(200, 200))
+        x = np.arange(3)[:, None, None]
+        self.assertTrue(np.array_equal(batch.sf(x, executor=self.pool), batch.sf(x)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,4 @@
+import decimal
 import math
 import sys
 import unittest
@@ -27,6 +28,30 @@ class TestPoisson(unittest.TestCase):
         self.assertEqual(p.cdf(5), 0.9998694455370781)
         self.assertEqual(p.cdf(10), 0.9999999994670575)
 
+    def test_cdf_closed_form(self):
+        p = Poisson(250)
+
+        for x in (150, 240, 300):
+            term = decimal.Decimal(-250).exp()
+            expected = term
+
+            for i in range(1, x + 1):
+                term = term * 250 / i
+                expected += term
+
+            self.assertAlmostEqual(p.cdf(x) / float(expected), 1, places=12)
+
+    def test_pmf_range_recurrence(self):
+        p = Poisson(800.5)
+        table = p.pmf_range(range(100, 10000))
+
+        self.assertAlmostEqual(sum(table), 1, places=12)
+
+        for x in (100, 700, 800, 900):
+            self.assertAlmostEqual(table[x - 100] / p.pmf(x), 1, places=10)
+
+        self.assertEqual(table[-1], 0)
+
     def test_properties(self):
         p = Poisson(0.75)
 
@@ -41,13 +66,28 @@ class TestPoisson(unittest.TestCase):
         self.assertRaises(ValueError, lambda: p.to_discrete_random_variable())
 
         rv = p.to_discrete_random_variable(stop=4)
-        self.assertEqual(rv.x, [0, 1, 2, 3, 4])
+        self.assertEqual(rv.x.tolist(), [0, 1, 2, 3, 4])
         self.assertEqual(
-            rv.px, [
+            rv.px.tolist(), [
                 0.47287000692680675, 0.35465250519510505, 0.1329946894481644, 0.0332486723620411, 0.006234126067882706
             ]
         )
 
+    def test_tail_tolerance(self):
+        p = Poisson(3)
+        rv = p.to_discrete_random_variable(tail_tolerance=1e-12)
+
+        self.assertEqual((rv.x[0], rv.x[-1]), (0, p.isf(1e-12)))
+        self.assertLessEqual(p.sf(rv.x[-1]), 1e-12)
+        self.assertGreater(p.sf(rv.x[-2]), 1e-12)
+        self.assertAlmostEqual(rv.normalization_error, p.sf(rv.x[-1]), delta=1e-15)
+
+        # an explicit stop still wins, and the lower tail is only trimmed when asked
+        self.assertEqual(p.to_discrete_random_variable(stop=5, tail_tolerance=1e-12).x.tolist(), list(range(6)))
+        self.assertEqual(Poisson(1000).to_discrete_random_variable(tail_tolerance=1e-9).x[0], Poisson(1000).ppf(1e-9))
+
+        self.assertRaises(ValueError, lambda: p.to_discrete_random_variable(tail_tolerance=0))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,138 @@
+import statistics
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append('..')
+
+from ProbDistro import *
+
+
+class TestQuantiles(unittest.TestCase):
+    def test_continuous(self):
+        q = np.array([0, 1e-12, 0.1, 0.5, 0.9, 1])
+
+        np.testing.assert_allclose(Uniform(1, 5).ppf(q), 1 + 4 * q)
+        np.testing.assert_allclose(Uniform(1, 5).isf(q), 5 - 4 * q)
+
+        np.testing.assert_allclose(Exponential(2).ppf(q[:-1]), -np.log1p(-q[:-1]) / 2)
+        self.assertEqual(Exponential(2).ppf(1), float("inf"))
+        self.assertAlmostEqual(Exponential(2).isf(1e-300), 345.38776394910684)
+
+        normal = statistics.NormalDist(3, 2)
+        np.testing.assert_allclose(Normal(3, 2).ppf(q[1:-1]), [normal.inv_cdf(i) for i in q[1:-1]], rtol=1e-14)
+        np.testing.assert_allclose(Normal(3, 2).isf(q[1:-1]), [6 - normal.inv_cdf(i) for i in q[1:-1]], rtol=1e-14)
+
+        self.assertEqual(Normal(3, 2).ppf(0), -np.inf)
+        self.assertEqual(Normal(3, 2).isf(0), np.inf)
+        self.assertAlmostEqual(Normal(0, 1).isf(1e-300), 37.0470962993612)
+
+    def test_discrete_round_trip(self):
+        distributions = [
+            Bernoulli(0.3),
+            Binomial(20, 0.4),
+            Binomial(100000, 0.3),
+            Poisson(3.5),
+            Poisson(2000),
+            Geometric(0.5),
+            Geometric(0.2, include_success_trial=False),
+            Hypergeometric(60, 25, 15),
+            Hypergeometric(100000, 30000, 2000),
+            DiscreteRandomVariable([1, 2, 5], [0.2, 0.3, 0.5]),
+        ]
+
+        for distribution in distributions:
+            lower = distribution._get_defaults()[0]
+            k = np.arange(lower, lower + 10) + max(int(distribution.expected_value()) - 5 - lower, 0)
+            k = k[distribution._is_supported_array(k)]
+
+            cdf = distribution.cdf(k)
+            sf = distribution.sf(k)
+
+            # away from where the cdf (or sf) rounds to 1, every value maps back to itself
+            np.testing.assert_array_equal(distribution.ppf(cdf[cdf < 1]), k[cdf < 1])
+            np.testing.assert_array_equal(distribution.isf(sf[sf < 1]), k[sf < 1])
+
+            # and anything in between maps to the next value up
+            middle = (cdf[1:] + cdf[:-1]) / 2
+            np.testing.assert_array_equal(distribution.ppf(middle[middle < 1]), k[1:][middle < 1])
+
+    def test_discrete_round_trip_scalar(self):
+        # the scalar cdf of small distributions is an exact sum, which rounds differently from the array cdf
+        distributions = [
+            Poisson(0.2), Poisson(3), Binomial(10, 0.3), Binomial(60, 0.1), Hypergeometric(50, 10, 20),
+            Hypergeometric(30, 10, 12), Geometric(0.3)
+        ]
+
+        for distribution in distributions:
+            lower = distribution._get_defaults()[0]
+
+            for k in range(lower, lower + 30):
+                if not distribution._is_supported(k):
+                    break
+
+                if distribution.cdf(k) < 1:
+                    self.assertEqual(distribution.ppf(distribution.cdf(k)), k)
+
+                if 0 < distribution.sf(k) < 1:
+                    self.assertEqual(distribution.isf(distribution.sf(k)), k)
+
+    def test_discrete_far_upper_tail(self):
+        # isf resolves tiny upper tails from the sf directly, rather than through ppf(1 - q)
+        distributions = [
+            Bernoulli(0.3),
+            Binomial(60, 0.1),
+            Binomial(100000, 0.3),
+            Poisson(3),
+            Poisson(2000),
+            Geometric(0.1),
+            Geometric(1e-3, include_success_trial=False),
+            Hypergeometric(60, 20, 20),
+            Hypergeometric(1000, 500, 500),
+            DiscreteRandomVariable([0, 1, 2, 3], [0.5, 0.5 - 2e-30, 1e-30, 1e-30]),
+        ]
+
+        for distribution in distributions:
+            lower = distribution._get_defaults()[0]
+
+            for q in (1e-15, 1e-20, 1e-40):
+                k = distribution.isf(q)
+
+                self.assertEqual(distribution.isf(np.array([q])).tolist(), [k])
+                self.assertLessEqual(distribution.sf(k), q)
+
+                if k > lower:
+                    self.assertGreater(distribution.sf(k - 1), q)
+
+        self.assertEqual(Hypergeometric(1000, 500, 500).isf(1e-20), 323)
+        self.assertEqual(Hypergeometric(1000, 500, 500).isf(1e-15), 312)
+        self.assertEqual(DiscreteRandomVariable([0, 1, 2, 3], [0.5, 0.5 - 2e-30, 1e-30, 1e-30]).isf(1e-40), 3)
+
+    def test_discrete_bounds(self):
+        self.assertEqual(Binomial(1000, 0.01).ppf(1), 1000)
+        self.assertEqual(Binomial(1000, 0.01).isf(0), 1000)
+        self.assertEqual(Binomial(1000, 0.01).ppf(0), 0)
+        self.assertEqual(Poisson(3).ppf(1), float("inf"))
+        self.assertEqual(Geometric(0.5).isf(0), float("inf"))
+        self.assertEqual(Geometric(0.5).ppf(0), 1)
+        self.assertEqual(Hypergeometric(20, 15, 10).ppf(0), 5)
+
+        self.assertIsInstance(Poisson(3).ppf(0.5), int)
+        self.assertEqual(Poisson(1000).isf(1e-300), 2383)
+
+    def test_array_matches_scalar(self):
+        q = [0, 0.001, 0.25, 0.5, 0.75, 0.999, 1]
+
+        for distribution in (Binomial(200, 0.3), Poisson(12), Geometric(0.1), Hypergeometric(500, 100, 50)):
+            self.assertEqual(distribution.ppf(np.array(q)).tolist(), [distribution.ppf(i) for i in q])
+            self.assertEqual(distribution.isf(np.array(q)).tolist(), [distribution.isf(i) for i in q])
+
+    def test_invalid_probability(self):
+        self.assertRaises(ValueError, lambda: Poisson(3).ppf(1.5))
+        self.assertRaises(ValueError, lambda: Normal(0, 1).isf(np.array([0.5, -0.1])))
+        self.assertRaises(ValueError, lambda: Binomial(10, 0.5).ppf(float("nan")))
+
+
+if __name__ == '__main__':
+    unittest.main()
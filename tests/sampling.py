@@ -0,0 +1,89 @@
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append('..')
+
+from ProbDistro import *
+
+
+DISTRIBUTIONS = [
+    Bernoulli(0.3),
+    Binomial(20, 0.4),
+    Binomial(100000, 0.3),
+    Poisson(3.5),
+    Poisson(2000),
+    Geometric(0.2),
+    Geometric(0.2, include_success_trial=False),
+    Hypergeometric(60, 25, 15),
+    DiscreteRandomVariable([1, 2, 5], [0.2, 0.3, 0.5]),
+    Uniform(1, 4),
+    Normal(2, 1.5),
+    Exponential(0.75),
+]
+
+
+class TestSampling(unittest.TestCase):
+    def test_moments(self):
+        for distribution in DISTRIBUTIONS:
+            draws = distribution.sample(200000, seed=1)
+
+            # five standard errors of the sample mean
+            tolerance = 5 * distribution.standard_deviation() / np.sqrt(len(draws))
+
+            self.assertEqual(draws.shape, (200000,))
+            self.assertAlmostEqual(draws.mean(), distribution.expected_value(), delta=tolerance)
+            self.assertAlmostEqual(draws.var() / distribution.variance(), 1, delta=0.05)
+
+    def test_support(self):
+        for distribution in DISTRIBUTIONS:
+            draws = distribution.sample(10000, seed=2)
+
+            if hasattr(distribution, "pdf"):
+                self.assertTrue((distribution.pdf(draws) > 0).all())
+
+            else:
+                self.assertTrue(np.issubdtype(draws.dtype, np.integer))
+                self.assertTrue((distribution.pmf(draws) > 0).all())
+
+    def test_reproducible(self):
+        for distribution in DISTRIBUTIONS:
+            a = distribution.sample((10, 3), seed=42)
+            b = distribution.sample((10, 3), seed=np.random.default_rng(42))
+
+            self.assertEqual(a.shape, (10, 3))
+            np.testing.assert_array_equal(a, b)
+
+        rng = np.random.default_rng(7)
+        self.assertFalse((Normal(0, 1).sample(5, seed=rng) == Normal(0, 1).sample(5, seed=rng)).all())
+
+    def test_alias_table(self):
+        rv = DiscreteRandomVariable.from_arrays(np.arange(1000), np.random.default_rng(5).random(1000) ** 4, True)
+        probability, alias = rv._alias()
+
+        # each value's probability is its own share of its column, plus whatever other columns alias to it
+        reconstructed = (probability + np.bincount(alias, weights=1 - probability, minlength=1000)) / 1000
+        np.testing.assert_allclose(reconstructed, rv.px, rtol=1e-12, atol=1e-18)
+
+        self.assertIs(rv._alias()[0], probability)
+
+    def test_alias_table_invalidated(self):
+        rv = DiscreteRandomVariable([1, 2, 3], [0.2, 0.3, 0.5])
+        self.assertAlmostEqual(np.mean(rv.sample(100000, seed=6) == 3), 0.5, delta=0.01)
+
+        rv.px[:] = [0.5, 0.3, 0.2]
+        rv.normalize()
+        self.assertAlmostEqual(np.mean(rv.sample(100000, seed=6) == 3), 0.2, delta=0.01)
+
+        rv.px = np.array([0.0, 0.0, 1.0])
+        self.assertTrue((rv.sample(100, seed=6) == 3).all())
+
+    def test_single_draw(self):
+        self.assertTrue(1 <= Uniform(1, 4).sample(seed=3) <= 4)
+        self.assertIn(Bernoulli(0.5).sample(seed=3), (0, 1))
+        self.assertGreaterEqual(Geometric(1).sample(seed=3), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
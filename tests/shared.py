@@ -0,0 +1,87 @@
+import concurrent.futures
+import pickle
+import sys
+import unittest
+from multiprocessing import shared_memory
+
+import numpy as np
+
+sys.path.append('..')
+
+from ProbDistro import *
+import ProbDistro.parallel as parallel
+import ProbDistro.shared as shared
+
+
+class TestShared(unittest.TestCase):
+    def setUp(self):
+        self.rv = Binomial(10 ** 5, 0.3).to_discrete_random_variable()
+
+    def test_attach(self):
+        with shared.share(self.rv) as handle:
+            # the handle pickles to a few bytes, however large the random variable is
+            self.assertLess(len(pickle.dumps(handle)), 200)
+
+            rv = pickle.loads(pickle.dumps(handle)).attach()
+
+            self.assertTrue(np.array_equal(rv.x, self.rv.x))
+            self.assertTrue(np.array_equal(rv.px, self.rv.px))
+            self.assertFalse(rv.px.flags.writeable)
+            self.assertIs(handle.attach(), rv)
+
+            self.assertEqual(handle.ppf(0.5), self.rv.ppf(0.5))
+
+    def test_workers(self):
+        x = np.arange(0, 10 ** 5, 2)
+
+        with concurrent.futures.ProcessPoolExecutor(2) as pool:
+            with shared.share(self.rv) as handle:
+                self.assertTrue(np.array_equal(parallel.evaluate(handle, "cdf", x, pool), self.rv.cdf(x)))
+
+    def test_close(self):
+        owner = shared.share(self.rv)
+        name = owner.handle.name
+
+        owner.close()
+        owner.close()
+
+        self.assertTrue(owner.closed)
+        self.assertRaises(FileNotFoundError, lambda: shared_memory.SharedMemory(name))
+
+        # an owner which is never closed is cleaned up once it is garbage collected
+        owner = shared.share(self.rv)
+        name = owner.handle.name
+        del owner
+
+        self.assertRaises(FileNotFoundError, lambda: shared_memory.SharedMemory(name))
+
+    def test_attached_cache(self):
+        owner = shared.share(self.rv)
+        rv = owner.handle.attach()
+
+        # closing the owner drops its own entry, while anything still viewing the segment keeps it mapped
+        owner.close()
+
+        self.assertNotIn(owner.handle.name, shared._attached)
+        self.assertEqual(rv.ppf(0.5), self.rv.ppf(0.5))
+
+        limit = shared._ATTACHED_LIMIT
+        owners = [shared.share(self.rv) for _ in range(3)]
+
+        try:
+            shared._ATTACHED_LIMIT = 2
+            attached = [owner.handle.attach() for owner in owners]
+
+            # only the most recently attached are kept
+            self.assertEqual(list(shared._attached), [owner.handle.name for owner in owners[1:]])
+            self.assertTrue(np.array_equal(attached[0].px, self.rv.px))
+
+        finally:
+            shared._ATTACHED_LIMIT = limit
+
+            for owner in owners:
+                owner.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append('..')
+
+from ProbDistro import *
+
+
+class TestVectorized(unittest.TestCase):
+    def assertMatchesScalar(self, method: str, distribution, x: list, rtol: float = 1e-12):
+        expected = [getattr(distribution, method)(i) for i in x]
+        actual = getattr(distribution, method)(np.array(x))
+
+        self.assertIsInstance(actual, np.ndarray)
+        np.testing.assert_allclose(actual, expected, rtol=rtol, atol=1e-15)
+
+    def test_discrete(self):
+        distributions = [
+            (Bernoulli(0.7), [0, 1]),
+            (Binomial(10, 0.3), list(range(11))),
+            (Poisson(2.5), list(range(15))),
+            (Geometric(0.25), list(range(1, 10))),
+            (Geometric(0.25, include_success_trial=False), list(range(10))),
+            (Hypergeometric(20, 7, 12), list(range(0, 8))),
+            (DiscreteRandomVariable([3, 1, 2], [0.2, 0.5, 0.3]), [1, 2, 3]),
+        ]
+
+        for distribution, x in distributions:
+            for method in ("pmf", "cdf", "equals", "less_than", "less_than_equals", "greater_than",
+                           "greater_than_equals"):
+                self.assertMatchesScalar(method, distribution, x)
+
+    def test_continuous(self):
+        x = [0, 0.25, 1.5, 3, 7.5]
+
+        for distribution in (Uniform(1, 4), Normal(2, 1.5), Exponential(0.75)):
+            for method in ("pdf", "cdf", "less_than", "greater_than"):
+                self.assertMatchesScalar(method, distribution, x)
+
+    def test_off_support(self):
+        # the scalar functions mask and floor exactly as the array kernels do (the looser tolerance allows for small
+        # tails taken as 1 - cdf, where the scalar cdf is an exact sum and the array cdf a cumulative table)
+        x = [-3, -0.5, 0, 0.5, 1, 2.7, 7.2, 12.5, 25]
+
+        for distribution in (Binomial(10, 0.3), Binomial(100, 0.3), Poisson(2.5), Poisson(80),
+                             Hypergeometric(30, 10, 12), Hypergeometric(300, 100, 40), Geometric(0.3),
+                             Geometric(0.3, include_success_trial=False)):
+            for method in ("pmf", "cdf", "sf", "logpmf", "logsf"):
+                self.assertMatchesScalar(method, distribution, x, rtol=1e-9)
+
+        for method in ("pdf", "cdf", "sf", "logpdf", "logcdf", "logsf"):
+            self.assertMatchesScalar(method, Exponential(0.7), x)
+
+    def test_integral_floats(self):
+        # whole numbers given as floats (as the elements of a float array are) take the exact branches as ints do
+        for distribution, x in ((Binomial(10, 0.5), 3), (Poisson(2), 3), (Hypergeometric(20, 7, 12), 4)):
+            for value in (float(x), np.float64(x), np.int32(x)):
+                for method in ("pmf", "equals", "cdf", "sf"):
+                    self.assertEqual(getattr(distribution, method)(value), getattr(distribution, method)(x))
+
+            self.assertMatchesScalar("pmf", distribution, [float(x)])
+
+    def test_cdf_outside_support(self):
+        np.testing.assert_allclose(Binomial(10, 0.3).cdf(np.array([-2, -0.5, 10, 12])), [0, 0, 1, 1])
+        np.testing.assert_allclose(Poisson(1.5).cdf(np.array([-1, 2.5])), [0, Poisson(1.5).cdf(2)])
+        np.testing.assert_allclose(Hypergeometric(10, 5, 3).cdf(np.array([-1, 4])), [0, 1])
+
+    def test_support_check(self):
+        self.assertRaises(ValueError, lambda: Binomial(10, 0.5).equals(np.array([1, 2, 11])))
+        self.assertRaises(ValueError, lambda: Poisson(1).less_than(np.array([0.5, 1])))
+        self.assertRaises(ValueError, lambda: Exponential(1).greater_than(np.array([1, -1])))
+
+        np.testing.assert_array_equal(Binomial(10, 0.5).pmf(np.array([-1, 0.5, 11])), [0, 0, 0])
+
+    def test_ranges(self):
+        p = Poisson(0.75)
+
+        self.assertIsInstance(p.pmf_range(range(5)), list)
+        self.assertIsInstance(p.cdf_range(np.arange(5)), np.ndarray)
+        np.testing.assert_allclose(p.cdf_range({0, 1, 2}), [p.cdf(0), p.cdf(1), p.cdf(2)])
+
+
+if __name__ == '__main__':
+    unittest.main()